@@ -12,6 +12,7 @@ from . import geometry_utility
 from . import grid
 from . import grid_fft
 from . import grid_utility
+from . import gridding
 from . import gdb
 from . import agg
 from . import map
@@ -35,6 +36,7 @@ __all__ = ['agg',
            'grid',
            'grid_fft',
            'grid_utility',
+           'gridding',
            'group',
            'gx',
            'map',
@@ -5,6 +5,7 @@ Geosoft databases for line-oriented spatial data.
     :`Geosoft_gdb`: Geosoft line database
     :`Line`:        line handling
     :`Channel`:     channel handling
+    :`Bulk_writer`: block writer for bulk data import
     
 :Constants:
     :LINE_TYPE_NORMAL: `geosoft.gxapi.DB_LINE_TYPE_NORMAL`
@@ -65,6 +66,8 @@ Geosoft databases for line-oriented spatial data.
 import os
 import sys
 import math
+import queue
+import threading
 import numpy as np
 import pandas as pd
 
@@ -134,6 +137,10 @@ SYMBOL_LOCK_WRITE = gxapi.DB_LOCK_READWRITE
 DRAW_AS_POINTS = 0
 DRAW_AS_LINES = 1
 
+# line REG entry that holds the line bounding box as 'x,y,z|lengths|xmin,ymin,zmin,xmax,ymax,zmax',
+# used only if Geosoft_gdb.store_extent is True
+_EXTENT_REG = 'GXPY_EXTENT'
+
 
 class GdbException(geosoft.GXRuntimeError):
     """
@@ -163,6 +170,65 @@ def _va_width(data):
     return width
 
 
+def _common_fid(fids):
+    # smallest common (fid_start, fid_incr, fid_last) from a (fid_start, fid_incr, length) for each channel,
+    # None if the channels have no fiducial
+    fid_start, fid_increment, nrows = fids[0]
+    if nrows == 0:
+        fid_last = fid_start
+    else:
+        fid_last = fid_start + fid_increment * (nrows - 1)
+    for c_start, c_increment, c_rows in fids[1:]:
+        if c_start != gxapi.rDUMMY:
+            c_last = c_start + c_increment * (c_rows - 1)
+            if fid_start == gxapi.rDUMMY or c_start < fid_start:
+                fid_start = c_start
+            if fid_increment == gxapi.rDUMMY or c_increment < fid_increment:
+                fid_increment = c_increment
+            if c_last > fid_last:
+                fid_last = c_last
+
+    if fid_start == gxapi.rDUMMY or fid_increment == gxapi.rDUMMY:
+        return None
+    return fid_start, fid_increment, fid_last
+
+
+def _refid_np(data, data_fid, fid, nrows, dummy_value):
+    # resample (rows, width) data from data_fid to nrows at fid. Float data is interpolated linearly,
+    # other data takes the nearest value. Rows outside the data are dummy.
+
+    out = np.empty((nrows, data.shape[1]), dtype=data.dtype)
+    out[:] = dummy_value
+    n = len(data)
+    if n == 0 or nrows == 0:
+        return out
+
+    if (tuple(data_fid) == tuple(fid)) or (gxapi.rDUMMY in data_fid) or (data_fid[1] <= 0.):
+        n = min(n, nrows)
+        out[:n] = data[:n]
+        return out
+
+    # position of each fid in the data, snapped to a sample when within rounding error
+    pos = ((fid[0] - data_fid[0]) + np.arange(nrows) * fid[1]) / data_fid[1]
+    snap = np.rint(pos)
+    pos = np.where(np.abs(pos - snap) < 1.0e-6, snap, pos)
+
+    if data.dtype.kind == 'f':
+        inside = (pos >= 0.) & (pos <= n - 1)
+        i0 = np.clip(np.floor(pos), 0, n - 1).astype(np.int64)
+        i1 = np.minimum(i0 + 1, n - 1)
+        t = (pos - i0)[:, np.newaxis]
+        a = data[i0]
+        v = np.where(t == 0., a, a + (data[i1] - a) * t)
+        out[inside] = v[inside]
+    else:
+        i = np.floor(pos + 0.5)
+        inside = (i >= 0) & (i <= n - 1)
+        out[inside] = data[i[inside].astype(np.int64)]
+
+    return out
+
+
 def is_valid_line_name(name):
     """
     Return True if this is a valid line name.
@@ -357,7 +423,8 @@ class Geosoft_gdb(gxgeo.Geometry):
         self._xmlmetadata = None
         self._xmlmetadata_changed = False
         self._xmlmetadata_root = ''
-        self._extent = {'xyz': None, 'extent': None}
+        self._extent = {'xyz': None, 'extent': None, 'lines': {}, 'store': False}
+        self.clear_symbol_cache()
 
         if name is None:
             if self._db:
@@ -501,7 +568,7 @@ class Geosoft_gdb(gxgeo.Geometry):
         """
 
         if isinstance(symb, str):
-            return self._db.exist_symb(symb, symb_type)
+            return self.find_symb_(symb, symb_type) != gxapi.NULLSYMB
         elif isinstance(symb, int):
             return self._db.valid_symb(symb, symb_type)
         elif isinstance(symb, Line) and (symb_type == gxapi.DB_SYMB_LINE):
@@ -510,6 +577,78 @@ class Geosoft_gdb(gxgeo.Geometry):
             return True
         return False
 
+    def find_symb_(self, name, symb_type):
+        """
+        Find a symbol by name, using the symbol cache.
+
+        :param name:        symbol name
+        :param symb_type:   one of DB_SYMB_TYPE
+        :returns:           symbol, or `geosoft.gxapi.NULLSYMB` if the symbol does not exist
+
+        .. versionadded:: 9.8
+        """
+
+        cache = self._symb_cache.get(symb_type)
+        if cache is None:
+            return self._db.find_symb(name, symb_type)
+        symb = cache.get(name)
+        if symb is None:
+            symb = self._db.find_symb(name, symb_type)
+            if symb != gxapi.NULLSYMB:
+                cache[name] = symb
+        return symb
+
+    def symb_name_(self, symb, symb_type):
+        """
+        Return the name of a symbol, using the symbol cache.
+
+        :param symb:        symbol
+        :param symb_type:   one of DB_SYMB_TYPE
+
+        .. versionadded:: 9.8
+        """
+
+        names = self._symb_names.get(symb_type)
+        if names is not None and symb in names:
+            return names[symb]
+        sr = gxapi.str_ref()
+        self._db.get_symb_name(symb, sr)
+        if names is not None:
+            names[symb] = sr.value
+        return sr.value
+
+    def channel_info_(self, channel):
+        """
+        Cached channel (array_width, gx_type, dtype) for a channel symbol.
+
+        .. versionadded:: 9.8
+        """
+
+        cs = self.channel_name_symb(channel)[1]
+        info = self._chan_info.get(cs)
+        if info is None:
+            self.lock_read_(cs)
+            try:
+                width = self._db.get_col_va(cs)
+            finally:
+                self.unlock_(cs)
+            gxtype = self._db.get_chan_type(cs)
+            info = (width, gxtype, gxu.dtype_gx(gxtype))
+            self._chan_info[cs] = info
+        return info
+
+    def clear_symbol_cache(self):
+        """
+        Clear the line and channel symbol cache. The cache is cleared by methods of this class that create,
+        delete or rename lines and channels, but should be cleared if lines or channels are changed
+        directly through the `geosoft.gxapi.GXDB` instance.
+
+        .. versionadded:: 9.8
+        """
+        self._symb_cache = {gxapi.DB_SYMB_LINE: {}, gxapi.DB_SYMB_CHAN: {}}
+        self._symb_names = {gxapi.DB_SYMB_LINE: {}, gxapi.DB_SYMB_CHAN: {}}
+        self._chan_info = {}
+
     # ============================================================================
     # Information
 
@@ -563,7 +702,7 @@ class Geosoft_gdb(gxgeo.Geometry):
         self.gxdb.set_xyz_chan(1, y)
         if z:
             self.gxdb.set_xyz_chan(2, z)
-        self.clear_extent()
+        self._extent['xyz'] = None
 
     def _init_xmlmetadata(self):
         if not self._xmlmetadata:
@@ -748,7 +887,7 @@ class Geosoft_gdb(gxgeo.Geometry):
         .. versionadded:: 9.1
         """
 
-        exist = self._db.find_symb(str(line), gxapi.DB_SYMB_LINE) != gxapi.NULLSYMB
+        exist = self.find_symb_(str(line), gxapi.DB_SYMB_LINE) != gxapi.NULLSYMB
         if raise_err and not exist:
             raise GdbException(_t('"{}" is not a line in the database'.format(line)))
         return exist
@@ -762,7 +901,7 @@ class Geosoft_gdb(gxgeo.Geometry):
 
         .. versionadded:: 9.1
         """
-        exist = self._db.find_chan(chan) != gxapi.NULLSYMB
+        exist = self.find_symb_(chan, gxapi.DB_SYMB_CHAN) != gxapi.NULLSYMB
         if raise_err and not exist:
             raise GdbException(_t('"{}" is not a channel in the database'.format(chan)))
         return exist
@@ -775,43 +914,30 @@ class Geosoft_gdb(gxgeo.Geometry):
         :returns:   `geosoft.gxpy.geometry.Point2` of minimum, maximum, or None if no spatial information.
 
         .. versionadded:: 9.2
+
+        .. versionchanged:: 9.8
+            reduced from the bounding box of each line, see `line_extent`.
         """
 
-        def expand(_min, _max, _data):
-            if np.isnan(_data).all():
-                return _min, _max
-            mdata = np.nanmin(_data)
-            if _min is None:
-                _min = mdata
-                _max = np.nanmax(_data)
-                return _min, _max
-            if mdata < _min:
-                _min = mdata
-                return _min, _max
-            mdata = np.nanmax(_data)
-            if mdata > _max:
-                _max = mdata
-            return _min, _max
-
-        lines = self.lines()
+        lines = self.list_lines()
         if len(lines):
 
-            xyz = self.xyz_channels
+            xyz = self._extent_channels()
+            if xyz is None:
+                return None
             if str(xyz) == self._extent['xyz']:
                 return self._extent['extent']
 
-            xmin = xmax = ymin = ymax = zmin = zmax = None
-            if None in xyz:
-                if None in xyz[0:2]:
-                    return None
-                xyz = xyz[0:2]
-
-            for l in lines:
-                data = self.read_line(l, channels=xyz)[0]
-                xmin, xmax = expand(xmin, xmax, data[:, 0])
-                ymin, ymax = expand(ymin, ymax, data[:, 1])
-                if data.shape[1] > 2:
-                    zmin, zmax = expand(zmin, zmax, data[:, 2])
+            boxes = self._line_boxes(list(lines.values()), xyz)
+            xmin, ymin, zmin = np.fmin.reduce(boxes[:, :3])
+            xmax, ymax, zmax = np.fmax.reduce(boxes[:, 3:])
+            if np.isnan(xmin) or np.isnan(ymin):
+                # no located data
+                self._extent['xyz'] = str(xyz)
+                self._extent['extent'] = None
+                return None
+            if len(xyz) == 2:
+                zmin = zmax = None
 
             ext = gxgeo.Point2((xmin, ymin, zmin, xmax, ymax, zmax), coordinate_system=self.coordinate_system)
             self._extent['xyz'] = str(xyz)
@@ -821,6 +947,195 @@ class Geosoft_gdb(gxgeo.Geometry):
 
         return None
 
+    def line_extent(self, line):
+        """
+        Return the spatial extent of the data in a line as a `geosoft.gxpy.geometry.Point2`.
+
+        :param line:    line name or symbol
+        :returns:       `geosoft.gxpy.geometry.Point2` of minimum, maximum, or None if no spatial information.
+
+        The bounding box of each line is cached, and is updated when data in the `xyz_channels` is
+        written by this class. See `store_extent` to keep the boxes with the database.
+
+        .. versionadded:: 9.8
+        """
+
+        ls = self.line_name_symb(line)[1]
+        xyz = self._extent_channels()
+        if xyz is None:
+            return None
+        box = list(self._line_boxes([ls], xyz)[0])
+        if len(xyz) == 2:
+            box[2] = box[5] = None
+        return gxgeo.Point2(box, coordinate_system=self.coordinate_system)
+
+    @property
+    def store_extent(self):
+        """
+        `True` to store the bounding box of each line with the line so that it is available the next time
+        the database is opened. The default is `False`, in which case line boxes are kept in memory only
+        and the line is not read or changed to manage stored boxes.
+
+        A stored box is only checked against the `xyz_channels` names and lengths, so only store
+        line boxes if all changes to the located data are made by this class with `store_extent` set.
+        Call `clear_extent` to remove stored boxes.  Can be set.
+
+        .. versionadded:: 9.8
+        """
+        return self._extent['store']
+
+    @store_extent.setter
+    def store_extent(self, store):
+        self._extent['store'] = bool(store)
+
+    def lines_in_extent(self, extent, select=True):
+        """
+        Lines that have data inside a horizontal extent, decided from the line bounding boxes
+        without reading data.
+
+        :param extent:  `geosoft.gxpy.geometry.Geometry` instance, or (min_x, min_y, max_x, max_y) in the
+                        database coordinate system.  Geometries are reprojected to the database
+                        coordinate system.
+        :param select:  `True` to consider selected lines, `False` to consider all lines
+        :returns:       dictionary (line name: symbol) of lines with a bounding box that intersects the extent
+
+        .. versionadded:: 9.8
+        """
+
+        if isinstance(extent, gxgeo.Geometry):
+            if not isinstance(extent, gxgeo.Point2):
+                extent = extent.extent
+            if gxcs.is_known(extent.coordinate_system) and gxcs.is_known(self.coordinate_system):
+                extent = gxgeo.Point2(extent, coordinate_system=self.coordinate_system)
+            extent = extent.extent_xy
+        x0, y0, x1, y1 = (float(e) for e in extent)
+
+        lines = self.list_lines(select)
+        xyz = self._extent_channels()
+        if xyz is None or not len(lines):
+            return {}
+        boxes = self._line_boxes(list(lines.values()), xyz)
+        inside = (boxes[:, 0] <= x1) & (boxes[:, 3] >= x0) & (boxes[:, 1] <= y1) & (boxes[:, 4] >= y0)
+        return {ln: ls for (ln, ls), i in zip(lines.items(), inside) if i}
+
+    def _extent_channels(self):
+        # xyz channels that locate the data, (x, y) if there is no z, None if not located
+        xyz = self.xyz_channels
+        if None in xyz[0:2]:
+            return None
+        if xyz[2] is None:
+            return xyz[0:2]
+        return xyz
+
+    def _line_lengths(self, ls, xyz):
+        lengths = []
+        for c in xyz:
+            cs = self.channel_name_symb(c)[1]
+            self.lock_read_(cs)
+            try:
+                lengths.append(str(self._db.get_channel_length(ls, cs)))
+            finally:
+                self.unlock_(cs)
+        return ','.join(lengths)
+
+    def _line_box_setting(self, ls):
+        sr = gxapi.str_ref()
+        self.lock_read_(ls)
+        try:
+            self._db.get_reg_symb_setting(ls, _EXTENT_REG, sr)
+        finally:
+            self.unlock_(ls)
+        return sr.value
+
+    def _stored_line_box(self, ls, xyz):
+        # the box stored with a line, None if not storing boxes, there is none, or it does not match the
+        # channels and lengths
+        if not self._extent['store']:
+            return None
+        try:
+            channels, lengths, box = self._line_box_setting(ls).split('|')
+            box = np.array([float(v) for v in box.split(',')])
+        except ValueError:
+            return None
+        if channels != ','.join(xyz) or len(box) != 6 or lengths != self._line_lengths(ls, xyz):
+            return None
+        return box
+
+    def _store_line_box(self, ls, xyz, box):
+        # store the box of a line, the line REG is only used if boxes are stored
+        if not self._extent['store']:
+            return
+        if box is None:
+            setting = ''
+        else:
+            setting = '|'.join((','.join(xyz), self._line_lengths(ls, xyz), ','.join(repr(float(v)) for v in box)))
+        self._set_line_box_setting(ls, setting)
+
+    def _set_line_box_setting(self, ls, setting):
+        try:
+            self.lock_write_(ls)
+            try:
+                self._db.set_reg_symb_setting(ls, _EXTENT_REG, setting)
+            finally:
+                self.unlock_(ls)
+        except (gxapi.GXError, GdbException):
+            # the database cannot be changed, boxes are only kept in memory
+            pass
+
+    def _line_boxes(self, lines, xyz):
+        # (xmin, ymin, zmin, xmax, ymax, zmax) of each line symbol, from the cache, the line, or the data
+
+        cache = self._extent['lines']
+        key = ','.join(xyz)
+        boxes = np.full((len(lines), 6), np.nan)
+        missing = {}
+        for i, ls in enumerate(lines):
+            entry = cache.get(ls)
+            if entry is None or entry[0] != key:
+                box = self._stored_line_box(ls, xyz)
+                if box is None:
+                    missing[self.line_name_symb(ls)[0]] = i
+                    continue
+                entry = cache[ls] = (key, box)
+            boxes[i] = entry[1]
+
+        if missing:
+            for ln, _, data in self.iter_blocks(list(missing), channels=xyz):
+                if len(data):
+                    i = missing[ln]
+                    boxes[i, :len(xyz)] = np.fmin(boxes[i, :len(xyz)], np.fmin.reduce(data, axis=0))
+                    boxes[i, 3: 3 + len(xyz)] = np.fmax(boxes[i, 3: 3 + len(xyz)], np.fmax.reduce(data, axis=0))
+            for i in missing.values():
+                cache[lines[i]] = (key, boxes[i].copy())
+                if self._extent['store']:
+                    self._store_line_box(lines[i], xyz, boxes[i])
+
+        return boxes
+
+    def _update_line_extent(self, ls, channel, data=None):
+        # update the box of a line for data written to a channel, the box is dropped if data is not given
+
+        self._extent['xyz'] = None
+        xyz = self._extent_channels()
+        if xyz is None or channel not in xyz:
+            return
+        entry = self._extent['lines'].get(ls)
+        if data is None or data.ndim != 1 or data.dtype.kind != 'f' or entry is None or entry[0] != ','.join(xyz):
+            self._extent['lines'].pop(ls, None)
+            self._store_line_box(ls, xyz, None)
+            return
+
+        data = data[~np.isnan(data)]
+        data = data[data != gxu.gx_dummy(data.dtype)]
+        i = xyz.index(channel)
+        box = entry[1].copy()
+        if len(data):
+            box[i], box[i + 3] = data.min(), data.max()
+        else:
+            box[i] = box[i + 3] = np.nan
+        self._extent['lines'][ls] = (entry[0], box)
+        self._store_line_box(ls, xyz, box)
+
     def _get(self, s, fn):
         self.lock_read_(s)
         try:
@@ -852,17 +1167,15 @@ class Geosoft_gdb(gxgeo.Geometry):
             return line.name, line.symbol
 
         elif isinstance(line, str):
-            if self.exist_symb_(line, gxapi.DB_SYMB_LINE):
-                symb = self._db.find_symb(line, gxapi.DB_SYMB_LINE)
+            symb = self.find_symb_(line, gxapi.DB_SYMB_LINE)
+            if symb != gxapi.NULLSYMB:
                 return line, symb
             if create:
                 return line, self.new_line(line)
             else:
                 raise GdbException(_t('Line \'{}\' not found'.format(line)))
         else:
-            sr = gxapi.str_ref()
-            self._db.get_symb_name(line, sr)
-            return sr.value, line
+            return self.symb_name_(line, gxapi.DB_SYMB_LINE), line
 
     def channel_name_symb(self, chan):
         """
@@ -878,16 +1191,14 @@ class Geosoft_gdb(gxgeo.Geometry):
         if isinstance(chan, Channel):
             return chan.name, chan.symbol
         if isinstance(chan, str):
-            symb = self._db.find_symb(chan, gxapi.DB_SYMB_CHAN)
-            if symb == -1:
+            symb = self.find_symb_(chan, gxapi.DB_SYMB_CHAN)
+            if symb == gxapi.NULLSYMB:
                 raise GdbException(_t('Channel \'{}\' not found'.format(chan)))
             return chan, symb
 
-        if not self.exist_symb_(chan, gxapi.DB_SYMB_CHAN):
+        if chan not in self._symb_names[gxapi.DB_SYMB_CHAN] and not self.exist_symb_(chan, gxapi.DB_SYMB_CHAN):
             raise GdbException(_t('Channel symbol \'{}\' not found'.format(chan)))
-        sr = gxapi.str_ref()
-        self._db.get_symb_name(chan, sr)
-        return sr.value, chan
+        return self.symb_name_(chan, gxapi.DB_SYMB_CHAN), chan
 
     def channel_width(self, channel):
         """
@@ -898,7 +1209,7 @@ class Geosoft_gdb(gxgeo.Geometry):
 
         .. versionadded:: 9.1
         """
-        return self._get(self.channel_name_symb(channel)[1], self._db.get_col_va)
+        return self.channel_info_(channel)[0]
 
     def list_channels(self, chan=None):
         """
@@ -946,8 +1257,12 @@ class Geosoft_gdb(gxgeo.Geometry):
                         dct[k] = allc.get(k)
 
         # convert symbol strings to ints
+        chan_cache = self._symb_cache[gxapi.DB_SYMB_CHAN]
         for k in dct:
-            dct[k] = int(dct.get(k))
+            symb = int(dct.get(k))
+            dct[k] = symb
+            chan_cache[k] = symb
+            self._symb_names[gxapi.DB_SYMB_CHAN][symb] = k
 
         return dct
 
@@ -971,8 +1286,12 @@ class Geosoft_gdb(gxgeo.Geometry):
         else:
             self._db.line_lst(self._lst)
         dct = gxu.dict_from_lst(self._lst)
+        line_cache = self._symb_cache[gxapi.DB_SYMB_LINE]
         for k in dct:
-            dct[k] = int(dct.get(k))
+            symb = int(dct.get(k))
+            dct[k] = symb
+            line_cache[k] = symb
+            self._symb_names[gxapi.DB_SYMB_LINE][symb] = k
         return dct
 
     def line_details(self, line):
@@ -1125,7 +1444,7 @@ class Geosoft_gdb(gxgeo.Geometry):
 
         .. versionadded:: 9.1
         """
-        return gxu.dtype_gx(self._db.get_chan_type(self.channel_name_symb(channel)[1]))
+        return self.channel_info_(channel)[2]
 
     def channel_fid(self, line, channel):
         """
@@ -1188,6 +1507,7 @@ class Geosoft_gdb(gxgeo.Geometry):
                                                gxapi.DB_OWN_SHARED,
                                                gxu.gx_dtype(dtype),
                                                array)
+            self.clear_symbol_cache()
 
         if details:
             self.set_channel_details(symb, details)
@@ -1242,17 +1562,27 @@ class Geosoft_gdb(gxgeo.Geometry):
             if group:
                 Line(self, symb).group = group
 
-        self.clear_extent()
+        self.clear_symbol_cache()
+        self._extent['xyz'] = None
+        self._extent['lines'].pop(symb, None)
 
         return symb
 
     def clear_extent(self):
         """
-        Clear the extent cache.
+        Clear the extent cache, including the bounding box stored with each line (see `store_extent`).
+        This is only needed if spatial data is changed directly through the `geosoft.gxapi.GXDB` instance.
 
         .. versionadded:: 9.3.1
+
+        .. versionchanged:: 9.8
+            clears the line bounding boxes
         """
         self._extent['xyz'] = None
+        self._extent['lines'] = {}
+        for ls in self.list_lines(select=False).values():
+            if self._line_box_setting(ls):
+                self._set_line_box_setting(ls, '')
 
     def delete_channel(self, channels):
         """
@@ -1301,6 +1631,9 @@ class Geosoft_gdb(gxgeo.Geometry):
             self.unlock_(ls)
             self.lock_write_(ls)
             self._db.delete_symb(ls)
+            self.clear_symbol_cache()
+            self._extent['xyz'] = None
+            self._extent['lines'].pop(ls, None)
 
     def delete_line_data(self, lines):
         """
@@ -1361,7 +1694,7 @@ class Geosoft_gdb(gxgeo.Geometry):
             else:
                 self._db.select(s, gxapi.DB_LINE_SELECT_EXCLUDE)
 
-        self.clear_extent()
+        self._extent['xyz'] = None
 
     # =====================================================================================
     # reading and writing
@@ -1436,17 +1769,17 @@ class Geosoft_gdb(gxgeo.Geometry):
         c_type = []
         for c in channels:
             cn, cs = self.channel_name_symb(c)
-            w = self.channel_width(cs)
+            w, gxtype, _ = self.channel_info_(cs)
             if w == 1:
                 ch_names.append(cn)
                 ch_symbs.append(cs)
-                c_type.append(self._db.get_chan_type(cs))
+                c_type.append(gxtype)
             else:
                 for i in range(w):
                     ccn, ccs = self.channel_name_symb("{}[{}]".format(cn, i))
                     ch_names.append(ccn)
                     ch_symbs.append(ccs)
-                    c_type.append(self._db.get_chan_type(cs))
+                    c_type.append(gxtype)
 
         return ch_names, ch_symbs, c_type
 
@@ -1571,7 +1904,8 @@ class Geosoft_gdb(gxgeo.Geometry):
         :param channels:    list of channels, strings or symbol number.  If None, read all channels
         :param dtype:       numpy data type for the array, default np.float64 for multi-channel data (unless
                             chan_dtypes is `True`), data type for single channel data. Use "<Unnn" for string type.
-        :param common_fid:  `True` to resample all channels to a common fiducial
+        :param common_fid:  `True` to resample all channels to a common fiducial.  Float channels are
+                            interpolated linearly, as for `read_line`.
         :param chan_dtypes: `True` to determine dtype for each vv from channel type, default `False`
         :returns:           list of tuples [(channel_name, vv), ...]
 
@@ -1613,7 +1947,7 @@ class Geosoft_gdb(gxgeo.Geometry):
         # read the data into vv
         chvv = []
         for c in ch_names:
-            cs = self._db.find_symb(c, gxapi.DB_SYMB_CHAN)
+            cs = self.find_symb_(c, gxapi.DB_SYMB_CHAN)
             vv = self.read_channel_vv(ls, cs, dtype=dtype)
             chvv.append((c, vv))
 
@@ -1647,8 +1981,16 @@ class Geosoft_gdb(gxgeo.Geometry):
                 nvd = 0
             else:
                 nvd = math.ceil(max((fend - fid[0] - sys.float_info.epsilon), 0) / fid[1]) + 1
-            for vv in chvv:
-                vv[1].refid(fid, nvd)
+
+            # float channels are resampled together in numpy, others by the VV
+            for _, vv in chvv:
+                if vv.fid == tuple(fid) and vv.length == nvd:
+                    continue
+                if vv.is_float:
+                    data = _refid_np(vv.np.reshape((-1, 1)), vv.fid, fid, nvd, np.nan)
+                    vv.set_data(data, fid=fid)
+                else:
+                    vv.refid(fid, nvd)
 
         return chvv
 
@@ -1672,34 +2014,22 @@ class Geosoft_gdb(gxgeo.Geometry):
             return 0, 1., 0, 0, []
 
         ln, ls = self.line_name_symb(line)
-        cs = self.channel_name_symb(channels[0])[1]
-        fid_start, fid_increment = self.channel_fid(ls, cs)
-        self.lock_read_(cs)
-        nrows = self.gxdb.get_channel_length(ls, cs)
-        self.unlock_(cs)
-        if nrows == 0:
-            fid_last = fid_start
-        else:
-            fid_last = fid_start + fid_increment * (nrows - 1)
-        n_width = self.channel_width(cs)
-        for c in channels[1:]:
+        fids = []
+        n_width = 0
+        for c in channels:
             cs = self.channel_name_symb(c)[1]
             n_width += self.channel_width(cs)
             c_start, c_increment = self.channel_fid(ls, cs)
-            if c_start != gxapi.rDUMMY:
-                self.lock_read_(cs)
-                c_last = c_start + c_increment * (self.gxdb.get_channel_length(ls, cs) - 1)
+            self.lock_read_(cs)
+            try:
+                fids.append((c_start, c_increment, self.gxdb.get_channel_length(ls, cs)))
+            finally:
                 self.unlock_(cs)
-                if fid_start == gxapi.rDUMMY or c_start < fid_start:
-                    fid_start = c_start
-                if fid_increment == gxapi.rDUMMY or c_increment < fid_increment:
-                    fid_increment = c_increment
-                if c_last > fid_last:
-                    fid_last = c_last
-
-        if fid_start == gxapi.rDUMMY or fid_increment == gxapi.rDUMMY:
+
+        common = _common_fid(fids)
+        if common is None:
             return 0., 1., 0., 0, channels
-        return fid_start, fid_increment, fid_last, n_width, channels
+        return common + (n_width, channels)
 
     def readLine(self, *args, **kwargs):
         """
@@ -1732,6 +2062,9 @@ class Geosoft_gdb(gxgeo.Geometry):
 
         VA channels are expanded by element with channel names name[0], name[1], etc.
 
+        Channels are resampled to the common fiducial, with float data interpolated linearly and other
+        data taking the nearest value. Fiducials outside the data of a channel are dummy.
+
         This method is intended for relatively simple databases in relatively simple applications.
         If your database has a lot of channels, or wide array channels it will be more efficient
         to read and work with just the channels you need.  See `read_channel`, `read_channel_vv`
@@ -1753,10 +2086,42 @@ class Geosoft_gdb(gxgeo.Geometry):
             npd,ch,fid = gdb.read_line('L100','X',np.int32)              # read channel 'X' into integer array
 
         .. versionadded:: 9.1
+
+        .. versionchanged:: 9.8
+            channels are resampled together in numpy
         """
 
         ls = self.line_name_symb(line)[1]
-        fid_start, fid_incr, fid_last, ncols, channels = self.scan_line_fid(line, channels)
+        if channels is None:
+            channels = self.sorted_chan_list()
+        else:
+            channels = self._to_string_chan_list(channels)
+        if dtype is None:
+            read_dtype = np.dtype(np.float64)
+        else:
+            read_dtype = np.dtype(dtype)
+
+        # read each channel at its own fiducial
+        chan_data = []
+        ncols = 0
+        for ch in channels:
+            cn, cs = self.channel_name_symb(ch)
+            w = self.channel_width(cs)
+            if w == 1:
+                vv = self.read_channel_vv(ls, cs, dtype=read_dtype)
+                chan_data.append((cn, w, vv.np.reshape((-1, 1)), vv.fid))
+            else:
+                va = self.read_channel_va(ls, cs, dtype=read_dtype)
+                chan_data.append((cn, w, va.np.reshape((-1, w)), va.fid))
+            ncols += w
+
+        common = None
+        if len(chan_data):
+            common = _common_fid([(f[0], f[1], len(d)) for _, _, d, f in chan_data])
+        if common is None:
+            fid_start, fid_incr, fid_last, ncols = 0., 1., 0., 0
+        else:
+            fid_start, fid_incr, fid_last = common
 
         if fid is None:
             fid = (fid_start, fid_incr)
@@ -1768,7 +2133,7 @@ class Geosoft_gdb(gxgeo.Geometry):
                 data = np.array([], dtype=dtype).reshape((-1, len(channels)))
             return data, channels, fid
 
-        # read to a numpy array
+        # resample all channels to the common fiducial
         npd = np.empty((nrows, ncols), dtype=dtype)
         if npd.dtype == np.float32 or npd.dtype == np.float64:
             dummy_value = np.nan
@@ -1778,24 +2143,14 @@ class Geosoft_gdb(gxgeo.Geometry):
         all_empty = True
         ch_names = []
         icol = 0
-        for ch in channels:
-            cn, cs = self.channel_name_symb(ch)
-            w = self.channel_width(cs)
+        for cn, w, data, data_fid in chan_data:
+            if len(data) > 0:
+                all_empty = False
+            npd[:, icol: icol + w] = _refid_np(data, data_fid, fid, nrows, dummy_value)
+            icol += w
             if w == 1:
-                vv = self.read_channel_vv(ls, cs, dtype=npd.dtype)
-                if vv.length > 0:
-                    all_empty = False
-                vv.refid(fid, nrows)
-                npd[:, icol] = vv.np
-                icol += 1
                 ch_names.append(cn)
             else:
-                va = self.read_channel_va(ls, cs, dtype=npd.dtype)
-                if va.length > 0:
-                    all_empty = False
-                va.refid(fid, nrows)
-                npd[:, icol:icol+w] = va.np
-                icol += w
                 for i in range(w):
                     ch_names.append('{}[{}]'.format(cn, str(i)))
 
@@ -1826,9 +2181,9 @@ class Geosoft_gdb(gxgeo.Geometry):
             elif dummy == READ_REMOVE_DUMMYROWS:
 
                 if np.isnan(dummy_value):
-                    mask = np.apply_along_axis(lambda a: not (np.isnan(a).any()), 1, npd)
+                    mask = ~np.isnan(npd).any(axis=1)
                 else:
-                    mask = np.apply_along_axis(lambda a: not (dummy_value in a), 1, npd)
+                    mask = ~(npd == dummy_value).any(axis=1)
                 npd = npd[mask, :]
                 fid = (0.0, 1.0)
 
@@ -1928,6 +2283,494 @@ class Geosoft_gdb(gxgeo.Geometry):
 
         return df, ch_names, fid
 
+    def _line_name_symb_list(self, lines=None):
+        """ list of (name, symbol) for lines, default is all selected lines"""
+
+        if lines is None:
+            return list(self.list_lines().items())
+        if isinstance(lines, (str, int, Line)):
+            lines = [lines]
+        return [self.line_name_symb(l) for l in lines]
+
+    def iter_blocks(self, lines=None, channels=None, dtype=None, block_rows=None):
+        """
+        Iterate through line data in blocks served by `geosoft.gxapi.GXDBREAD`.
+
+        :param lines:       list of lines to read, names or symbols, default is all selected lines
+        :param channels:    list of channels, strings or symbol number.  If None, read all channels
+        :param dtype:       numeric numpy data type for the data, default np.float64
+        :param block_rows:  maximum number of rows in a block.  The default returns blocks as served by
+                            `geosoft.gxapi.GXDBREAD`, which returns lines smaller than the native block size
+                            (1 MB per channel) as a single block.
+        :returns:           generator of (line_name, (fid_start, fid_incr), npd) tuples, where npd is
+                            a 2D numpy array shape (rows, channels).
+
+        Columns are in the order of the requested channels, with VA channels expanded by element in the same
+        manner as `read_line`.  Unlike `read_line`, channels are not resampled to a common fiducial. The
+        fiducial returned is that of the first channel, and channels shorter than the longest channel in
+        the block are padded with dummies.
+
+        For float data dummy values will be np.nan.  For integer types dummy values will be the
+        Geosoft dummy values.
+
+        Examples:
+
+        .. code::
+
+            for line, fid, npd in gdb.iter_blocks(channels=['X', 'Y', 'Z']):
+                # ... do something with the data in npd ...
+
+        .. versionadded:: 9.8
+        """
+
+        if dtype is None:
+            dtype = np.float64
+        dtype = np.dtype(dtype)
+        if gxu.gx_dtype(dtype) < 0:
+            raise GdbException(_t('Block reads require a numeric dtype, not {}').format(dtype))
+        if dtype == np.float32 or dtype == np.float64:
+            dummy_value = np.nan
+        else:
+            dummy_value = gxu.gx_dummy(dtype)
+
+        line_list = self._line_name_symb_list(lines)
+        if len(line_list) == 0:
+            return
+
+        if channels is None:
+            channels = self.sorted_chan_list()
+        else:
+            channels = self._to_string_chan_list(channels)
+        if len(channels) == 0:
+            return
+
+        lst = gxapi.GXLST.create(2000)
+        for ln, ls in line_list:
+            lst.add_item(ln, str(ls))
+        dbread = gxapi.GXDBREAD.create(self._db, lst)
+
+        # channel index, width and the native vv or va that is refilled for each block
+        chan_buffers = []
+        ncols = 0
+        for c in channels:
+            index = dbread.add_channel(self.channel_name_symb(c)[1])
+            w = dbread.get_chan_array_size(index)
+            if w == 1:
+                chan_buffers.append((w, dbread.get_vv(index)))
+            else:
+                chan_buffers.append((w, dbread.get_va(index)))
+            ncols += w
+
+        line_ref = gxapi.int_ref()
+        block_ref = gxapi.int_ref()
+        nblocks_ref = gxapi.int_ref()
+        while dbread.get_next_block(line_ref, block_ref, nblocks_ref) != -1:
+
+            nrows = 0
+            for w, buff in chan_buffers:
+                if w == 1:
+                    nrows = max(nrows, buff.length())
+                else:
+                    nrows = max(nrows, buff.len())
+
+            w, buff = chan_buffers[0]
+            fid = (buff.get_fid_start(), buff.get_fid_incr())
+
+            npd = np.empty((nrows, ncols), dtype=dtype)
+            icol = 0
+            for w, buff in chan_buffers:
+                if w == 1:
+                    n = buff.length()
+                    if n:
+                        npd[:n, icol] = buff.get_data_np(0, n, dtype)
+                else:
+                    n = buff.len()
+                    if n:
+                        npd[:n, icol: icol + w] = buff.get_array_np(0, 0, n, w, dtype).reshape((-1, w))
+                if n < nrows:
+                    npd[n:, icol: icol + w] = dummy_value
+                icol += w
+
+            if dtype == np.float32 or dtype == np.float64:
+                npd[npd == gxu.gx_dummy(dtype)] = np.nan
+
+            line_name = line_list[line_ref.value][0]
+            if block_rows is None or nrows <= block_rows:
+                yield line_name, fid, npd
+            else:
+                for i in range(0, nrows, block_rows):
+                    yield line_name, (fid[0] + i * fid[1], fid[1]), npd[i: i + block_rows]
+
+    def iter_lines(self, lines=None, channels=None, dtype=None, prefetch=2, stop=None):
+        """
+        Iterate through lines, reading the next lines in a background thread while the current line is
+        processed.
+
+        :param lines:       list of lines to read, names or symbols, default is all selected lines
+        :param channels:    list of channels, strings or symbol number.  If None, read all channels
+        :param dtype:       numpy data type for the data, as for `read_line`
+        :param prefetch:    number of lines to read ahead of the current line. Reading stops when this
+                            many lines are waiting to be processed. 0 reads each line when it is requested,
+                            without a background thread.
+        :param stop:        stop check function, called after each line is processed. Iteration ends if
+                            it returns `True`.
+        :returns:           generator of (line_name, npd, channel_names, (fid_start, fid_incr)) tuples, where
+                            npd, channel_names and fid are as returned by `read_line`.
+
+        The background thread has its own GX context and opens its own handle to this database. Changes to
+        this database are committed before reading starts, and should not be made to lines that have not
+        yet been returned.
+
+        Examples:
+
+        .. code::
+
+            for line, npd, ch, fid in gdb.iter_lines(channels=['X', 'Y', 'mag'], prefetch=4):
+                # ... do something with the data in npd ...
+
+        .. versionadded:: 9.8
+        """
+
+        line_names = [ln for ln, _ in self._line_name_symb_list(lines)]
+        if channels is not None:
+            channels = self._to_string_chan_list(channels)
+
+        if prefetch < 1:
+            for ln in line_names:
+                yield (ln,) + self.read_line(ln, channels=channels, dtype=dtype)
+                if stop and stop():
+                    return
+            return
+
+        self.commit()
+        buffered = queue.Queue(maxsize=prefetch)
+        cancel = threading.Event()
+
+        def put(item):
+            while not cancel.is_set():
+                try:
+                    buffered.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def read_ahead():
+            try:
+                with gxapi.GXContext.create(__name__, __version__):
+                    with Geosoft_gdb.open(self._file_name) as gdb:
+                        for ln in line_names:
+                            if cancel.is_set():
+                                break
+                            put((ln,) + gdb.read_line(ln, channels=channels, dtype=dtype))
+            except Exception:
+                put(sys.exc_info()[1])
+            finally:
+                put(None)
+
+        reader = threading.Thread(target=read_ahead, daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = buffered.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                if stop and stop():
+                    break
+        finally:
+            cancel.set()
+            reader.join()
+
+    def query(self, channels, where=None, lines=None, select=True, dtype=None, dummy=None):
+        """
+        Read the rows of channels that meet row conditions from many lines into a single array.
+
+        :param channels:    list of channels to return, strings or symbol numbers
+        :param where:       dictionary of row conditions {channel: condition}. A row is returned if all
+                            conditions are met. Condition channels do not need to be in `channels`, and a
+                            condition is never met by a dummy. Conditions may be:
+
+            ================ =============================================================
+            None             the value is not a dummy
+            (min, max)       min <= value <= max, use None for an open limit
+            [v0, v1, ...]    the value is one of the values in a list or set
+            value            the value equals value
+            ================ =============================================================
+
+        :param lines:       lines to read, names or symbols, default is all lines according to `select`
+        :param select:      `True` to read selected lines, `False` to read all lines if `lines` is not specified
+        :param dtype:       numeric numpy data type for the data, default np.float64
+        :param dummy:       READ_REMOVE_DUMMYROWS to also remove rows with a dummy in any of the `channels`
+        :returns:           2D numpy array shape(rows, columns), list of column names
+
+        Only the channels needed are read, in blocks served by `geosoft.gxapi.GXDBREAD` as for
+        `iter_blocks`, and the conditions are applied to each block as it is read.  Lines in which the
+        channels read have different fiducials are read with `read_line`, which resamples the channels to
+        a common fiducial. VA channels are returned expanded by element with column names name[0], name[1],
+        etc., but cannot be used in a condition.
+
+        Examples:
+
+        .. code::
+
+            # Cu, Pb and Zn where Cu is valid, from lines flown at 100 to 150 m clearance
+            npd, ch = gdb.query(['Cu', 'Pb', 'Zn'], where={'Cu': None, 'clearance': (100., 150.)})
+
+        .. versionadded:: 9.8
+        """
+
+        if dtype is None:
+            dtype = np.float64
+        dtype = np.dtype(dtype)
+        if dtype == np.float32 or dtype == np.float64:
+            dummy_value = np.nan
+        else:
+            dummy_value = gxu.gx_dummy(dtype)
+
+        def valid(v):
+            if np.isnan(dummy_value):
+                return ~np.isnan(v)
+            return v != dummy_value
+
+        channels = [self.channel_name_symb(c)[0] for c in self._to_string_chan_list(channels)]
+        if len(channels) == 0:
+            raise GdbException(_t('At least one channel is required.'))
+        if where is None:
+            where = {}
+        where = {self.channel_name_symb(c)[0]: condition for c, condition in where.items()}
+
+        # read only the returned channels and the condition channels
+        read = channels + [c for c in where if c not in channels]
+        column = {}
+        col_names = []
+        ncols = 0
+        for c in read:
+            w = self.channel_width(c)
+            if c in where and w != 1:
+                raise GdbException(_t('Array channel \'{}\' cannot be used in a condition.').format(c))
+            column[c] = ncols
+            if c in channels:
+                if w == 1:
+                    col_names.append(c)
+                else:
+                    col_names.extend('{}[{}]'.format(c, i) for i in range(w))
+            ncols += w
+        nout = len(col_names)
+
+        if lines is None:
+            lines = list(self.list_lines(select=select))
+
+        def same_fid(ls):
+            # True if the channels read from a line have the same fiducial
+            fids = set()
+            for c in read:
+                cs = self.channel_name_symb(c)[1]
+                self.lock_read_(cs)
+                try:
+                    if self._db.get_channel_length(ls, cs):
+                        fids.add((self._db.get_fid_start(ls, cs), self._db.get_fid_incr(ls, cs)))
+                finally:
+                    self.unlock_(cs)
+            return len(fids) <= 1
+
+        def blocks():
+            # blocks as served for runs of lines with the same fiducial, other lines resampled by read_line
+            run = []
+            for _, ls in self._line_name_symb_list(lines):
+                if same_fid(ls):
+                    run.append(ls)
+                    continue
+                if run:
+                    for _, _, b in self.iter_blocks(run, channels=read, dtype=dtype):
+                        yield b
+                    run = []
+                data = self.read_line(ls, channels=read, dtype=dtype)[0]
+                if len(data):
+                    yield data
+            if run:
+                for _, _, b in self.iter_blocks(run, channels=read, dtype=dtype):
+                    yield b
+
+        npd = np.empty((4096, nout), dtype=dtype)
+        n = 0
+        for block in blocks():
+
+            mask = np.ones(len(block), dtype=bool)
+            for c, condition in where.items():
+                v = block[:, column[c]]
+                mask &= valid(v)
+                if condition is None:
+                    continue
+                if isinstance(condition, tuple):
+                    vmin, vmax = condition
+                    if vmin is not None:
+                        mask &= v >= vmin
+                    if vmax is not None:
+                        mask &= v <= vmax
+                elif isinstance(condition, (list, set, frozenset, np.ndarray)):
+                    mask &= np.isin(v, list(condition))
+                else:
+                    mask &= v == condition
+            if dummy == READ_REMOVE_DUMMYROWS:
+                mask &= valid(block[:, :nout]).all(axis=1)
+
+            rows = block[mask, :nout]
+            if n + len(rows) > len(npd):
+                grown = np.empty((max(2 * len(npd), n + len(rows)), nout), dtype=dtype)
+                grown[:n] = npd[:n]
+                npd = grown
+            npd[n: n + len(rows)] = rows
+            n += len(rows)
+
+        return npd[:n], col_names
+
+    def map_lines(self, func, lines=None, channels=None, out_channels=None, workers=None, ordered=True, dtype=None):
+        """
+        Apply a function to the data of each line, with lines processed in parallel.
+
+        :param func:            function `func(line_name, npd)` called for each line, where `npd` is the line
+                                data as returned by `read_line`.
+        :param lines:           lines to process, names or symbols, default is all selected lines
+        :param channels:        channels to read, default is all channels
+        :param out_channels:    channels to which the result of `func` is written. If specified, `func` must
+                                return a numpy array shape (records, channels) that matches `out_channels`,
+                                or None to leave a line unchanged.
+        :param workers:         number of worker threads, default is the number of cores
+        :param ordered:         `True` to write or return results in the order of `lines`, `False` to write or
+                                return results as lines are completed.
+        :param dtype:           numpy data type for the line data, default np.float64
+        :returns:               list of (line_name, result) tuples, or None if results are written to
+                                `out_channels`.
+
+        Each worker thread has its own GX context and opens its own handle to this database, from which it
+        reads lines and calls `func`. Results are passed back to the calling thread, which is the only thread
+        that writes to the database. Changes to this database are committed before the workers start, and
+        results are written to `out_channels` after the workers have finished, so no line is written while
+        the database is being read by the workers. Lines are given to the workers as results are taken,
+        so at most 4 lines per worker are in process or waiting to be taken.
+
+        Examples:
+
+        .. code::
+
+            def despike(line, npd):
+                return np.clip(npd, -1000., 1000.)
+
+            gdb.map_lines(despike, channels='mag', out_channels='mag_despiked')
+
+        .. versionadded:: 9.8
+        """
+
+        line_names = [ln for ln, _ in self._line_name_symb_list(lines)]
+        if channels is not None:
+            channels = self._to_string_chan_list(channels)
+        if out_channels is not None:
+            out_channels = self._to_string_chan_list(out_channels)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(int(workers), len(line_names)))
+
+        results = []
+
+        def keep(ln, result, fid):
+            if out_channels is None:
+                results.append((ln, result))
+            elif result is not None:
+                self.write_line(ln, result, channels=out_channels, fid=fid)
+
+        if workers <= 1:
+            for ln in line_names:
+                npd, _, fid = self.read_line(ln, channels=channels, dtype=dtype)
+                keep(ln, func(ln, npd), fid)
+            return None if out_channels is not None else results
+
+        self.commit()
+        tasks = queue.Queue()
+        done = queue.Queue()
+        cancel = threading.Event()
+
+        def work():
+            try:
+                with gxapi.GXContext.create(__name__, __version__):
+                    with Geosoft_gdb.open(self._file_name) as gdb:
+                        while not cancel.is_set():
+                            task = tasks.get()
+                            if task is None:
+                                break
+                            i, ln = task
+                            npd, _, fid = gdb.read_line(ln, channels=channels, dtype=dtype)
+                            done.put((i, ln, func(ln, npd), fid))
+            except Exception:
+                done.put((None, sys.exc_info()[1], None, None))
+            finally:
+                done.put(None)
+
+        threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+        for t in threads:
+            t.start()
+
+        # lines are dispatched as results are taken, which limits the results waiting to be taken in order
+        window = 4 * workers
+        sent = 0
+        taken = 0
+
+        def dispatch():
+            nonlocal sent
+            while sent < len(line_names) and sent < taken + window:
+                tasks.put((sent, line_names[sent]))
+                sent += 1
+            if sent == len(line_names) or cancel.is_set():
+                for _ in threads:
+                    tasks.put(None)
+                sent = len(line_names) + 1
+
+        # results to write are kept until the workers have finished reading
+        out_results = results if out_channels is None else []
+
+        pending = {}
+        error = None
+        running = workers
+        dispatch()
+        while running:
+            item = done.get()
+            if item is None:
+                running -= 1
+                continue
+            i, ln, result, fid = item
+            if error is not None:
+                continue
+            try:
+                if i is None:
+                    raise ln
+                if ordered:
+                    pending[i] = (ln, result, fid)
+                    while taken in pending:
+                        out_results.append(pending.pop(taken))
+                        taken += 1
+                else:
+                    out_results.append((ln, result, fid))
+                    taken += 1
+            except Exception as e:
+                error = e
+                cancel.set()
+            if sent <= len(line_names):
+                dispatch()
+
+        for t in threads:
+            t.join()
+        if error is not None:
+            raise error
+
+        if out_channels is None:
+            results[:] = [(ln, result) for ln, result, _ in results]
+        else:
+            for ln, result, fid in out_results:
+                keep(ln, result, fid)
+
+        return None if out_channels is not None else results
+
     def write_channel_vv(self, line, channel, vv):
         """
         Write data to a single channel.
@@ -1951,15 +2794,14 @@ class Geosoft_gdb(gxgeo.Geometry):
             else:
                 raise
 
-        if cn in self.xyz_channels:
-            self.clear_extent()
-
         self.lock_write_(cs)
         try:
             self._db.put_chan_vv(ls, cs, vv.gxvv)
         finally:
             self.unlock_(cs)
 
+        self._update_line_extent(ls, cn)
+
         if vv.unit_of_measure:
             Channel(self, cs).unit_of_measure = vv.unit_of_measure
 
@@ -2028,9 +2870,6 @@ class Geosoft_gdb(gxgeo.Geometry):
         else:
             cn, cs = self.channel_name_symb(channel)
 
-        if cn in self.xyz_channels:
-            self.clear_extent()
-
         if _va_width(data) == 0:
             # no data to write
             return
@@ -2064,6 +2903,8 @@ class Geosoft_gdb(gxgeo.Geometry):
             finally:
                 self.unlock_(cs)
 
+        self._update_line_extent(ls, cn, data)
+
         if unit_of_measure:
             Channel(self, cs).unit_of_measure = unit_of_measure
 
@@ -2146,7 +2987,29 @@ class Geosoft_gdb(gxgeo.Geometry):
                 self.write_channel(line, cs, data[:, np_index: np_index + w], fid=fid)
                 np_index += w
 
-    def list_values(self, chan, umax=1000, selected=True, dupl=50, progress=None, stop=None):
+    def bulk_writer(self, channels, dtype=None):
+        """
+        Return a `Bulk_writer` that writes blocks of data to a set of channels in a single operation per
+        block. This is much faster than `write_line` for many lines or many channels.
+
+        :param channels:    list of channel names or symbols. Channels that do not exist are created.
+                            Array channels must exist.
+        :param dtype:       numpy dtype for new channels, default np.float64
+        :returns:           `Bulk_writer` instance, which commits data to the database when closed
+
+        Example:
+
+        .. code::
+
+            with gdb.bulk_writer(['X', 'Y', 'mag']) as writer:
+                for line, npd in data_blocks:
+                    writer.write(line, npd)
+
+        .. versionadded:: 9.8
+        """
+        return Bulk_writer(self, channels, dtype=dtype)
+
+    def list_values(self, chan, umax=1000, selected=True, dupl=50, progress=None, stop=None, counts=False):
         """
         Build a list of unique values in a channel.  Uniqueness depends on the current display format for
         the field.
@@ -2154,59 +3017,121 @@ class Geosoft_gdb(gxgeo.Geometry):
         :param chan:            channel to scan
         :param umax:            maximum values allowed, once this maximum is reached scanning stops, default 1000
         :param selected:        `True` to scan only selected lines
-        :param dupl:            Stop growing list after this many lines fail to grow the list, 0 scans all lines
+        :param dupl:            Stop growing list after this many lines fail to grow the list, 0 scans all lines.
+                                Ignored if `counts` is `True` or for numeric channels in the normal display
+                                format, in which case all lines are scanned.
         :param progress:        progress reporting function
         :param stop:            stop check function
-        :returns:               list of values, represented as a string
+        :param counts:          `True` to also return the number of times each value occurs
+        :returns:               list of values, represented as a string, or if `counts` is `True`
+                                a list of (value, count) tuples.
+
+        Numeric channels in the normal display format are read in blocks as numbers, rounded to the display
+        decimals and counted, and only the unique values are formatted as strings. Other channels are read
+        as formatted strings. Dummies are not included.
 
         .. versionadded:: 9.1
+
+        .. versionchanged:: 9.8
+            added `counts`, numeric channels are counted as numbers and all lines are scanned, dummies
+            are not included
         """
 
         lines = list(self.list_lines(select=selected))
         cn, cs = self.channel_name_symb(chan)
         details = self.channel_details(cs)
-        dtype = np.dtype('<U{}'.format(details.get('width')))
         lines.sort(key=str.lower)
-        vset = []
-        n = 0
-        nset = -1
-        ndup = 0
-        for l in lines:
 
-            try:
-                d, c, f = self.read_line(l, cs, dtype=dtype)
-            except GdbException:
-                continue
+        chan_dtype = np.dtype(self.channel_dtype(cs))
+        native = (details.get('format') == FORMAT_NORMAL) and (gxu.gx_dtype(chan_dtype) >= 0)
+        decimal = details.get('decimal')
 
-            if d.shape[0] == 0:
-                continue
+        # numeric channels are counted in blocks, so there is no need to stop early
+        if counts or native:
+            dupl = 0
+
+        if native:
+            def line_values():
+                for ln, _, npd in self.iter_blocks(lines, channels=cs, dtype=chan_dtype):
+                    d = npd[:, 0]
+                    if chan_dtype.kind == 'f':
+                        d = np.round(d[~np.isnan(d)], decimal)
+                    else:
+                        d = d[d != gxu.gx_dummy(chan_dtype)]
+                    yield ln, d
+        else:
+            def line_values():
+                dtype = np.dtype('<U{}'.format(details.get('width')))
+                for l in lines:
+                    try:
+                        d = self.read_line(l, cs, dtype=dtype)[0].reshape(-1)
+                    except GdbException:
+                        continue
+                    # dummies format as '*', or are empty in string channels
+                    stripped = np.char.strip(d)
+                    yield l, d[(stripped != '*') & (stripped != '')]
 
-            d = np.unique(d)
-            vset = np.append(vset, d)
-            vset = np.unique(vset)
+        tally = {}
+        scan = {'lines': 0, 'nset': -1, 'ndup': 0}
 
-            if vset.shape[0] > umax:
-                break
+        def line_done(l):
+            # True if scanning should stop after a line
             if dupl > 0:
-                if vset.shape[0] == nset:
-                    ndup += 1
-                    if ndup > dupl:
-                        break
+                if len(tally) == scan['nset']:
+                    scan['ndup'] += 1
+                    if scan['ndup'] > dupl:
+                        return True
                 else:
-                    ndup = 0
-            nset = vset.shape[0]
+                    scan['ndup'] = 0
+            scan['nset'] = len(tally)
 
-            n += 1
+            scan['lines'] += 1
             if progress:
-                progress('Scanning unique values in "{}", {}'.format(cn, str(l)), (n * 100.0) / len(lines))
+                progress('Scanning unique values in "{}", {}'.format(cn, str(l)),
+                         (scan['lines'] * 100.0) / len(lines))
             if stop:
                 if stop():
-                    return vset.tolist()
-
-        if vset.shape[0] > umax:
-            vset = vset[:umax]
+                    return True
+            return False
+
+        # lines may be served in more than one block
+        current = None
+        for l, d in line_values():
+
+            if l != current:
+                if current is not None and line_done(current):
+                    current = None
+                    break
+                current = l
+
+            if len(d):
+                values, count = np.unique(d, return_counts=True)
+                for v, c in zip(values.tolist(), count.tolist()):
+                    tally[v] = tally.get(v, 0) + c
+                if len(tally) > umax:
+                    current = None
+                    break
+
+        if current is not None:
+            line_done(current)
+
+        # format unique numbers for display, values that format the same are combined
+        if native:
+            formatted = {}
+            sr = gxapi.str_ref()
+            for v, c in tally.items():
+                if chan_dtype.kind == 'f':
+                    gxapi.GXSTR.format_double(v, sr, FORMAT_NORMAL, details.get('width'), decimal)
+                    v = sr.value.strip()
+                else:
+                    v = str(v)
+                formatted[v] = formatted.get(v, 0) + c
+            tally = formatted
 
-        return vset.tolist()
+        values = sorted(tally)[:umax]
+        if counts:
+            return [(v, tally[v]) for v in values]
+        return values
 
     def figure_map(self, file_name=None, overwrite=False, title=None, draw=DRAW_AS_POINTS,
                    features=None, **kwargs):
@@ -2303,6 +3228,159 @@ class Geosoft_gdb(gxgeo.Geometry):
         return gmap
 
 
+class Bulk_writer:
+    """
+    Write blocks of line data to a set of channels through a `geosoft.gxapi.GXDBWRITE` instance.
+    Create instances using `Geosoft_gdb.bulk_writer`.
+
+    :param gdb:         `Geosoft_gdb` instance
+    :param channels:    list of channel names or symbols. Channels that do not exist are created as
+                        single-column channels of type `dtype`.  Array channels must exist.
+    :param dtype:       numpy dtype for new channels, default np.float64
+
+    Data written to the writer is buffered by `geosoft.gxapi.GXDBWRITE` and committed to the database
+    when the writer is closed, which happens automatically when used in a `with` statement.  If the
+    `with` statement ends with an exception the buffered data is discarded.
+
+    .. versionadded:: 9.8
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _type, _value, _traceback):
+        self.close(commit=_type is None)
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__, self.__dict__)
+
+    def __init__(self, gdb, channels, dtype=None):
+
+        self.gdb = gdb
+        if dtype is None:
+            dtype = np.float64
+
+        channels = gdb._to_string_chan_list(channels)
+        if len(channels) == 0:
+            raise GdbException(_t('At least one channel is required.'))
+
+        self._dbwrite = gxapi.GXDBWRITE.create(gdb.gxdb)
+        self._channels = []
+        self._width = 0
+        xyz = gdb.xyz_channels
+        self._xyz = None
+        self._xyz_lines = set()
+        self._next_fid = {}
+        for c in channels:
+            if isinstance(c, str) and not gdb.exist_symb_(c, gxapi.DB_SYMB_CHAN):
+                cs = gdb.new_channel(c, dtype)
+            else:
+                cs = gdb.channel_name_symb(c)[1]
+            cn = gdb.channel_name_symb(cs)[0]
+            if cn in xyz:
+                self._xyz = cn
+            index = self._dbwrite.add_channel(cs)
+            w = self._dbwrite.get_chan_array_size(index)
+            if w == 1:
+                self._channels.append((w, self._dbwrite.get_vv(index)))
+            else:
+                self._channels.append((w, self._dbwrite.get_va(index)))
+            self._width += w
+        self._open = True
+
+    @property
+    def width(self):
+        """
+        Number of data columns required in each block, with array channels expanded by element.
+
+        .. versionadded:: 9.8
+        """
+        return self._width
+
+    def write(self, line, data, fid=None):
+        """
+        Write a block of data to a line.
+
+        :param line:    line name or symbol, created if it does not exist
+        :param data:    numpy array shape (records, width), where `width` matches the channels, array channels
+                        expanded.  A 1D array is accepted for a single column.
+        :param fid:     fid tuple (start, increment). The default is (0.0, 1.0) for the first block written
+                        to a line, and the fiducial that follows the previous block for other blocks.
+
+        Float data may use np.nan for dummies.  Multiple blocks written to the same line are appended in the
+        order written. Each block must follow the previous block of the line, so a `fid` passed for a line
+        that has been written must be the fiducial that follows the previous block.
+
+        .. versionadded:: 9.8
+        """
+
+        if not self._open:
+            raise GdbException(_t('Bulk writer is closed.'))
+
+        if not isinstance(data, np.ndarray):
+            data = np.array(data)
+        if data.ndim == 1:
+            data = data.reshape((-1, 1))
+        if data.ndim != 2 or data.shape[1] != self._width:
+            raise GdbException(_t('Data dimension ({}) does not match data required by channels ({}).').
+                               format(data.shape, self._width))
+        if gxu.gx_dtype(data.dtype) < 0:
+            raise GdbException(_t('Bulk writes require numeric data, not {}').format(data.dtype))
+
+        ln, ls = self.gdb.line_name_symb(line, create=True)
+        nrows = data.shape[0]
+
+        next_fid = self._next_fid.get(ls)
+        if fid is None:
+            fid = (0.0, 1.0) if next_fid is None else next_fid
+        elif next_fid is not None and not (math.isclose(fid[0], next_fid[0], rel_tol=1.0e-9, abs_tol=1.0e-12) and
+                                           math.isclose(fid[1], next_fid[1], rel_tol=1.0e-9)):
+            raise GdbException(_t('Block fid {} for line \'{}\' does not follow the previous block, expected {}.')
+                               .format(tuple(fid), ln, next_fid))
+        self._next_fid[ls] = (fid[0] + nrows * fid[1], fid[1])
+
+        if data.dtype == np.float32 or data.dtype == np.float64:
+            if np.isnan(data).any():
+                data = data.copy()
+                data[np.isnan(data)] = gxu.gx_dummy(data.dtype)
+
+        # column-major copy so each channel is a contiguous row
+        columns = np.ascontiguousarray(data.T)
+
+        icol = 0
+        for w, buff in self._channels:
+            if w == 1:
+                buff.set_data_np(0, columns[icol])
+                buff.set_len(nrows)
+            else:
+                buff.set_ln(nrows)
+                buff.set_array_np(0, 0, np.ascontiguousarray(columns[icol: icol + w].T))
+            buff.set_fid_start(fid[0])
+            buff.set_fid_incr(fid[1])
+            icol += w
+
+        self._dbwrite.add_block(ls)
+        if self._xyz:
+            self._xyz_lines.add(ls)
+
+    def close(self, commit=True):
+        """
+        Commit all data to the database and release the writer.
+
+        :param commit:  `False` to discard the buffered data and release the writer without committing
+
+        .. versionadded:: 9.8
+        """
+        if self._open:
+            self._open = False
+            if commit:
+                self._dbwrite.commit()
+            self._dbwrite = None
+            if commit:
+                for ls in self._xyz_lines:
+                    self.gdb._update_line_extent(ls, self._xyz)
+
+
 class Channel:
     """
     Class to work with database channels.  Use constructor `Channel.new` to create a new channel.
@@ -2398,6 +3476,7 @@ class Channel:
             if self.gdb.exist_symb_(name, gxapi.DB_SYMB_CHAN):
                 raise GdbException(_t('Cannot rename to an existing channel name \'{}\''.format(name)))
             self.lock_set_(self.gdb.gxdb.set_chan_name, name)
+            self.gdb.clear_symbol_cache()
 
     @property
     def symbol(self):
@@ -2606,6 +3685,7 @@ class Channel:
             raise GdbException(_t("Cannot delete protected channel '{}'".format(self.name)))
         self.lock = SYMBOL_LOCK_WRITE
         self.gdb.gxdb.delete_symb(self._symb)
+        self.gdb.clear_symbol_cache()
         self._symb = gxapi.NULLSYMB
 
 
@@ -2730,6 +3810,7 @@ class Line:
     @type.setter
     def type(self, value):
         self.lock_set_(self.gdb.gxdb.set_line_type, value)
+        self.gdb.clear_symbol_cache()
 
     @property
     def category(self):
@@ -2782,6 +3863,7 @@ class Line:
     @number.setter
     def number(self, value):
         self.lock_set_(self.gdb.gxdb.set_line_num, int(value))
+        self.gdb.clear_symbol_cache()
 
     @property
     def version(self):
@@ -2795,6 +3877,7 @@ class Line:
     @version.setter
     def version(self, value):
         self.lock_set_(self.gdb.gxdb.set_line_ver, value)
+        self.gdb.clear_symbol_cache()
 
     @property
     def grouped(self):
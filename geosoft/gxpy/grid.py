@@ -20,6 +20,9 @@ Geosoft grid and image handling, including all
 
 """
 import os
+import time
+import collections
+import concurrent.futures
 import numpy as np
 import math
 
@@ -303,8 +306,8 @@ class Grid(gxgm.Geometry):
                     gx.pop_resource(self._open)
                 self._open = None
                 self._buffer_np = None
-                self._buffer_x = None
-                self._buffer_y = None
+                self._buffered_xy = None
+                self._buffer_xyz = None
                 self._cs = None
                 self._gxpg = None
 
@@ -339,8 +342,8 @@ class Grid(gxgm.Geometry):
         self._buffered_row = None
         self._buffer_np = None
         self._buffered_xy = None
-        self._buffer_x = None
-        self._buffer_y = None
+        self._buffer_xyz = None
+        self._sample_cache = None
         self._cs = None
         self._gxpg = None
 
@@ -521,15 +524,19 @@ class Grid(gxgm.Geometry):
                           pastol='100',
                           itrmax='',
                           ti='',
-                          icgr=''):
+                          icgr='',
+                          chunk=1000000,
+                          timing=None):
         """
         Create a minimum-curvature surface grid from (x, y, value) located data.
 
         Reference: Smith and Wessel, 1990, Gridding with continuous curvature splines in tension.
 
-        :param data:        list of [(x, y, value), ...] or a callback that returns lists, or a tuple
-                            (gdb, value_channel, x_channel, y_channel) where x_channel and y_channel, if not
-                            specified, default to the current database (x, y) channels.  See below.
+        :param data:        list of [(x, y, value), ...], a numpy array shaped (-1, 3), which may be a
+                            memory-mapped array, an iterator or generator of such arrays, a callback that returns
+                            lists, or a tuple (gdb, value_channel, x_channel, y_channel) where x_channel and
+                            y_channel, if not specified, default to the current database (x, y) channels.
+                            See below.
         :param unit_of_measure: string unit of measurement descriptor.
         :param file_name:   name of the grid file, None for a temporary grid. See `supported file formats
                             <https://geosoftgxdev.atlassian.net/wiki/display/GXDEV92/Grid+File+Name+Decorations>`_)
@@ -594,16 +601,23 @@ class Grid(gxgm.Geometry):
                         situations the default is fine.  This parameter effects the
                         length of time it takes to find a solution.
 
+        :param chunk:   maximum number of points staged to the gridder in a single block. Large arrays are
+                        staged in blocks of this size so that memory-mapped data need not be read into memory.
+        :param timing:  optional dictionary, which is updated with 'points', the number of points staged,
+                        'staging', the time in seconds to stage the data for the gridder, and 'solve', the time
+                        in seconds to calculate the grid. Times are also reported to the `geosoft.gxpy.gx` log.
+
         **The** `data` **parameter:**
 
-        The data can be provided to the gridding algorithm either as a list array, a callback function that
-        returns list array segments, or a `geosoft.gxpy.gdb.Geosoft_database` instance. In the case of a list or
-        a callback, a temporary database is constructed internally.
+        The data can be provided to the gridding algorithm either as a list array, a numpy array, an
+        iterator of arrays, a callback function that returns list array segments, or a
+        `geosoft.gxpy.gdb.Geosoft_database` instance. In all but the database case the data is staged to a
+        temporary database in blocks of at most `chunk` points using a `geosoft.gxpy.gdb.Bulk_writer`.
 
         A callback is passed a sequence number, 0, 1, 2, ... and is expected to return a list array with each call
-        or None when there is no more data.  See the example below. When a callback is used, the `max_segments`
-        parameter sets the maximum number of lines for the temporary database as each return from the
-        callback will create a new line in the internal temporary database.
+        or None when there is no more data.  See the example below. When a callback or an iterator is used, the
+        `max_segments` parameter sets the maximum number of lines for the temporary database as each return from
+        the callback will create a new line in the internal temporary database.
 
         If a database instance is passed it must be the first item in a tuple of 2 or 4 items:
         (gdb_instance, value_channel) or (gdb_instance, value_channel, x_channel, y_channel).
@@ -638,34 +652,49 @@ class Grid(gxgm.Geometry):
                 return nxyv[n]
             grid = gxgrd.Grid.minimum_curvature(feed_data, cs=1.)
 
+            # a memory-mapped array of (x, y, value) saved with numpy.save
+            grid = gxgrd.Grid.minimum_curvature(np.load('xyv.npy', mmap_mode='r'), cs=1.)
+
+        .. seealso:: `geosoft.gxpy.gridding.minimum_curvature` for a numpy implementation.
+
         .. versionadded:: 9.4
+
+        .. versionchanged:: 9.8 added numpy array and iterator data, `chunk` and `timing`.
         """
 
-        def gdb_from_callback(callback):
+        def gdb_from_segments(segments):
             _gdb = gxgdb.Geosoft_gdb.new(max_lines=max_segments)
             channels = ('x', 'y', 'v')
+            npoints = 0
+            with _gdb.bulk_writer(channels, dtype=np.float64) as writer:
+                for il, xyz_list in enumerate(segments):
+                    if not isinstance(xyz_list, np.ndarray):
+                        xyz_list = np.array(xyz_list, dtype=np.float64)
+                    xyz_list = xyz_list.reshape((-1, 3))
+                    line = 'L{}'.format(il)
+                    for i in range(0, len(xyz_list), chunk):
+                        writer.write(line, np.asarray(xyz_list[i: i + chunk], dtype=np.float64))
+                    npoints += len(xyz_list)
+            _gdb.xyz_channels = channels[:2]
+            return _gdb, npoints
+
+        def callback_segments(callback):
             il = 0
             xyz_list = callback(il)
             while xyz_list is not None:
-                _gdb.write_line('L{}'.format(il), xyz_list, channels=channels)
+                yield xyz_list
                 il += 1
                 xyz_list = callback(il)
-            _gdb.xyz_channels = channels[:2]
-            return _gdb
 
-        def gdb_from_data(_d):
-            def _data(i):
-                if i == 0:
-                    return _d
-                else:
-                    return None
-            return gdb_from_callback(_data)
-
-        # create a database from the data
+        # stage the data in a database
+        gxc = gx.gx()
+        chunk = max(1, int(chunk))
+        start_time = time.perf_counter()
+        npoints = None
         xc, yc = ('x', 'y')
         discard = False
         if callable(data):
-            gdb = gdb_from_callback(data)
+            gdb, npoints = gdb_from_segments(callback_segments(data))
             vc = 'v'
             discard = True
 
@@ -679,9 +708,17 @@ class Grid(gxgm.Geometry):
                 xc, yc, _ = gdb.xyz_channels
             discard = True
 
+        elif isinstance(data, (list, np.ndarray)):
+            gdb, npoints = gdb_from_segments((data,))
+            vc = 'v'
+            discard = True
+
         else:
-            gdb = gdb_from_data(data)
+            gdb, npoints = gdb_from_segments(iter(data))
             vc = 'v'
+            discard = True
+
+        staging_time = time.perf_counter() - start_time
 
         if tol and float(tol) <= 0.:
             tol = 1.0e-25
@@ -704,7 +741,15 @@ class Grid(gxgm.Geometry):
             else:
                 raise GridException(_t('Cannot overwrite existing file: {}').format(file_name))
 
+        start_time = time.perf_counter()
         gxapi.GXRGRD.run2(gdb.gxdb, xc, yc, vc, con_file, file_name)
+        solve_time = time.perf_counter() - start_time
+        gxc.log(_t('Minimum curvature: staging {:.3f} seconds, solve {:.3f} seconds')
+                .format(staging_time, solve_time))
+        if timing is not None:
+            timing['points'] = npoints
+            timing['staging'] = staging_time
+            timing['solve'] = solve_time
 
         grd = cls.open(file_name, mode=FILE_READWRITE)
         if coordinate_system is None:
@@ -1240,6 +1285,7 @@ class Grid(gxgm.Geometry):
     def coordinate_system(self, cs):
         self._cs = gxcs.Coordinate_system(cs)
         self._img.set_ipj(self._cs.gxipj)
+        self._buffered_xy = None
 
     def properties(self):
         """
@@ -1330,24 +1376,29 @@ class Grid(gxgm.Geometry):
     @x0.setter
     def x0(self, v):
         self._img.set_info(self.dx, self.dy, v, self.y0, -self.rot)
+        self._buffered_xy = None
 
     @y0.setter
     def y0(self, v):
         self._img.set_info(self.dx, self.dy, self.x0, v, -self.rot)
+        self._buffered_xy = None
 
     @dx.setter
     def dx(self, v):
         self._img.set_info(v, self.dy, self.x0, self.y0, -self.rot)
+        self._buffered_xy = None
 
     @dy.setter
     def dy(self, v):
         self._img.set_info(self.dx, v, self.x0, self.y0, -self.rot)
+        self._buffered_xy = None
 
     @rot.setter
     def rot(self, v):
         self._img.set_info(self.dx, self.dy, self.x0, self.y0, -v)
         self._cos_rot = math.cos(math.radians(v))
         self._sin_rot = math.sin(math.radians(v))
+        self._buffered_xy = None
 
     def set_properties(self, properties):
         """
@@ -1429,6 +1480,7 @@ class Grid(gxgm.Geometry):
                 dvv.set_data(data[i, :])
             self._img.write_y(iy, ix0, 0, dvv.gxvv)
             iy += order
+        self._sample_cache = None
 
     def read_row(self, row=None, start=0, length=None):
         """
@@ -1505,6 +1557,7 @@ class Grid(gxgm.Geometry):
         if length is None:
             length = 0
         self._img.write_y(row, start, length, data.gxvv)
+        self._sample_cache = None
 
     def write_column(self, data, column=None, start=0, length=None):
         """
@@ -1531,6 +1584,7 @@ class Grid(gxgm.Geometry):
         if length is None:
             length = 0
         self._img.write_x(column, start, length, data.gxvv)
+        self._sample_cache = None
 
     def reset_read_write(self):
         """ Reset the default read/write to the grid row 0, column 0. """
@@ -1579,6 +1633,261 @@ class Grid(gxgm.Geometry):
             return rotate(x, y)
         return x, y
 
+    def xy_from_index_np(self, ix, iy):
+        """
+        Return the rotated grid-plane locations of arrays of grid indexes.
+
+        :param ix:  grid x indexes, array-like, may be fractional
+        :param iy:  grid y indexes, array-like, same shape as `ix` or broadcastable to `ix`
+        :returns:   (x, y) numpy float arrays of locations on the grid plane
+
+        .. versionadded:: 9.8
+        """
+
+        x = np.asarray(ix, dtype=np.float64) * self.dx
+        y = np.asarray(iy, dtype=np.float64) * self.dy
+        if self.rot != 0.:
+            x, y = (x * self._cos_rot + y * self._sin_rot,
+                    y * self._cos_rot - x * self._sin_rot)
+        return x + self.x0, y + self.y0
+
+    def xyz_from_index_np(self, ix, iy):
+        """
+        Return the locations of arrays of grid indexes in the base coordinate system. For grids in an
+        oriented coordinate system (sections) all points are transformed in a single call.
+
+        :param ix:  grid x indexes, array-like, may be fractional
+        :param iy:  grid y indexes, array-like, same shape as `ix` or broadcastable to `ix`
+        :returns:   (x, y, z) numpy float arrays of locations
+
+        .. versionadded:: 9.8
+        """
+
+        x, y = self.xy_from_index_np(ix, iy)
+        x, y = np.broadcast_arrays(x, y)
+        z = np.zeros(x.shape, dtype=np.float64)
+        cs = self.coordinate_system
+        if cs.is_oriented and x.size:
+            shape = x.shape
+            xyz = cs.xyz_from_oriented(np.array([x.reshape(-1), y.reshape(-1), z.reshape(-1)]),
+                                       column_ordered=True)
+            x, y, z = (c.reshape(shape) for c in xyz)
+        return x, y, z
+
+    def index_from_xy_np(self, x, y, z=None):
+        """
+        Return the fractional grid indexes of locations. This is the inverse of `xy_from_index_np()`, or
+        `xyz_from_index_np()` if `z` is provided.
+
+        :param x:   x locations, array-like
+        :param y:   y locations, array-like
+        :param z:   z locations in the base coordinate system for grids in an oriented coordinate
+                    system. If not provided, (x, y) are locations on the grid plane.
+        :returns:   (ix, iy) numpy float arrays of fractional grid indexes. Round to get the nearest
+                    grid point.
+
+        .. versionadded:: 9.8
+        """
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if z is not None and self.coordinate_system.is_oriented:
+            x, y, z = np.broadcast_arrays(x, y, np.asarray(z, dtype=np.float64))
+            shape = x.shape
+            xyz = self.coordinate_system.oriented_from_xyz(np.array([x.reshape(-1),
+                                                                     y.reshape(-1),
+                                                                     z.reshape(-1)]),
+                                                           column_ordered=True)
+            x = xyz[0].reshape(shape)
+            y = xyz[1].reshape(shape)
+
+        x = x - self.x0
+        y = y - self.y0
+        if self.rot != 0.:
+            x, y = (x * self._cos_rot - y * self._sin_rot,
+                    x * self._sin_rot + y * self._cos_rot)
+        return x / self.dx, y / self.dy
+
+    def _sample_tile(self, tile, tx, ty, cache_tiles):
+        # float64 data of a sample tile with a 2-cell halo, from the LRU tile cache
+        if self._sample_cache is None:
+            self._sample_cache = collections.OrderedDict()
+        key = (tile, tx, ty)
+        data = self._sample_cache.get(key)
+        if data is not None:
+            self._sample_cache.move_to_end(key)
+            return data
+
+        tnx, tny = tile
+        x0 = max(0, tx * tnx - 2)
+        y0 = max(0, ty * tny - 2)
+        nx = min(self.nx, (tx + 1) * tnx + 2) - x0
+        ny = min(self.ny, (ty + 1) * tny + 2) - y0
+        data = (x0, y0, self.np(dtype=np.float64, window=(x0, y0, nx, ny)))
+        self._sample_cache[key] = data
+        while len(self._sample_cache) > max(1, cache_tiles):
+            self._sample_cache.popitem(last=False)
+        return data
+
+    def sample(self, xyz, method='linear', chunk=65536, tile=(256, 256), cache_tiles=64, workers=None):
+        """
+        Sample the grid at many point locations.
+
+        :param xyz:         locations to sample, either a numpy array shaped (-1, 2) of (x, y) locations on the
+                            grid plane, a numpy array shaped (-1, 3) of (x, y, z) locations, or a
+                            `geosoft.gxpy.geometry.Geometry` instance, which is reprojected to the grid coordinate
+                            system if necessary. For grids in an oriented coordinate system (x, y, z) locations are
+                            in the base coordinate system.
+        :param method:      'linear' (default) for bilinear interpolation, 'nearest' for the nearest grid point,
+                            or 'bicubic' for cubic convolution between the surrounding 4x4 grid points.
+        :param chunk:       number of points sampled in each parallel work unit
+        :param tile:        (nx, ny) size of the grid tiles that are read and cached
+        :param cache_tiles: maximum number of decoded tiles cached with this grid instance. The cache is kept
+                            between calls and cleared when the grid is written.
+        :param workers:     number of threads used to interpolate, default is the number of cores.
+        :returns:           1-dimensional numpy float64 array of values, `numpy.nan` for locations outside the
+                            grid or where the grid is dummy.
+
+        .. note:: Points are sorted by tile so each tile needs to be read from the grid only once in a call,
+            and grid reads are done on the calling thread. At most 2 chunks per worker are in process, so
+            memory is limited to the tiles of those chunks and the `cache_tiles` cache. For bicubic sampling,
+            grid points beyond the edge of the grid repeat the edge values.
+
+        .. versionadded:: 9.8
+        """
+
+        if self.is_color:
+            raise GridException(_t('Color grids cannot be sampled, use get_value()'))
+        if method not in ('linear', 'nearest', 'bicubic'):
+            raise GridException(_t('Invalid sample method "{}"').format(method))
+
+        # grid indexes of the points
+        if isinstance(xyz, gxgm.Geometry):
+            if xyz.coordinate_system != self.coordinate_system:
+                xyz = gxgm.PPoint(xyz, coordinate_system=self.coordinate_system)
+            xyz = xyz.pp
+        xyz = np.asarray(xyz, dtype=np.float64).reshape((-1, np.asarray(xyz).shape[-1]))
+        if xyz.shape[1] not in (2, 3):
+            raise GridException(_t('Sample locations must be (x, y) or (x, y, z), found shape {}')
+                                .format(xyz.shape))
+        if xyz.shape[1] == 3:
+            ix, iy = self.index_from_xy_np(xyz[:, 0], xyz[:, 1], xyz[:, 2])
+        else:
+            ix, iy = self.index_from_xy_np(xyz[:, 0], xyz[:, 1])
+
+        npt = len(ix)
+        result = np.full(npt, np.nan)
+        if npt == 0:
+            return result
+
+        gnx = self.nx
+        gny = self.ny
+        with np.errstate(invalid='ignore'):
+            if method == 'nearest':
+                valid = (ix >= -0.5) & (ix < gnx - 0.5) & (iy >= -0.5) & (iy < gny - 0.5)
+            else:
+                valid = (ix >= 0.) & (ix <= gnx - 1) & (iy >= 0.) & (iy <= gny - 1)
+        points = np.nonzero(valid)[0]
+        ix = ix[points]
+        iy = iy[points]
+
+        # base grid point of each sample, the lower-left neighbour when interpolating
+        if method == 'nearest':
+            i0 = np.rint(ix).astype(np.int64)
+            j0 = np.rint(iy).astype(np.int64)
+        else:
+            i0 = np.minimum(np.floor(ix).astype(np.int64), max(gnx - 2, 0))
+            j0 = np.minimum(np.floor(iy).astype(np.int64), max(gny - 2, 0))
+        fx = ix - i0
+        fy = iy - j0
+
+        # sort points by tile
+        tile = (int(tile[0]), int(tile[1]))
+        if tile[0] <= 0 or tile[1] <= 0:
+            raise GridException(_t('Invalid tile size {}').format(tile))
+        ntx = (gnx + tile[0] - 1) // tile[0]
+        tile_id = (j0 // tile[1]) * ntx + (i0 // tile[0])
+        order = np.argsort(tile_id, kind='stable')
+        points, i0, j0, fx, fy, tile_id = (a[order] for a in (points, i0, j0, fx, fy, tile_id))
+
+        if method == 'nearest':
+            offsets = ((0, 0),)
+        elif method == 'linear':
+            offsets = ((0, 0), (1, 0), (0, 1), (1, 1))
+        else:
+            offsets = tuple((i, j) for j in range(-1, 3) for i in range(-1, 3))
+
+        def weighted(w, v):
+            # a dummy neighbour only matters if it has weight
+            with np.errstate(invalid='ignore'):
+                return np.where(w == 0., 0., w * v)
+
+        def lerp(a, b, t):
+            return weighted(1. - t, a) + weighted(t, b)
+
+        def cubic_weights(t):
+            t2 = t * t
+            t3 = t2 * t
+            return (-0.5 * t3 + t2 - 0.5 * t,
+                    1.5 * t3 - 2.5 * t2 + 1.,
+                    -1.5 * t3 + 2. * t2 + 0.5 * t,
+                    0.5 * t3 - 0.5 * t2)
+
+        def interpolate(start, stop, tiles):
+            ci0 = i0[start: stop]
+            cj0 = j0[start: stop]
+            cid = tile_id[start: stop]
+            if len(tiles) == 1:
+                masks = {t: slice(None) for t in tiles}
+            else:
+                masks = {t: cid == t for t in tiles}
+            values = np.empty((len(offsets), stop - start))
+            for k, (oi, oj) in enumerate(offsets):
+                ii = np.clip(ci0 + oi, 0, gnx - 1)
+                jj = np.clip(cj0 + oj, 0, gny - 1)
+                for t, (tx0, ty0, data) in tiles.items():
+                    mask = masks[t]
+                    values[k, mask] = data[jj[mask] - ty0, ii[mask] - tx0]
+
+            if method == 'nearest':
+                v = values[0]
+            elif method == 'linear':
+                cfx = fx[start: stop]
+                cfy = fy[start: stop]
+                v = lerp(lerp(values[0], values[1], cfx), lerp(values[2], values[3], cfx), cfy)
+            else:
+                cfx = fx[start: stop]
+                cfy = fy[start: stop]
+                wx = cubic_weights(cfx)
+                wy = cubic_weights(cfy)
+                values = values.reshape((4, 4, -1))
+                v = sum(weighted(wy[j], sum(weighted(wx[i], values[j, i]) for i in range(4))) for j in range(4))
+            result[points[start: stop]] = v
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, int(workers))
+        chunk = max(1, int(chunk))
+        ntp = len(points)
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+
+            # at most 2 chunks per worker in process, the tiles of a chunk are released when it is done
+            pending = collections.deque()
+            for start in range(0, ntp, chunk):
+                stop = min(ntp, start + chunk)
+                tiles = {}
+                for t in np.unique(tile_id[start: stop]):
+                    t = int(t)
+                    tiles[t] = self._sample_tile(tile, t % ntx, t // ntx, cache_tiles)
+                pending.append(pool.submit(interpolate, start, stop, tiles))
+                del tiles
+                while len(pending) >= 2 * workers:
+                    pending.popleft().result()
+            while pending:
+                pending.popleft().result()
+
+        return result
+
     def extent_2d(self):
         """
         Return the 2D extent of the grid on the grid plane.
@@ -1681,39 +1990,165 @@ class Grid(gxgm.Geometry):
         """
         return gxgm.Point2((self.extent_3d()), coordinate_system=self.coordinate_system)
 
-    def np(self, dtype=None):
+    def np(self, dtype=None, out=None, window=None):
         """
         Return a numpy array of grid values in the working dtype.
 
         :param dtype:   desired data type, default is the work_dtype, ignored for color grids
+        :param out:     optional C-contiguous numpy array to receive the data, shape (ny, nx), or (ny, nx, 4)
+                        for color grids. If provided `dtype` is taken from this array.
+        :param window:  (x0, y0, nx, ny) window to read, in grid index units. The default is the whole grid.
 
-        :returns: numpy array shape (nx, ny) or (nx, ny, 4) containing RGBA bytes in case of color grids
+        :returns: numpy array shape (ny, nx) or (ny, nx, 4) containing RGBA bytes in case of color grids.
+                  For float types dummies are `numpy.nan`.
 
         .. versionadded:: 9.3.1
+
+        .. versionchanged:: 9.8 added `out` and `window`, data is read directly into the returned array.
         """
 
-        nx = self.nx
-        ny = self.ny
+        if window is None:
+            x0, y0, nx, ny = 0, 0, self.nx, self.ny
+        else:
+            x0, y0, nx, ny = (int(i) for i in window)
+            if x0 < 0 or y0 < 0 or nx <= 0 or ny <= 0 or (x0 + nx) > self.nx or (y0 + ny) > self.ny:
+                raise GridException(_t('Window {} is outside grid ({}, {})').format(window, self.nx, self.ny))
+
         if self.is_color:
-            data = np.zeros((ny, nx, 4), np.dtype(np.uint8))
+            shape = (ny, nx, 4)
+            dtype = np.dtype(np.uint8)
         else:
-            if dtype is None:
+            shape = (ny, nx)
+            if out is not None:
+                dtype = out.dtype
+            elif dtype is None:
                 dtype = self.dtype
-            data = np.zeros((ny, nx), dtype=dtype)
-        if self.gximg.query_kx() == -1:
-            for i in range(self.nx):
-                column = self.read_column(i).np
-                if self.is_color:
-                    column = _transform_color_int_to_rgba(column)
-                data[:, i] = column
+            dtype = np.dtype(dtype)
+
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape or out.dtype != dtype or not out.flags.c_contiguous:
+            raise GridException(_t('out must be a C-contiguous {} array of shape {}, found {} {}')
+                                .format(dtype, shape, out.dtype, out.shape))
+
+        if self.is_color:
+            colors = np.empty((ny, nx), dtype=self.dtype)
+            self._read_window_into(colors, x0, y0, nx, ny)
+            out[:] = _transform_color_int_to_rgba(colors.reshape(-1)).reshape(shape)
+        else:
+            self._read_window_into(out, x0, y0, nx, ny)
+            if dtype.kind == 'f':
+                out[out == gxu.gx_dummy(dtype)] = np.nan
+
+        return out
+
+    def _read_window_into(self, out, x0, y0, nx, ny):
+        # Fill a (ny, nx) array in place. The grid is read by row (or by column for column-oriented
+        # grids) through a single working VV into a single bytearray, which is copied into each row
+        # (or column) of the destination through a numpy view.
+        vv = gxvv.GXvv(dtype=self.dtype).gxvv
+        gs_type = gxu.gx_dtype(out.dtype)
+        column_oriented = self.gximg.query_kx() == -1
+        n = ny if column_oriented else nx
+        buffer = bytearray(n * np.dtype(out.dtype).itemsize)
+        values = np.frombuffer(buffer, dtype=out.dtype)
+        if column_oriented:
+            for i in range(nx):
+                self._img.read_x(x0 + i, y0, ny, vv)
+                vv.get_data(0, ny, buffer, gs_type)
+                out[:, i] = values
         else:
-            for i in range(self.ny):
-                row = self.read_row(i).np
-                if self.is_color:
-                    row = _transform_color_int_to_rgba(row)
-                data[i, :] = row
+            for i in range(ny):
+                self._img.read_y(y0 + i, x0, nx, vv)
+                vv.get_data(0, nx, buffer, gs_type)
+                out[i] = values
+
+    def _tile_windows(self, tile, overlap):
+        # (core, data) windows (x0, y0, nx, ny) of each tile, bottom to top, left to right
+        tnx, tny = (int(i) for i in tile)
+        overlap = int(overlap)
+        if tnx <= 0 or tny <= 0:
+            raise GridException(_t('Invalid tile size {}').format(tile))
+        if overlap < 0 or overlap >= min(tnx, tny):
+            raise GridException(_t('Overlap {} must be >= 0 and less than the tile size {}').format(overlap, tile))
+
+        gnx = self.nx
+        gny = self.ny
+        for cy0 in range(0, gny, tny):
+            cny = min(tny, gny - cy0)
+            dy0 = max(0, cy0 - overlap)
+            dny = min(gny, cy0 + cny + overlap) - dy0
+            for cx0 in range(0, gnx, tnx):
+                cnx = min(tnx, gnx - cx0)
+                dx0 = max(0, cx0 - overlap)
+                dnx = min(gnx, cx0 + cnx + overlap) - dx0
+                yield (cx0, cy0, cnx, cny), (dx0, dy0, dnx, dny)
+
+    def iter_tiles(self, tile=(512, 512), overlap=0, dtype=None):
+        """
+        Iterate over the grid in tiles such that only one tile of data is in memory at a time.
+
+        :param tile:    (nx, ny) tile size in cells, tiles at the top and right edges may be smaller.
+        :param overlap: number of cells each tile overlaps neighboring tiles, which must be less than
+                        the tile size. Tiles are clipped at the grid edges.
+        :param dtype:   data type, default is the grid dtype. Ignored for color grids.
+
+        :returns:       generator of (ix0, iy0, data, x_coords, y_coords) for each tile, where
+                        (ix0, iy0) is the grid index of data[0, 0], data is a numpy array shape (ny, nx), and
+                        x_coords, y_coords are the locations of the tile columns and rows on the
+                        un-rotated grid plane. Tiles are returned from bottom to top, left to right.
+
+        .. seealso:: `write_tiles()`
+
+        .. versionadded:: 9.8
+        """
 
-        return data
+        dx = self.dx
+        dy = self.dy
+        x0 = self.x0
+        y0 = self.y0
+        for _, window in self._tile_windows(tile, overlap):
+            ix0, iy0, nx, ny = window
+            data = self.np(dtype=dtype, window=window)
+            x_coords = x0 + np.arange(ix0, ix0 + nx, dtype=np.float64) * dx
+            y_coords = y0 + np.arange(iy0, iy0 + ny, dtype=np.float64) * dy
+            yield ix0, iy0, data, x_coords, y_coords
+
+    def write_tiles(self, tiles, tile=(512, 512), overlap=0):
+        """
+        Write tiles to this grid, typically the processed tiles from `iter_tiles()` of a grid with the same
+        dimensions.
+
+        :param tiles:   iterable of (ix0, iy0, data, ...), where (ix0, iy0) is the grid index of data[0, 0].
+                        Additional items in each tuple are ignored.
+        :param tile:    tile size used to create the tiles, only required if there is `overlap`.
+        :param overlap: tile overlap used to create the tiles. Overlapping cells are trimmed and only the
+                        tile core is written.
+
+        .. versionadded:: 9.8
+        """
+
+        if overlap:
+            cores = {window[:2]: core for core, window in self._tile_windows(tile, overlap)}
+
+        for t in tiles:
+            ix0, iy0, data = t[:3]
+            if not isinstance(data, np.ndarray):
+                data = np.array(data)
+            ny, nx = data.shape[:2]
+            if (ix0 < 0) or (iy0 < 0) or ((ix0 + nx) > self.nx) or ((iy0 + ny) > self.ny):
+                raise GridException(_t('Tile ({}, {}) of shape {} is outside the grid.').format(ix0, iy0, data.shape))
+
+            if overlap:
+                core = cores.get((ix0, iy0))
+                if core is None:
+                    raise GridException(_t('Tile at ({}, {}) does not match tile {} with overlap {}')
+                                        .format(ix0, iy0, tile, overlap))
+                cx0, cy0, cnx, cny = core
+                data = data[cy0 - iy0: cy0 - iy0 + cny, cx0 - ix0: cx0 - ix0 + cnx]
+                ix0, iy0 = cx0, cy0
+
+            self.write_rows(data, ix0, iy0)
 
     def xyzv(self):
         """
@@ -1729,33 +2164,16 @@ class Grid(gxgm.Geometry):
 
         nx = self.nx
         ny = self.ny
-        dx = self.dx
-        dy = self.dy
-        cs = self.coordinate_system
-        xyzv = np.zeros((ny, nx, 4))
-        xyzv[:, :, 0:2] = np.mgrid[0: (nx - 0.5) * dx: dx, 0: (ny - 0.5) * dy: dy].swapaxes(0, 2)
+        xyzv = np.empty((ny, nx, 4))
+        iy, ix = np.mgrid[0: ny, 0: nx]
+        xyzv[:, :, 0], xyzv[:, :, 1], xyzv[:, :, 2] = self.xyz_from_index_np(ix, iy)
 
-        if self.rot != 0.:
-            x = xyzv[:, :, 0]
-            cosx = x * self._cos_rot
-            sinx = x * self._sin_rot
-            y = xyzv[:, :, 1]
-            cosy = y * self._cos_rot
-            siny = y * self._sin_rot
-            xyzv[:, :, 0] = cosx + siny
-            xyzv[:, :, 1] = cosy - sinx
-
-        xyzv += (self.x0, self.y0, 0, 0)
-
-        if cs.is_oriented:
-            xyzv[:, :, :3] = cs.xyz_from_oriented(xyzv[:, :, :3].reshape((-1, 3))).reshape((ny, nx, 3))
-
-        if self.gximg.query_kx() == -1:
-            for i in range(self.nx):
-                xyzv[:, i, 3] = self.read_column(i).np
+        if self.is_color:
+            colors = np.empty((ny, nx), dtype=self.dtype)
+            self._read_window_into(colors, 0, 0, nx, ny)
+            xyzv[:, :, 3] = colors
         else:
-            for i in range(self.ny):
-                xyzv[i, :, 3] = self.read_row(i).np
+            xyzv[:, :, 3] = self.np(dtype=np.float64)
 
         return xyzv
 
@@ -1776,29 +2194,10 @@ class Grid(gxgm.Geometry):
             ix, iy = item
 
         if self._buffered_xy != iy:
+            self._buffer_xyz = self.xyz_from_index_np(np.arange(self.nx), iy)
             self._buffered_xy = iy
-            self._buffer_x = np.arange(self.nx, dtype=np.float64)
-            self._buffer_x *= self.dx
-            self._buffer_y = np.zeros(self.nx, dtype=np.float64)
-            self._buffer_y += iy * self.dy
-
-            if self.rot != 0.:
-                rx = self._buffer_x * self._cos_rot + self._buffer_y * self._sin_rot
-                self._buffer_y *= self._buffer_y * self._cos_rot
-                self._buffer_y -= self._buffer_x * self._sin_rot
-                self._buffer_x = rx
-
-            self._buffer_x += self.x0
-            self._buffer_y += self.y0
-
-        ggx = self._buffer_x[ix]
-        ggy = self._buffer_y[ix]
-        ggz = 0.
-
-        if self.coordinate_system.is_oriented:
-            ggx, ggy, ggz = self.coordinate_system.xyz_from_oriented((ggx, ggy, ggz))
 
-        return ggx, ggy, ggz
+        return tuple(float(b[ix]) for b in self._buffer_xyz)
 
     def image_file(self, image_file_name=None, image_type=gxmap.RASTER_FORMAT_PNG, pix_width=None,
                    shade=False, color_map=None, contour=None, display_area=None, pix_32_bit=False):
@@ -17,6 +17,7 @@ angular wavenumber.
 """
 import numpy as np
 import math
+import collections
 
 import geosoft
 import geosoft.gxapi as gxapi
@@ -35,6 +36,7 @@ def _t(s):
 
 FILL_MAXIMUM_ENTROPY = 0
 FILL_MINIMUM_CURVATURE = 1
+FILL_HARMONIC = 2
 
 TRN_SOURCE = 0
 TRN_FILTERED = 1
@@ -45,6 +47,29 @@ I_LOG_POWER = 2
 I_DEPTH_3 = 3
 I_DEPTH_5 = 4
 
+BACKEND_GX = 0
+BACKEND_NUMPY = 1
+
+
+def _filter_chain_key(filters):
+    # normalized filters as a tuple of tuples of strings, ('CNUP', '500'), for use as a cache key
+
+    def param(p):
+        try:
+            p = repr(float(p))
+            return p[:-2] if p.endswith('.0') else p
+        except (TypeError, ValueError):
+            return str(p)
+
+    key = []
+    if filters:
+        for f in filters:
+            if isinstance(f, str):
+                f = f.replace('/', ' ').split()
+            if f:
+                key.append((str(f[0]).upper(),) + tuple(param(p) for p in f[1:]))
+    return tuple(key)
+
 
 class GridFFTException(geosoft.GXRuntimeError):
     """ Exceptions from this module. """
@@ -58,10 +83,11 @@ class GridFFT:
     :param grid:            grid file name or a `geosoft.gxpy.grid.Grid` instance.
     :param expand:          minimum expansion percent to create a periodic function. The default is 10.
     :param trend_order:     trend order to remove, default is 1
-    :param fill_method:     FILL_MAXIMUM_ENTROPY (default) or FILL_MINIMUM_CURVATURE.  Maximum entropy
-                            prediction fills the expanded area in a way that preserves the character of the
-                            radially-averaged power spectrum so that spectral analysis based on the shape
-                            of the spectrum will be more reliable.
+    :param fill_method:     FILL_MAXIMUM_ENTROPY (default), FILL_MINIMUM_CURVATURE or FILL_HARMONIC.  Maximum
+                            entropy prediction fills the expanded area in a way that preserves the character
+                            of the radially-averaged power spectrum so that spectral analysis based on the
+                            shape of the spectrum will be more reliable. FILL_HARMONIC is the fastest, filling
+                            with a multigrid harmonic surface, see `geosoft.gxpy.grid_utility.flood`.
     
     The following parameters only apply for maximum-entropy prediction. The defaults will be fine in all but
     exceptional situations where edge effects unduly distort the result.
@@ -79,8 +105,17 @@ class GridFFT:
                                 the data will be periodic at the edges. Feathering may be useful should the
                                 prediction function introduce unreasonable edge effects.
 
+    :param backend:         `BACKEND_GX` (default) to transform and filter with `geosoft.gxapi.GXFFT2`, or
+                            `BACKEND_NUMPY` to hold the transforms in memory as complex numpy arrays. The numpy
+                            backend supports the CNUP, DRVZ, DRVX, DRVY, RTP and BPAS filters, and filtering
+                            makes no temporary transform grids. Continuation filters preserve the removed trend,
+                            which is added back to the result, while other filters drop the trend.
+
+    :param filter_cache_size:   number of filtered transforms to keep in the filter cache, default 4.
 
     .. versionadded:: 9.4
+
+    .. versionchanged:: 9.8 added `backend`, `filter_cache_size` and FILL_HARMONIC
     """
 
     def __enter__(self):
@@ -97,9 +132,16 @@ class GridFFT:
         if hasattr(self, '_open'):
             if self._open:
 
-                self._source_transform.close(discard=True)
+                cache = self._filter_cache
+                self._filter_cache = collections.OrderedDict()
+                for transform in cache.values():
+                    if isinstance(transform, gxgrd.Grid) and transform is not self._filtered_transform:
+                        transform.close(discard=True)
+                if self._source_transform:
+                    self._source_transform.close(discard=True)
                 if self._filtered_transform:
                     self._filtered_transform.close(discard=True)
+                self._np_transform = {}
                 self._prep_grid.close(discard=True)
 
                 self._source_grid = None
@@ -127,7 +169,9 @@ class GridFFT:
                  edge_limit=-1.,
                  edge_limit_cells=0,
                  smooth=1,
-                 feather=False):
+                 feather=False,
+                 backend=BACKEND_GX,
+                 filter_cache_size=4):
 
         def max_entropy_fill(btol, melen, feath):
 
@@ -250,24 +294,42 @@ class GridFFT:
             props['x0'], props['y0'] = grid.xy_from_index(-xx, -xy)
             exp_grid = gxgrd.Grid.from_data_array(ppg, properties=props)
 
-            gxc.log(_t('Minimum-curvature surface fill...'))
-            self._prep_grid = gxgrdu.feather(gxgrdu.flood(exp_grid), min(xx, xy))
+            if fill_method == FILL_HARMONIC:
+                gxc.log(_t('Harmonic surface fill...'))
+                flood_method = gxgrdu.FLOOD_HARMONIC
+            else:
+                gxc.log(_t('Minimum-curvature surface fill...'))
+                flood_method = gxgrdu.FLOOD_MINIMUM_CURVATURE
+            self._prep_grid = gxgrdu.feather(gxgrdu.flood(exp_grid, method=flood_method), min(xx, xy))
 
         self._prep_grid.gximg.set_tr(self._trend)
 
         # fft
-        gxc.log(_t('FFT...'))
-        fpg = self._prep_grid.gxpg(True)
-        fpg.re_allocate(self._prep_grid.ny, self._prep_grid.nx + 2)
-        gxapi.GXFFT2.trans_pg(fpg, gxapi.FFT2_PG_FORWARD)
-        trn_file = gx.gx().temp_file('.trn(GRD)')
-        self._source_transform = gxgrd.Grid.from_data_array(fpg, file_name=trn_file,
-                                                            properties=self._prep_grid.properties())
-        self._source_transform.gximg.set_tr(self._trend)
-
+        self._backend = backend
+        self._tr_nx = self._prep_grid.nx + 2
+        self._tr_ny = self._prep_grid.ny
+        self._source_transform = None
         self._filtered_transform = None
+        self._np_transform = {TRN_SOURCE: None, TRN_FILTERED: None}
+        self._np_trend = {TRN_SOURCE: True, TRN_FILTERED: False}
+        self._filter_cache = collections.OrderedDict()
+        self._filter_cache_size = max(1, int(filter_cache_size))
+        self._filter_chain = None
+        if backend == BACKEND_NUMPY:
+            gxc.log(_t('FFT (numpy)...'))
+            self._np_transform[TRN_SOURCE] = np.fft.rfft2(self._prep_grid.np(dtype=np.float64))
+        else:
+            gxc.log(_t('FFT...'))
+            fpg = self._prep_grid.gxpg(True)
+            fpg.re_allocate(self._prep_grid.ny, self._prep_grid.nx + 2)
+            gxapi.GXFFT2.trans_pg(fpg, gxapi.FFT2_PG_FORWARD)
+            trn_file = gx.gx().temp_file('.trn(GRD)')
+            self._source_transform = gxgrd.Grid.from_data_array(fpg, file_name=trn_file,
+                                                                properties=self._prep_grid.properties())
+            self._source_transform.gximg.set_tr(self._trend)
+
         self._next = 0
-        self._ny2 = self._source_transform.ny // 2
+        self._ny2 = self._tr_ny // 2
         self._u = None
         self._u2 = None
         self._source_spectrum = None
@@ -340,13 +402,21 @@ class GridFFT:
         .. versionadded:: 9.4
         """
 
-        if trn == TRN_SOURCE:
-            tr = self.source_transform
+        if self._backend == BACKEND_NUMPY:
+            if trn == TRN_SOURCE:
+                data = self._np_transform[TRN_SOURCE][self.tr_row_from_uv(row)]
+            else:
+                data = self._np_filtered()[self.tr_row_from_uv(row)]
+            r = data.real.copy()
+            i = data.imag.copy()
         else:
-            tr = self.filtered_transform
-        data = tr.read_row(self.tr_row_from_uv(row)).np
-        r = data[0::2]
-        i = data[1::2]
+            if trn == TRN_SOURCE:
+                tr = self.source_transform
+            else:
+                tr = self.filtered_transform
+            data = tr.read_row(self.tr_row_from_uv(row)).np
+            r = data[0::2]
+            i = data[1::2]
         if self._u is None:
             self._u = np.arange(len(r)) * self.dv
             self._u2 = self._u**2
@@ -367,6 +437,22 @@ class GridFFT:
         .. versionadded:: 9.4
         """
 
+        if trn == TRN_SOURCE:
+            if self._filter_cache:
+                self.clear_filter_cache()
+            self._filter_chain = None
+        else:
+            self._detach_filtered()
+
+        if self._backend == BACKEND_NUMPY:
+            if trn == TRN_SOURCE:
+                self._np_transform[TRN_SOURCE][self.tr_row_from_uv(row)] = r + 1j * np.asarray(i)
+                self._np_transform_changed(TRN_SOURCE)
+            else:
+                self._np_filtered()[self.tr_row_from_uv(row)] = r + 1j * np.asarray(i)
+                self._np_transform_changed(TRN_FILTERED)
+            return
+
         if trn == TRN_SOURCE:
             tr = self.source_transform
         else:
@@ -384,12 +470,12 @@ class GridFFT:
     @property
     def du(self):
         """ Wavenumber increment in the grid X direction in (cycles / grid distance uom)"""
-        return 1.0 / (self._source_transform.dx * (self._source_transform.nx - 2))
+        return 1.0 / (self._prep_grid.dx * (self._tr_nx - 2))
 
     @property
     def dv(self):
         """ Wavenumber increment in the grid Y direction in (cycles / grid distance uom)."""
-        return 1.0 / (self._source_transform.dy * self._source_transform.ny)
+        return 1.0 / (self._prep_grid.dy * self._tr_ny)
 
     @property
     def nu(self):
@@ -398,14 +484,14 @@ class GridFFT:
 
         The transform is folded in the x direction, will be half the transform width + 1
         """
-        return self._source_transform.nx // 2
+        return self._tr_nx // 2
 
     @property
     def nv(self):
         """
         Number of discrete wavenumbers in the grid Y direction.
         """
-        return self._source_transform.ny
+        return self._tr_ny
 
     @property
     def u0(self):
@@ -459,13 +545,104 @@ class GridFFT:
                 # create an output grid of the upward-continued result
                 fft.result_grid(file_name='upward_continued_500.grd')
 
+        Filtered transforms are cached by the chain of filters that created them, so repeating a filter, or
+        extending a previous chain with `TRN_FILTERED`, reuses earlier work. Filters applied to the
+        filtered transform are composed with the filters that made it and applied to the source transform
+        in a single pass, starting from the longest part of the chain that is still cached.
+
         .. versionadded:: 9.4
+
+        .. versionchanged:: 9.8 filter chains are composed and filtered transforms are cached.
         """
 
-        if (trn == TRN_SOURCE) or (self._filtered_transform is None):
-            transform = self._source_transform
+        if isinstance(filters, str):
+            filters = [filters]
+        segment = (_filter_chain_key(filters),
+                   tuple(str(p) for p in (height, mag_inclination, mag_declination, mag_strength)))
+
+        if self._backend == BACKEND_NUMPY:
+            has_filtered = self._np_transform[TRN_FILTERED] is not None
         else:
-            transform = self._filtered_transform
+            has_filtered = self._filtered_transform is not None
+
+        if (trn == TRN_SOURCE) or not has_filtered:
+            chain = (segment,)
+        elif self._filter_chain is None:
+
+            # the filtered transform was changed directly, so it cannot be recreated from the source
+            if self._backend == BACKEND_NUMPY:
+                transform = (self._np_transform[TRN_FILTERED], self._np_trend[TRN_FILTERED])
+            else:
+                transform = self._filtered_transform
+            self._use_filtered(self._apply_filters(transform, (segment,)), None)
+            return
+
+        else:
+            chain = self._filter_chain + (segment,)
+
+        transform = self._filter_cache.get(chain)
+        if transform is None:
+
+            # start from the longest cached part of the chain
+            start = 0
+            base = None
+            for n in range(len(chain) - 1, 0, -1):
+                base = self._filter_cache.get(chain[:n])
+                if base is not None:
+                    self._filter_cache.move_to_end(chain[:n])
+                    start = n
+                    break
+            transform = self._apply_filters(base, chain[start:])
+            self._filter_cache[chain] = transform
+            while len(self._filter_cache) > self._filter_cache_size:
+                self._close_transform(self._filter_cache.popitem(last=False)[1], transform)
+        else:
+            self._filter_cache.move_to_end(chain)
+
+        self._use_filtered(transform, chain)
+
+    def _apply_filters(self, base, segments):
+        """
+        Apply filter chain segments to a transform.
+
+        :param base:        transform, `None` for the source transform. For the numpy backend this is a tuple
+                            (transform_array, keep_trend) and for the GX backend a transform grid.
+        :param segments:    sequence of (filters, header_parameters)
+        :returns:           new transform of the same form as `base`
+        """
+
+        if self._backend == BACKEND_NUMPY:
+
+            # all segments are combined into a single response
+            if base is None:
+                base = (self._np_transform[TRN_SOURCE], self._np_trend[TRN_SOURCE])
+            transform, keep_trend = base
+            response = None
+            for filters, header in segments:
+                r, keep = self._np_response(filters, header[1], header[2])
+                response = r if response is None else response * r
+                keep_trend = keep_trend and keep
+            return transform * response, keep_trend
+
+        # consecutive segments with the same header parameters make a single filter pass
+        passes = []
+        for filters, header in segments:
+            if passes and passes[-1][1] == header:
+                passes[-1] = (passes[-1][0] + filters, header)
+            else:
+                passes.append((filters, header))
+
+        transform = self._source_transform if base is None else base
+        for filters, header in passes:
+            filtered = self._gx_filter(transform, filters, header)
+            if transform is not base and transform is not self._source_transform:
+                transform.close(discard=True)
+            transform = filtered
+        return transform
+
+    def _gx_filter(self, transform, filters, header):
+        # filter a transform grid with GXFFT2, returns a new transform grid
+
         tpg = transform.gxpg(True)
         transform.gximg.get_tr(self._trend)
 
@@ -473,25 +650,14 @@ class GridFFT:
         con_file = gx.gx().temp_file('con')
         with open(con_file, 'x') as cf:
 
-            # control-file header parameters:
+            # control-file header parameters: height, inclination, declination, strength
             cf.write('\n')      # title not used
-            cf.write('{} /\n'.format(height))
-            cf.write('{} /\n'.format(mag_inclination))
-            cf.write('{} /\n'.format(mag_declination))
-            cf.write('{} /\n'.format(mag_strength))
-
-            if isinstance(filters, str):
-                filters = [filters]
+            for p in header:
+                cf.write('{} /\n'.format(p))
 
             # filters
-            if filters:
-                for f in filters:
-                    if isinstance(f, str):
-                        cf.write('{} /\n'.format(f))
-                    else:
-                        for p in f:
-                            cf.write('{} '.format(p))
-                        cf.write('/\n')
+            for f in filters:
+                cf.write('{} /\n'.format(' '.join(f)))
 
         # filter
         gxapi.GXFFT2.filter_pg(tpg, con_file, self._trend,
@@ -499,11 +665,49 @@ class GridFFT:
         gxu.delete_file(con_file)
 
         file_name = gx.gx().temp_file('.trn(GRD)')
-        self._filtered_transform = gxgrd.Grid.from_data_array(tpg, file_name=file_name,
-                                                              properties=self._source_transform.properties())
-        self._filtered_transform.gximg.set_tr(self._trend)
-        self._filtered_average_spectral_density = None
-        self._filtered_spectrum = None
+        filtered = gxgrd.Grid.from_data_array(tpg, file_name=file_name,
+                                              properties=self._source_transform.properties())
+        filtered.gximg.set_tr(self._trend)
+        return filtered
+
+    def _close_transform(self, transform, keep=None):
+        # close a GX transform grid unless it is still in use
+        if isinstance(transform, gxgrd.Grid):
+            if (transform is not keep) and (transform is not self._filtered_transform) and \
+                    all(transform is not t for t in self._filter_cache.values()):
+                transform.close(discard=True)
+
+    def _use_filtered(self, transform, chain):
+        # make a transform the current filtered transform
+        self._filter_chain = chain
+        if self._backend == BACKEND_NUMPY:
+            self._np_transform[TRN_FILTERED], self._np_trend[TRN_FILTERED] = transform
+            self._np_transform_changed(TRN_FILTERED)
+        else:
+            previous = self._filtered_transform
+            self._filtered_transform = transform
+            self._close_transform(previous, transform)
+            self._filtered_average_spectral_density = None
+            self._filtered_spectrum = None
+
+    def _detach_filtered(self):
+        # the current filtered transform is about to change, so it can no longer be shared with the cache
+        if self._filter_chain is not None:
+            transform = self._filter_cache.pop(self._filter_chain, None)
+            if self._backend == BACKEND_NUMPY and transform is not None:
+                self._np_transform[TRN_FILTERED] = self._np_transform[TRN_FILTERED].copy()
+            self._filter_chain = None
+
+    def clear_filter_cache(self):
+        """
+        Clear the cache of filtered transforms.
+
+        .. versionadded:: 9.8
+        """
+        cache = self._filter_cache
+        self._filter_cache = collections.OrderedDict()
+        for transform in cache.values():
+            self._close_transform(transform)
 
     def radially_averaged_spectrum(self, trn=TRN_SOURCE):
         """
@@ -537,10 +741,14 @@ class GridFFT:
         if trn == TRN_SOURCE:
             if self._source_spectrum is not None:
                 return self._source_spectrum
+            if self._backend == BACKEND_NUMPY:
+                return self._np_radially_averaged_spectrum(trn)
             tr = self.source_transform
         else:
             if self._filtered_spectrum is not None:
                 return self._filtered_spectrum
+            if self._backend == BACKEND_NUMPY:
+                return self._np_radially_averaged_spectrum(trn)
             tr = self.filtered_transform
 
         # spectrum            
@@ -646,6 +854,21 @@ class GridFFT:
         .. versionadded:: 9.4
         """
         
+        if self._backend == BACKEND_NUMPY:
+            if trn == TRN_SOURCE:
+                a = self._np_transform[TRN_SOURCE]
+            else:
+                a = self._np_filtered()
+            props = self._prep_grid.properties()
+            props['x0'] = 0
+            props['y0'] = -self._ny2 * self.dv
+            props['dx'] = self.du
+            props['dy'] = self.dv
+            props['dtype'] = np.float64
+            power = np.clip(a.real ** 2, 1.0e-20, None) + np.clip(a.imag ** 2, 1.0e-20, None)
+            return gxgrd.Grid.from_data_array(np.roll(np.log(power), self._ny2, axis=0),
+                                              file_name=file_name, properties=props, overwrite=overwrite)
+
         if trn == TRN_SOURCE:
             tr = self._source_transform
         else:
@@ -688,15 +911,46 @@ class GridFFT:
     @property
     def source_transform(self):
         """ Folded descrete Fourier transform as a `geosoft.gxpy.grid.Grid` instance."""
+        if self._source_transform is None:
+            self._source_transform = self._np_transform_grid(TRN_SOURCE)
         return self._source_transform
 
     @property
     def filtered_transform(self):
         """ Folded descrete Fourier transform after filters applied."""
         if self._filtered_transform is None:
-            self._filtered_transform = gxgrd.Grid.new(properties=self._source_transform.properties())
+            if self._backend == BACKEND_NUMPY:
+                self._np_filtered()
+                self._filtered_transform = self._np_transform_grid(TRN_FILTERED)
+            else:
+                self._filtered_transform = gxgrd.Grid.new(properties=self._source_transform.properties())
         return self._filtered_transform
 
+    def result_np(self, dtype=np.float64):
+        """
+        Produce a filter result as a numpy array the shape of the source grid.
+
+        :param dtype:   float dtype of the returned array, default is np.float64
+        :return:        numpy array shaped (ny, nx), dummies, including dummies in the source grid, are
+                        `numpy.nan`.
+
+        For the numpy backend the result is calculated in memory, unless the filters preserve the trend,
+        in which case the trend is restored through a temporary grid.
+
+        .. versionadded:: 9.8
+        """
+
+        if self._backend == BACKEND_NUMPY:
+            data, trend = self._np_result_data()
+            if not trend:
+                data = data.astype(dtype)
+                data[np.isnan(self._source_grid.np(dtype=np.float64))] = np.nan
+                return data
+
+        with self.result_grid() as result:
+            result.delete_files()
+            return result.np(dtype=dtype)
+
     def result_grid(self, file_name=None, overwrite=False):
         """
         Produce a filter result grid.
@@ -708,11 +962,16 @@ class GridFFT:
         .. versionadded:: 9.4
         """
 
+        if self._backend == BACKEND_NUMPY:
+            return self._np_result_grid(file_name, overwrite)
+
         if self._filtered_transform is None:
             self._source_transform = gxgrd.reopen(self._source_transform)
             trn = self._source_transform
         else:
             self._filtered_transform = gxgrd.reopen(self._filtered_transform)
+            if self._filter_chain in self._filter_cache:
+                self._filter_cache[self._filter_chain] = self._filtered_transform
             trn = self._filtered_transform
         tpg = trn.gxpg(True)
 
@@ -739,3 +998,197 @@ class GridFFT:
         result.mask(self.source_grid)
 
         return result
+
+    def _np_filtered(self):
+        # filtered numpy transform, created empty if there is not one
+        if self._np_transform[TRN_FILTERED] is None:
+            self._np_transform[TRN_FILTERED] = np.zeros_like(self._np_transform[TRN_SOURCE])
+            self._np_trend[TRN_FILTERED] = False
+        return self._np_transform[TRN_FILTERED]
+
+    def _np_transform_changed(self, trn):
+        if trn == TRN_SOURCE:
+            if self._source_transform:
+                self._source_transform.close(discard=True)
+                self._source_transform = None
+            self._source_spectrum = None
+            self._source_average_spectral_density = None
+        else:
+            if self._filtered_transform:
+                self._filtered_transform.close(discard=True)
+                self._filtered_transform = None
+            self._filtered_spectrum = None
+            self._filtered_average_spectral_density = None
+
+    def _np_transform_grid(self, trn):
+        # folded transform grid of interleaved (real, imaginary) pairs from a numpy transform
+        a = self._np_transform[trn]
+        data = np.empty((a.shape[0], a.shape[1] * 2), dtype=self._prep_grid.dtype)
+        data[:, 0::2] = a.real
+        data[:, 1::2] = a.imag
+        return gxgrd.Grid.from_data_array(data, file_name=gx.gx().temp_file('.trn(GRD)'),
+                                          properties=self._prep_grid.properties())
+
+    def _np_uv(self):
+        # u (cycles/unit) as a row, v as a column, in transform order
+        u = np.fft.rfftfreq(self._prep_grid.nx, self._prep_grid.dx)
+        v = np.fft.fftfreq(self._prep_grid.ny, self._prep_grid.dy)
+        return u[np.newaxis, :], v[:, np.newaxis]
+
+    def _np_response(self, filters, mag_inclination, mag_declination):
+        """
+        Wavenumber response of a list of filters.
+
+        :returns: (response, keep_trend), where keep_trend is `True` if the filters preserve the trend.
+        """
+
+        def parameters(n, defaults):
+            if len(p) > n:
+                raise GridFFTException(_t('Too many parameters for filter {}').format(f))
+            values = []
+            for i, d in enumerate(defaults):
+                v = p[i] if i < len(p) else ''
+                if v == '' or v is None:
+                    if d == '' or d is None:
+                        raise GridFFTException(_t('Missing parameter for filter {}').format(f))
+                    v = d
+                values.append(float(v))
+            return values
+
+        u, v = self._np_uv()
+        k = np.sqrt(u ** 2 + v ** 2)
+        response = np.ones(k.shape, dtype=np.complex128)
+        keep_trend = True
+        if not filters:
+            return response, keep_trend
+
+        for f in filters:
+            if isinstance(f, str):
+                p = f.replace('/', ' ').split()
+            else:
+                p = list(f)
+            if not p:
+                continue
+            name = str(p.pop(0)).upper()
+
+            if name == 'CNUP':
+                height, = parameters(1, (None,))
+                response *= np.exp(-2. * math.pi * height * k)
+
+            elif name == 'DRVZ':
+                order, = parameters(1, (1.,))
+                response *= (2. * math.pi * k) ** order
+                keep_trend = False
+
+            elif name in ('DRVX', 'DRVY'):
+                order, = parameters(1, (1.,))
+                w = u if name == 'DRVX' else v
+                response *= (2j * math.pi * w) ** order
+                keep_trend = False
+
+            elif name == 'RTP':
+                amp_inc = p[2] if len(p) > 2 else ''
+                p = p[:2]
+                inc, dec = parameters(2, (mag_inclination, mag_declination))
+                amp_inc = inc if amp_inc in ('', None) else float(amp_inc)
+                inc = math.radians(inc)
+                dec = math.radians(dec)
+                amp_inc = math.radians(amp_inc)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    cos_dt = np.where(k > 0., (u * math.sin(dec) + v * math.cos(dec)) / k, 1.)
+                numerator = (math.sin(inc) - 1j * math.cos(inc) * cos_dt) ** 2
+                denominator = ((math.sin(amp_inc) ** 2 + (math.cos(amp_inc) * cos_dt) ** 2) *
+                               (math.sin(inc) ** 2 + (math.cos(inc) * cos_dt) ** 2))
+                response *= numerator / denominator
+                keep_trend = False
+
+            elif name == 'BPAS':
+                low, high, reject = parameters(3, (None, None, 0.))
+                band = (k >= low) & (k <= high)
+                if reject:
+                    band = ~band
+                response *= band
+                keep_trend = False
+
+            else:
+                raise GridFFTException(_t('Filter {} is not supported by the numpy backend').format(name))
+
+        return response, keep_trend
+
+    def _np_radially_averaged_spectrum(self, trn):
+
+        if trn == TRN_SOURCE:
+            a = self._np_transform[TRN_SOURCE]
+        else:
+            a = self._np_filtered()
+
+        u, v = self._np_uv()
+        dk = min(self.du, self.dv)
+        length = max(self._tr_nx, self._tr_ny) // 2
+        ring = np.rint(np.sqrt(u ** 2 + v ** 2) / dk).astype(np.int64).reshape(-1)
+        power = (a.real ** 2 + a.imag ** 2).reshape(-1) / (self._prep_grid.nx * self._prep_grid.ny)
+        keep = ring < length
+        count = np.bincount(ring[keep], minlength=length)
+        total = np.bincount(ring[keep], weights=power[keep], minlength=length)
+
+        rings = np.nonzero(count)[0]
+        spectrum = np.full((len(rings), 5), np.nan)
+        wavenumber = rings * dk
+        spectrum[:, I_WAVENUMBER] = wavenumber * 1000.
+        spectrum[:, I_SAMPLE_COUNT] = count[rings]
+        with np.errstate(divide='ignore'):
+            log_power = np.log(total[rings] / count[rings])
+        spectrum[:, I_LOG_POWER] = log_power
+
+        # depths from the local slope of the log power
+        if len(rings) > 2:
+            spectrum[1:-1, I_DEPTH_3] = -(log_power[2:] - log_power[:-2]) / \
+                                        ((wavenumber[2:] - wavenumber[:-2]) * 4. * math.pi)
+        if len(rings) > 4:
+            spectrum[2:-2, I_DEPTH_5] = -(log_power[4:] - log_power[:-4]) / \
+                                        ((wavenumber[4:] - wavenumber[:-4]) * 4. * math.pi)
+
+        asd = math.log(power.sum() / power.size)
+        if trn == TRN_SOURCE:
+            self._source_spectrum = spectrum
+            self._source_average_spectral_density = asd
+        else:
+            self._filtered_spectrum = spectrum
+            self._filtered_average_spectral_density = asd
+
+        return spectrum
+
+    def _np_result_data(self):
+        # inverse transform reduced to the source grid area, and True if the trend must be restored
+
+        if self._np_transform[TRN_FILTERED] is None:
+            trn = TRN_SOURCE
+        else:
+            trn = TRN_FILTERED
+        data = np.fft.irfft2(self._np_transform[trn], s=(self._prep_grid.ny, self._prep_grid.nx))
+
+        # reduce
+        sg = self._source_grid
+        ix0 = (self._prep_grid.nx - sg.nx) // 2
+        iy0 = (self._prep_grid.ny - sg.ny) // 2
+        return data[iy0: iy0 + sg.ny, ix0: ix0 + sg.nx], self._np_trend[trn]
+
+    def _np_result_grid(self, file_name, overwrite):
+
+        data, trend = self._np_result_data()
+        sg = self._source_grid
+        if trend:
+            with gxgrd.Grid.from_data_array(data, properties=sg.properties()) as rg:
+                rg.delete_files()
+                result_pg = gxapi.GXPG.create(sg.ny, sg.nx, sg.gxtype)
+                gxapi.GXPGU.trend(rg.gxpg(), result_pg, self._trend, 2, 1, sg.x0, sg.y0, sg.dx, sg.dy)
+            result = gxgrd.Grid.from_data_array(result_pg, properties=sg.properties(),
+                                                file_name=file_name, overwrite=overwrite)
+        else:
+            result = gxgrd.Grid.from_data_array(data.astype(sg.dtype), properties=sg.properties(),
+                                                file_name=file_name, overwrite=overwrite)
+
+        # mask against original grid
+        result.mask(self.source_grid)
+
+        return result
@@ -10,8 +10,14 @@ Geosoft grid and image utilities.
     
 """
 import os
+import ast
+import collections
+import concurrent.futures
+import queue
+import threading
 import numpy as np
 import math
+import pandas as pd
 
 import geosoft
 import geosoft.gxapi as gxapi
@@ -26,6 +32,8 @@ from . import geometry as gxgeo
 from . import utility as gxu
 from . import geometry_utility as gxgeou
 from . import grid_fft as gxfft
+from . import system as gxsys
+from . import coordinate_system as gxcs
 
 __version__ = geosoft.__version__
 
@@ -51,6 +59,12 @@ TILT_ANGLE = 5
 RETURN_PPOINT = 0
 RETURN_LIST_OF_PPOINT = 1
 RETURN_GDB = 2
+EXPRESSION_GXIEXP = 0
+EXPRESSION_NUMPY = 1
+CONTOUR_GX = 0
+CONTOUR_NUMPY = 1
+FLOOD_MINIMUM_CURVATURE = 0
+FLOOD_HARMONIC = 1
 
 
 def _t(s):
@@ -127,7 +141,11 @@ def derivative(grid, derivative_type, file_name=None, overwrite=False, dtype=Non
         work with longer wavelengths, but at the expense of speed and edge effects in cases of very powerful
         anomalies along the edge of a grid.
 
+    .. seealso:: `derivatives()` to calculate more than one derivative in a single pass.
+
     .. versionadded 9.4
+
+    .. versionchanged:: 9.8 DERIVATIVE_XY, DERIVATIVE_XYZ and TILT_ANGLE are calculated by `derivatives()`.
     """
 
     def vertical_derivative(g, dt):
@@ -150,39 +168,13 @@ def derivative(grid, derivative_type, file_name=None, overwrite=False, dtype=Non
         dzg.unit_of_measure = g.unit_of_measure + '/' + g.coordinate_system.unit_of_measure
         return gxgrd.reopen(dzg, dtype=dt)
 
-    def tilt_angle(g, fn=None):
-        dx = derivative(g, DERIVATIVE_X)
-        dy = derivative(g, DERIVATIVE_Y)
-        dz = derivative(g, DERIVATIVE_Z, fft=fft)
-
-        result = expression((dx, dy, dz), 'atan2(g3,sqrt(g1**2+g2**2))',
-                            result_file_name=fn,
-                            overwrite=overwrite)
-        result.unit_of_measure = 'radians'
-        return gxgrd.reopen(result)
-
-    def horizontal_gradient(g):
-        dx = derivative(g, DERIVATIVE_X)
-        dy = derivative(g, DERIVATIVE_Y)
-        result = expression((dx, dy), 'sqrt(g1**2+g2**2)',
-                            result_file_name=file_name,
-                            overwrite=overwrite)
-        result.unit_of_measure = g.unit_of_measure + '/' + g.coordinate_system.unit_of_measure
-        return result
-
-    def total_gradient(g):
-        dx = derivative(g, DERIVATIVE_X)
-        dy = derivative(g, DERIVATIVE_Y)
-        dz = derivative(g, DERIVATIVE_Z, fft=fft)
-        result = expression((dx, dy, dz), 'sqrt(g1**2+g2**2+g3**2)',
-                            result_file_name=file_name,
-                            overwrite=overwrite)
-        result.unit_of_measure = g.unit_of_measure + '/' + g.coordinate_system.unit_of_measure
-        return result
-
     if derivative_type == DERIVATIVE_Z:
         return vertical_derivative(grid, dt=dtype)
 
+    if derivative_type in (DERIVATIVE_XY, DERIVATIVE_XYZ, TILT_ANGLE):
+        return derivatives(grid, (derivative_type,), file_names={derivative_type: file_name},
+                           overwrite=overwrite, dtype=dtype, fft=fft)[derivative_type]
+
     # need float32 grids for grid_filt
     if not isinstance(grid, gxgrd.Grid):
         grid = gxgrd.Grid.open(grid, dtype=np.float32, mode=gxgrd.FILE_READ)
@@ -196,30 +188,13 @@ def derivative(grid, derivative_type, file_name=None, overwrite=False, dtype=Non
         grid = grid.copy(grid, gx.gx().temp_file('.grd(GRD)'), dtype=np.float32, overwrite=True)
         grid.delete_files()
 
-    if derivative_type == DERIVATIVE_XY:
-        rgrd = horizontal_gradient(grid)
-        if rgrd.dtype != return_dtype:
-            return gxgrd.reopen(rgrd, dtype=return_dtype)
-        else:
-            return rgrd
+    dxy = _horizontal_derivative(grid, derivative_type, file_name=file_name, overwrite=overwrite)
+    return gxgrd.reopen(dxy, dtype=return_dtype)
 
-    if derivative_type == DERIVATIVE_XYZ:
-        rgrd = total_gradient(grid)
-        if rgrd.dtype != return_dtype:
-            return gxgrd.reopen(rgrd, dtype=return_dtype)
-        else:
-            return rgrd
-
-    if derivative_type == TILT_ANGLE:
-        if file_name is None:
-            file_name = gx.gx().temp_file('.grd(GRD)')
-        rgrd = tilt_angle(grid, fn=file_name)
-        if rgrd.dtype != return_dtype:
-            return gxgrd.reopen(rgrd, dtype=return_dtype)
-        else:
-            return rgrd
 
-    # dxy grid
+def _horizontal_derivative(grid, derivative_type, file_name=None, overwrite=False):
+    # X or Y derivative of a float32 grid by a central difference filter
+
     if file_name is None:
         file_name = gx.gx().temp_file('.grd(GRD)')
     dxy = gxgrd.Grid.new(file_name=file_name, properties=grid.properties(), overwrite=overwrite)
@@ -239,10 +214,114 @@ def derivative(grid, derivative_type, file_name=None, overwrite=False, dtype=Non
                           "",
                           filter_vv.gxvv)
     dxy.unit_of_measure = grid.unit_of_measure + '/' + grid.coordinate_system.unit_of_measure
-    return gxgrd.reopen(dxy, dtype=return_dtype)
+    return dxy
 
 
-def tilt_depth(grid, resolution=None, return_as=RETURN_PPOINT, gdb=None, overwrite=False, fft=True):
+def derivatives(grid, derivative_types, file_names=None, overwrite=False, dtype=None, fft=True):
+    """
+    Calculate any combination of derivatives in a single pass. The X, Y and Z derivatives are each
+    calculated once, and combined in memory to create the requested results.
+
+    :param grid:                `geosoft.gxpy.grid.Grid` instance, or a file name
+    :param derivative_types:    list of derivatives to calculate, see `derivative()`
+    :param file_names:          dictionary of file names keyed by derivative type. Derivatives that are not in
+                                the dictionary are returned as temporary grids.
+    :param overwrite:           True to overwrite existing files
+    :param dtype:               dtype for the returned grids, default is the same as the passed grid.
+    :param fft:                 `False` calculate the Z derivative with a space-domain convolution rather than an
+                                FFT.
+    :return:                    dictionary of `geosoft.gxpy.grid.Grid` instances keyed by derivative type.
+
+    .. note:: The X, Y and Z derivatives are calculated from a float32 copy of the grid in the same way
+        as `derivative()`, and the Z derivative is only calculated if required.  `derivative()` uses this
+        function for DERIVATIVE_XY, DERIVATIVE_XYZ and TILT_ANGLE.
+
+    .. versionadded:: 9.8
+    """
+
+    derivative_types = list(derivative_types)
+    for dt in derivative_types:
+        if dt not in (DERIVATIVE_X, DERIVATIVE_Y, DERIVATIVE_Z, DERIVATIVE_XY, DERIVATIVE_XYZ, TILT_ANGLE):
+            raise GridUtilityException(_t('Unknown derivative type {}').format(dt))
+    if file_names is None:
+        file_names = {}
+
+    close_g = False
+    if not isinstance(grid, gxgrd.Grid):
+        grid = gxgrd.Grid.open(grid, mode=gxgrd.FILE_READ)
+        close_g = True
+
+    try:
+        if dtype is None:
+            dtype = grid.dtype
+        properties = grid.properties()
+        derivative_uom = grid.unit_of_measure + '/' + grid.coordinate_system.unit_of_measure
+
+        # float32 grid for grid_filt
+        if grid.dtype == np.float32:
+            g32 = grid
+        else:
+            g32 = gxgrd.Grid.copy(grid, gx.gx().temp_file('.grd(GRD)'), dtype=np.float32, overwrite=True)
+            g32.delete_files()
+
+        def derivative_np(dg):
+            dg.delete_files()
+            with gxgrd.reopen(dg) as dg:
+                return dg.np(dtype=np.float64)
+
+        try:
+            ddx = ddy = ddz = None
+            if set(derivative_types) - {DERIVATIVE_Z}:
+                ddx = derivative_np(_horizontal_derivative(g32, DERIVATIVE_X))
+                ddy = derivative_np(_horizontal_derivative(g32, DERIVATIVE_Y))
+            if set(derivative_types) & {DERIVATIVE_Z, DERIVATIVE_XYZ, TILT_ANGLE}:
+                if fft:
+                    with gxfft.GridFFT(g32) as gfft:
+                        gfft.filter(filters=['DRVZ 1'])
+                        ddz = gfft.result_np()
+                else:
+                    dzg = gxgrd.Grid.new(properties=g32.properties())
+                    gxapi.GXIMU.grid_vd(g32.gximg, dzg.gximg)
+                    ddz = derivative_np(dzg)
+        finally:
+            if g32 is not grid:
+                g32.close()
+
+        results = {}
+        for dt in derivative_types:
+            if dt in results:
+                continue
+            uom = derivative_uom
+            if dt == DERIVATIVE_X:
+                result = ddx
+            elif dt == DERIVATIVE_Y:
+                result = ddy
+            elif dt == DERIVATIVE_Z:
+                result = ddz
+            elif dt == DERIVATIVE_XY:
+                result = np.sqrt(ddx ** 2 + ddy ** 2)
+            elif dt == DERIVATIVE_XYZ:
+                result = np.sqrt(ddx ** 2 + ddy ** 2 + ddz ** 2)
+            else:
+                result = np.arctan2(ddz, np.sqrt(ddx ** 2 + ddy ** 2))
+                uom = 'radians'
+
+            rgrd = gxgrd.Grid.from_data_array(result.astype(dtype, copy=False),
+                                              file_name=file_names.get(dt),
+                                              properties=dict(properties),
+                                              overwrite=overwrite)
+            rgrd.unit_of_measure = uom
+            results[dt] = gxgrd.reopen(rgrd)
+
+        return results
+
+    finally:
+        if close_g:
+            grid.close()
+
+
+def tilt_depth(grid, resolution=None, return_as=RETURN_PPOINT, gdb=None, overwrite=False, fft=True,
+               engine=None):
     """
     Return estimate of the depth sources of potential filed anomalies.
 
@@ -261,6 +340,9 @@ def tilt_depth(grid, resolution=None, return_as=RETURN_PPOINT, gdb=None, overwri
     :param overwrite:   True to overwrite existing gdb.
     :param fft:         `False` to use a space-domain convolution.  The default uses an FFT, which will
                         in general produce a cleaner and more accurate result, though it may be slower.
+    :param engine:      zero-contour engine, `CONTOUR_GX` or `CONTOUR_NUMPY`, see `contour_points()`. The default
+                        is `CONTOUR_GX` for `RETURN_GDB`, and `CONTOUR_NUMPY` otherwise, in which case no
+                        database is created.
     :return:            depends on `return_as` setting
 
     .. note:: Given a TMI grid, or the vertical derivative of the gravity anomaly, calculate
@@ -269,43 +351,73 @@ def tilt_depth(grid, resolution=None, return_as=RETURN_PPOINT, gdb=None, overwri
         the tilt derivative.
 
     .. versionadded:: 9.4
+
+    .. versionchanged:: 9.8 added `engine`, depths are calculated for all contour points in one operation.
+        Points are returned from the numpy zero-contour unless a database is returned.
     """
 
     if gdb is not None:
         return_as = RETURN_GDB
+    if engine is None:
+        engine = CONTOUR_GX if return_as == RETURN_GDB else CONTOUR_NUMPY
 
     gxc = gx.gx()
     gxc.log('Calculate tilt-angle...')
 
-    ta = derivative(grid, TILT_ANGLE, fft=fft)
+    ta = derivatives(grid, (TILT_ANGLE,), fft=fft)[TILT_ANGLE]
     gxc.log('Find zero contour of the tilt-angle...')
 
     if resolution is None:
         resolution = min(ta.dx, ta.dy) * 4.
-    gdb = contour_points(ta, 0., resolution=resolution, return_as=RETURN_GDB, gdb=gdb, overwrite=overwrite)
+    if engine == CONTOUR_NUMPY:
+        pplist = contour_points(ta, 0., resolution=resolution, return_as=RETURN_LIST_OF_PPOINT,
+                                engine=CONTOUR_NUMPY)
+        cs = ta.coordinate_system
+        lines = None
+        xyz_list = [pp.xyz for pp in pplist]
+    else:
+        cgdb = contour_points(ta, 0., resolution=resolution, return_as=RETURN_GDB,
+                              gdb=gdb if return_as == RETURN_GDB else None, overwrite=overwrite)
+        cs = cgdb.coordinate_system
+        lines = cgdb.list_lines()
+        xyz_list = []
+        fids = []
+        for ln in lines:
+            xyz, _, fid = cgdb.read_line(ln, channels=('X', 'Y', 'Z'))
+            xyz_list.append(xyz)
+            fids.append(fid)
     gxc.log('Calculate tilt-derivative...')
-    tad = derivative(ta, DERIVATIVE_XY, fft=fft)
+    tad = derivatives(ta, (DERIVATIVE_XY,), fft=fft)[DERIVATIVE_XY]
 
-    # get gradient of the TD at the zero locations
+    # get gradient of the TD at the zero locations, sampled for all points at once
     gxc.log('Calculate depth = reciprocal(tilt-derivative) at zero contour of the tilt-angle...')
-    for ln in gdb.list_lines():
-        xyz, chlist, fid = gdb.read_line(ln, channels=('X', 'Y', 'Z'))
-        zero_tad = sample(tad, xyz)
+    if xyz_list:
+        xyz_all = np.concatenate(xyz_list)
+        zero_tad = tad.sample(xyz_all)
         zero_tad[zero_tad == 0.] = np.nan
         np.reciprocal(zero_tad, out=zero_tad)
-        xyz[:, 2] = zero_tad
-        gdb.write_line(ln, xyz, chlist, fid)
+        xyz_all[:, 2] = zero_tad
+        xyz_list = np.split(xyz_all, np.cumsum([len(xyz) for xyz in xyz_list])[:-1])
 
     if return_as == RETURN_GDB:
-        return gdb
-
-    pplist = []
-    for ln in gdb.list_lines():
-        xyz = gdb.read_line(ln, channels=('X', 'Y', 'Z'))[0]
-        pplist.append(gxgeo.PPoint(xyz, coordinate_system=gdb.coordinate_system))
-
-    gdb.close(discard=True)
-
+        if lines is None:
+            if not isinstance(gdb, gxgdb.Geosoft_gdb):
+                gdb = gxgdb.Geosoft_gdb.new(name=gdb, max_lines=max(1000, len(xyz_list)), max_channels=10,
+                                            overwrite=overwrite)
+            with gdb.bulk_writer(('X', 'Y', 'Z')) as writer:
+                for i, xyz in enumerate(xyz_list):
+                    writer.write(gxgdb.create_line_name(i + 1), xyz)
+            gdb.coordinate_system = cs
+            return gdb
+
+        for ln, xyz, fid in zip(lines, xyz_list, fids):
+            cgdb.write_line(ln, xyz, ('X', 'Y', 'Z'), fid)
+        return cgdb
+
+    if lines is not None:
+        cgdb.close(discard=True)
+
+    pplist = [gxgeo.PPoint(xyz, coordinate_system=cs) for xyz in xyz_list]
     if return_as == RETURN_LIST_OF_PPOINT:
         return pplist
 
@@ -342,110 +454,200 @@ def sample(grid, xyz):
     return vvz.np
 
 
-def grid_mosaic(mosaic, grid_list, type_decorate=''):
+def _mosaic_tile(window, frame, sources, feather, mosaic_cs, opened):
+    # blend the sources that overlap one output tile, sources are opened once and kept in opened
+
+    ix0, iy0, nx, ny = window
+    x0, y0, dx, dy = frame
+    x, y = np.meshgrid(x0 + np.arange(ix0, ix0 + nx) * dx, y0 + np.arange(iy0, iy0 + ny) * dy)
+    xy = np.column_stack((x.reshape(-1), y.reshape(-1)))
+    total = np.zeros(nx * ny)
+    weight = np.zeros(nx * ny)
+
+    for source, cell in sources:
+        g = opened.get(source)
+        if g is None:
+            g = gxgrd.Grid.open(source, dtype=np.float64)
+            opened[source] = g
+        if g.coordinate_system != mosaic_cs:
+            sxy = gxcs.Coordinate_translate(mosaic_cs, g.coordinate_system).convert(xy)
+        else:
+            sxy = xy
+        v = g.sample(sxy, workers=1)
+        valid = ~np.isnan(v)
+
+        if feather:
+            # weight by distance from the edge of the source grid, to the feather distance
+            ix, iy = g.index_from_xy_np(sxy[valid, 0], sxy[valid, 1])
+            edge = np.minimum(np.minimum(ix, g.nx - 1 - ix), np.minimum(iy, g.ny - 1 - iy)) * cell
+            w = np.clip(edge / feather, 1.0e-6, 1.0)
+            total[valid] += v[valid] * w
+            weight[valid] += w
+        else:
+            # last valid value wins
+            total[valid] = v[valid]
+            weight[valid] = 1.0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (total / weight).reshape((ny, nx))
+
+
+def _mosaic_worker(jobs, frame, feather, cs_xml):
+    # worker thread with its own GX context, blends tiles from the jobs queue until it gets None
+
+    with gxapi.GXContext.create(__name__, __version__):
+        mosaic_cs = gxcs.Coordinate_system(cs_xml)
+        opened = {}
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+                window, sources, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(_mosaic_tile(window, frame, sources, feather, mosaic_cs, opened))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            for g in opened.values():
+                g.close()
+
+
+def grid_mosaic(mosaic, grid_list, type_decorate='', feather=0., tile=(1024, 1024), memory=None, workers=None):
     """
-    Combine a set of grids into a single grid.  Raises an error if the resulting grid is too large.
+    Combine a set of grids into a single grid.
 
     :param mosaic:          name of the output grid, returned.  Decorate with '(HGD)' to get an HGD
     :param grid_list:       list of input grid names
     :param type_decorate:   decoration for input grids if not default
+    :param feather:         feather distance in output grid cells. Where grids overlap, values are blended
+                            with a weight that increases from the edge of each grid to this distance. The
+                            default is 0, in which case the last grid in the list with a valid value
+                            defines the mosaic.
+    :param tile:            (nx, ny) size of the output tiles that are processed in parallel
+    :param memory:          approximate memory budget in MB for tiles being processed. The default is no limit,
+                            in which case two tiles per worker are in process.
+    :param workers:         number of worker threads, default is the number of cores.
     :returns:               `geosoft.gxpy.grid.Grid` instance
 
     .. note:: If the coordinate systems are different the grids are
-        reprojected to the coordinate system of the first grid.
+        reprojected to the coordinate system of the first grid. The mosaic uses the cell size of the
+        first grid, and other grids are resampled by linear interpolation.
+
+        The mosaic frame is determined from the grid properties only, and output tiles are written as they
+        are completed, so the size of the mosaic is not limited by memory.
 
     .. versionadded:: 9.4
-    """
 
-    def props(gn, repro=None):
-        with gxgrd.Grid.open(gn) as gg:
-            if repro:
-                gg.gximg.create_projected2(repro[0], repro[1])
-            return gg.properties()
-
-    def dimension(glist):
-
-        def dimg(_gd, _rep=None):
-            prp = props(_gd, _rep)
-            _x0 = prp.get('x0')
-            _y0 = prp.get('y0')
-            _xm = _x0 + (prp.get('nx') - 1) * prp.get('dx')
-            _ym = _y0 + (prp.get('ny') - 1) * prp.get('dy')
-            _ipj = prp.get('coordinate_system').gxipj
-            cell = prp.get('dx')
-            return _x0, _y0, _xm, _ym, (_ipj, cell)
-
-        def ndim(_x0, _xm, _dx):
-            return int((_xm - _x0 + _dx / 2.0) / _dx) + 1
-
-        dx0, dy0, dxm, dym, drepro = dimg(glist[0])
-        for gd in glist[1:]:
-            xx0, yy0, xxm, yym, r = dimg(gd, drepro)
-            if xx0 < dx0:
-                dx0 = xx0
-            if yy0 < dy0:
-                dy0 = yy0
-            if xxm > dxm:
-                dxm = xxm
-            if yym > dym:
-                dym = yym
-
-        # calculate new grid dimension
-        _p = props(glist[0])
-        nnx = ndim(dx0, dxm, _p.get('dx'))
-        nny = ndim(dy0, dym, _p.get('dy'))
-
-        return dx0, dy0, nnx, nny, dxm, dym
-
-    def locate(_x0, _y0, _p):
-
-        _dx = _p.get('dx')
-        _dy = _p.get('dy')
-        dsx = round((p.get('x0') - _x0) / _dx)
-        dsy = round((p.get('y0') - _y0) / _dy)
-
-        return dsx, dsy
-
-    def paste(gn, _mpg):
-        with gxgrd.Grid.open(gn) as _g:
-            _p = _g.properties()
-            _nx = _p.get('nx')
-            _ny = _p.get('ny')
-            gpg = _g.gxpg()
-            destx, desty = locate(x0, y0, _p)
-            gxc.log('    +{} nx,ny({},{})'.format(_g, _nx, _ny))
-            gxc.log('     Copy ({},{}) -> ({},{}) of ({},{})'.format(_nx, _ny, destx, desty, mnx, mny))
-            _mpg.copy_subset(gpg, desty, destx, 0, 0, _ny, _nx)
-            return
+    .. versionchanged:: 9.8 streaming mosaic with `feather`, `tile`, `memory` and `workers`
+    """
 
     gxc = gx.gx()
     if len(grid_list) == 0:
         raise GridUtilityException(_t('At least one grid is required'))
 
-    # create list of grids, all matching on coordinate system of first grid
-    grids = []
-    for i in range(len(grid_list)):
-        grids.append(gxgrd.decorate_name(grid_list[i], type_decorate))
+    grids = [gxgrd.decorate_name(gn, type_decorate) for gn in grid_list]
+
+    # mosaic frame from the grid properties, each grid is opened once
+    extents = []
+    cells = []
+    for gn in grids:
+        with gxgrd.Grid.open(gn) as g:
+            if not extents:
+                p = g.properties()
+                mosaic_cs = g.coordinate_system
+                dx = abs(g.dx)
+                dy = abs(g.dy)
+
+            # grid edge points, which are reprojected if necessary
+            edge = np.linspace(0., 1., 21)
+            ix = np.concatenate((edge, np.ones(21), edge, np.zeros(21))) * (g.nx - 1)
+            iy = np.concatenate((np.zeros(21), edge, np.ones(21), edge)) * (g.ny - 1)
+            x, y = g.xy_from_index_np(ix, iy)
+            if g.coordinate_system != mosaic_cs:
+                x, y = gxcs.Coordinate_translate(g.coordinate_system, mosaic_cs).convert(np.column_stack((x, y))).T
+            extents.append((x.min(), y.min(), x.max(), y.max()))
+
+            # approximate cell size in mosaic units, for feathering
+            cells.append(math.hypot(x[20] - x[0], y[20] - y[0]) / max(1, g.nx - 1))
+            gxc.log('    +{} nx,ny({},{})'.format(g, g.nx, g.ny))
+
+    extents = np.array(extents)
+    x0, y0 = extents[:, :2].min(axis=0)
+    xm, ym = extents[:, 2:].max(axis=0)
+    nx = int((xm - x0 + dx / 2.0) / dx) + 1
+    ny = int((ym - y0 + dy / 2.0) / dy) + 1
 
     # output grid
-    x0, y0, nx, ny, xm, ym = dimension(grids)
-    p = props(grids[0])
     p['x0'] = x0
     p['y0'] = y0
     p['nx'] = nx
     p['ny'] = ny
+    p['dx'] = dx
+    p['dy'] = dy
+    p['rot'] = 0.
     gxc.log('')
-    gxc.log('Mosaic: dim({},{}) x({},{}) y({},{}), cell({})...'.format(nx, ny, x0, xm, y0, ym, p.get('dx')))
+    gxc.log('Mosaic: dim({},{}) x({},{}) y({},{}), cell({})...'.format(nx, ny, x0, xm, y0, ym, dx))
     master = gxgrd.Grid.new(mosaic, p)
-    gxc.log('Memory image ready ({}) dim({},{}) x0,y0({},{})'.
-            format(master, master.nx, master.ny, master.x0, master.y0))
-
-    # paste grids onto master
-    mnx = master.nx
-    mny = master.ny
-    mpg = master.gxpg()
-    for g in grids:
-        paste(g, mpg)
+    dtype = np.dtype(master.dtype)
+
+    # limit tile size and the number of tiles in process to the memory budget
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, int(workers))
+    tile = (int(tile[0]), int(tile[1]))
+    max_pending = 2 * workers
+    if memory:
+        tile_bytes = lambda t: t[0] * t[1] * 8 * 12
+        budget = memory * 1024 * 1024
+        while tile_bytes(tile) > budget and min(tile) > 64:
+            tile = (max(64, tile[0] // 2), max(64, tile[1] // 2))
+        max_pending = max(1, min(max_pending, int(budget // tile_bytes(tile))))
+        workers = min(workers, max_pending)
+
+    cs_xml = mosaic_cs.xml
+    frame = (x0, y0, dx, dy)
+
+    def tiles():
+        # each worker opens a source grid the first time it needs it, and keeps it open for its other tiles
+        jobs = queue.Queue()
+        threads = [threading.Thread(target=_mosaic_worker, args=(jobs, frame, feather * dx, cs_xml))
+                   for _ in range(workers)]
+        for t in threads:
+            t.start()
+        pending = collections.deque()
+        try:
+            for _, window in master._tile_windows(tile, 0):
+                wx0, wy0, wnx, wny = window
+                tx0 = x0 + (wx0 - 1) * dx
+                ty0 = y0 + (wy0 - 1) * dy
+                tx1 = x0 + (wx0 + wnx) * dx
+                ty1 = y0 + (wy0 + wny) * dy
+                sources = [(grids[i], cells[i]) for i, e in enumerate(extents)
+                           if e[0] <= tx1 and e[2] >= tx0 and e[1] <= ty1 and e[3] >= ty0]
+                future = concurrent.futures.Future()
+                jobs.put((window, sources, future))
+                pending.append((wx0, wy0, future))
+                while len(pending) > max_pending:
+                    ix, iy, f = pending.popleft()
+                    yield ix, iy, f.result()
+            while pending:
+                ix, iy, f = pending.popleft()
+                yield ix, iy, f.result()
+        finally:
+            for _, _, f in pending:
+                f.cancel()
+            for _ in threads:
+                jobs.put(None)
+            for t in threads:
+                t.join()
+
+    for ix, iy, data in tiles():
+        if dtype.kind != 'f':
+            data = np.where(np.isnan(data), gxu.gx_dummy(dtype), data).astype(dtype)
+        master.write_rows(data, ix, iy)
 
     gxc.log('Mosaic completed: {}'.format(mosaic))
 
@@ -513,8 +715,192 @@ def grid_bool(g1, g2, joined_grid=None, opt=1, size=3, olap=1):
     return gxgrd.Grid.open(joined_grid)
 
 
+# marching squares cell edges: 0 bottom, 1 right, 2 top, 3 left. Cases 16 and 17 are the saddle
+# cases 5 and 10 when the cell centre is above the contour level.
+_contour_cases = np.full((18, 2, 2), -1, dtype=np.int8)
+for _case, _segments in ((1, ((3, 0),)), (2, ((0, 1),)), (3, ((3, 1),)), (4, ((1, 2),)),
+                         (5, ((3, 0), (1, 2))), (6, ((0, 2),)), (7, ((3, 2),)), (8, ((2, 3),)),
+                         (9, ((0, 2),)), (10, ((0, 1), (2, 3))), (11, ((1, 2),)), (12, ((3, 1),)),
+                         (13, ((0, 1),)), (14, ((3, 0),)), (16, ((0, 1), (2, 3))), (17, ((3, 0), (1, 2)))):
+    for _i, _segment in enumerate(_segments):
+        _contour_cases[_case, _i] = _segment
+
+
+def _contour_tile_segments(data, ix0, iy0, cells, gnx, level):
+    # marching squares segments through the cells of a tile of data that starts at grid index (ix0, iy0).
+    # Segment ends are identified by the grid edge they cross, so segments from different tiles join.
+    ci0, cj0, ci1, cj1 = cells
+    v00 = data[cj0: cj1, ci0: ci1]
+    v10 = data[cj0: cj1, ci0 + 1: ci1 + 1]
+    v01 = data[cj0 + 1: cj1 + 1, ci0: ci1]
+    v11 = data[cj0 + 1: cj1 + 1, ci0 + 1: ci1 + 1]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        case = ((v00 >= level) * 1 + (v10 >= level) * 2 + (v11 >= level) * 4 + (v01 >= level) * 8)
+        valid = ~(np.isnan(v00) | np.isnan(v10) | np.isnan(v01) | np.isnan(v11))
+        jj, ii = np.nonzero(valid & (case > 0) & (case < 15))
+        if not len(jj):
+            return None
+        case = case[jj, ii]
+        v00 = v00[jj, ii]
+        v10 = v10[jj, ii]
+        v01 = v01[jj, ii]
+        v11 = v11[jj, ii]
+
+        # resolve saddles by the cell centre
+        high = (v00 + v10 + v01 + v11) * 0.25 >= level
+        case = np.where((case == 5) & high, 16, case)
+        case = np.where((case == 10) & high, 17, case)
+
+        gi = (ii + ci0 + ix0).astype(np.int64)
+        gj = (jj + cj0 + iy0).astype(np.int64)
+        ids = np.array((2 * (gj * gnx + gi),
+                        2 * (gj * gnx + gi + 1) + 1,
+                        2 * ((gj + 1) * gnx + gi),
+                        2 * (gj * gnx + gi) + 1))
+        x = np.array((gi + (level - v00) / (v10 - v00),
+                      gi + 1.,
+                      gi + (level - v01) / (v11 - v01),
+                      gi))
+        y = np.array((gj,
+                      gj + (level - v10) / (v11 - v10),
+                      gj + 1.,
+                      gj + (level - v00) / (v01 - v00)))
+
+    a = []
+    b = []
+    for slot in range(2):
+        edges = _contour_cases[case, slot]
+        cell = np.nonzero(edges[:, 0] >= 0)[0]
+        a.append((edges[cell, 0], cell))
+        b.append((edges[cell, 1], cell))
+
+    def ends(e):
+        edge = np.concatenate([ee for ee, _ in e])
+        cell = np.concatenate([cc for _, cc in e])
+        return ids[edge, cell], x[edge, cell], y[edge, cell]
+
+    return ends(a), ends(b)
+
+
+def _contour_stitch(segments):
+    # join segments into lines, returns a list of (ix, iy) arrays of fractional grid indexes
+    segments = [sg for sg in segments if sg is not None]
+    if not segments:
+        return []
+    ida = np.concatenate([sg[0][0] for sg in segments])
+    idb = np.concatenate([sg[1][0] for sg in segments])
+    xs = np.concatenate([sg[0][1] for sg in segments] + [sg[1][1] for sg in segments])
+    ys = np.concatenate([sg[0][2] for sg in segments] + [sg[1][2] for sg in segments])
+    uid, first, inverse = np.unique(np.concatenate((ida, idb)), return_index=True, return_inverse=True)
+    xs = xs[first]
+    ys = ys[first]
+    nseg = len(ida)
+    ua = inverse[:nseg]
+    ub = inverse[nseg:]
+
+    # each end joins at most two segments
+    npt = len(uid)
+    src = np.concatenate((ua, ub))
+    dst = np.concatenate((ub, ua))
+    order = np.argsort(src, kind='stable')
+    src = src[order]
+    dst = dst[order]
+    degree = np.bincount(src, minlength=npt)
+    slot = np.arange(len(src)) - np.repeat(np.cumsum(degree) - degree, degree)
+    neighbours = np.full((npt, 2), -1, dtype=np.int64)
+    keep = slot < 2
+    neighbours[src[keep], slot[keep]] = dst[keep]
+
+    neighbours = neighbours.tolist()
+    visited = [False] * npt
+    lines = []
+    for start in np.concatenate((np.nonzero(degree == 1)[0], np.nonzero(degree != 1)[0])).tolist():
+        if visited[start]:
+            continue
+        visited[start] = True
+        path = [start]
+        current = start
+        while True:
+            n0, n1 = neighbours[current]
+            if n0 >= 0 and not visited[n0]:
+                current = n0
+            elif n1 >= 0 and not visited[n1]:
+                current = n1
+            else:
+                break
+            visited[current] = True
+            path.append(current)
+        if len(path) > 2 and start in neighbours[current]:
+            path.append(start)
+        if len(path) > 1:
+            lines.append((xs[path], ys[path]))
+
+    return lines
+
+
+def _contour_points_np(grid, levels, max_segments, resolution, tile, workers):
+    # numpy marching squares contours, returns a list of (N, 3) xyz arrays and the coordinate system
+
+    close_grid = False
+    if not isinstance(grid, gxgrd.Grid):
+        grid = gxgrd.Grid.open(grid)
+        close_grid = True
+
+    try:
+        cs = grid.coordinate_system
+        if resolution is None:
+            resolution = min(grid.dx, grid.dy)
+        gnx = grid.nx
+        gny = grid.ny
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        segments = [[] for _ in levels]
+        with concurrent.futures.ThreadPoolExecutor(max(1, workers)) as pool:
+
+            # segments through cells with the lower-left corner in each tile core
+            for core, window in grid._tile_windows(tile, 1):
+                cx0, cy0, cnx, cny = core
+                ix0, iy0, nx, ny = window
+                cells = (cx0 - ix0, cy0 - iy0,
+                         min(cx0 + cnx, gnx - 1) - ix0, min(cy0 + cny, gny - 1) - iy0)
+                if cells[2] <= cells[0] or cells[3] <= cells[1]:
+                    continue
+                data = grid.np(dtype=np.float64, window=window)
+                futures = [pool.submit(_contour_tile_segments, data, ix0, iy0, cells, gnx, level)
+                           for level in levels]
+                for i, f in enumerate(futures):
+                    segments[i].append(f.result())
+
+            lines = [ln for level_lines in pool.map(_contour_stitch, segments) for ln in level_lines]
+
+        if not lines:
+            raise GridUtilityException(_t('The grid data does not intersect value {}').format(levels))
+        if len(lines) > max_segments:
+            raise GridUtilityException(_t('Number of contour segments {} exceeds max_segments {}')
+                                       .format(len(lines), max_segments))
+
+        xyz_list = []
+        for ix, iy in lines:
+            x, y = grid.xy_from_index_np(ix, iy)
+            xyz = np.column_stack((x, y, np.zeros(len(x))))
+            if resolution > 0. and len(xyz) > 1:
+                xyz = gxgeou.resample(xyz, resolution)
+            if cs.is_oriented:
+                xyz = cs.xyz_from_oriented(xyz)
+            xyz_list.append(xyz)
+
+        return xyz_list, cs
+
+    finally:
+        if close_grid:
+            grid.close()
+
+
 def contour_points(grid, value, max_segments=1000, resolution=None,
-                   return_as=RETURN_LIST_OF_PPOINT, gdb=None, overwrite=False):
+                   return_as=RETURN_LIST_OF_PPOINT, gdb=None, overwrite=False,
+                   engine=CONTOUR_GX, tile=(1024, 1024), workers=None):
     """
     Return a set of point segments that represent the spatial locations of contours threaded through the grid.
 
@@ -535,14 +921,47 @@ def contour_points(grid, value, max_segments=1000, resolution=None,
     :param gdb:         return database name, or a `geosoft.gxpy.gdv.Geosoft_database` instance. If not
                         specified and `return_as=RETURN_GDB`, a temporary database is created.
     :param overwrite:   `True` to overwrite gdb if it exists.
+    :param engine:      `CONTOUR_GX` (default) to contour with a Geosoft contour group, or `CONTOUR_NUMPY`
+                        to trace contours through the grid data with marching squares.
+    :param tile:        tile size for `CONTOUR_NUMPY`
+    :param workers:     number of threads used to trace contour levels for `CONTOUR_NUMPY`, default is the
+                        number of cores.
     :return:            depends on `return_as` setting
 
     .. note::   Contours through 3D oriented grids will be oriented in 3D. Grids that are not 3D oriented
         will have a z value 0.0.
 
+        With `CONTOUR_NUMPY` the grid is read in tiles and no map, shape file or database is created
+        unless `return_as=RETURN_GDB`. `value` may also be a list of contour values, in which case
+        segments for all values are returned in the order of the values.
+
     .. versionadded:: 9.4
+
+    .. versionchanged:: 9.8 added `engine`, `tile` and `workers`
     """
 
+    if engine == CONTOUR_NUMPY:
+        levels = [float(v) for v in np.atleast_1d(value)]
+        xyz_list, cs = _contour_points_np(grid, levels, max_segments, resolution, tile, workers)
+
+        if gdb is not None:
+            return_as = RETURN_GDB
+
+        if return_as == RETURN_GDB:
+            if not isinstance(gdb, gxgdb.Geosoft_gdb):
+                gdb = gxgdb.Geosoft_gdb.new(name=gdb, max_lines=max_segments, max_channels=10,
+                                            overwrite=overwrite)
+            with gdb.bulk_writer(('X', 'Y', 'Z')) as writer:
+                for i, xyz in enumerate(xyz_list):
+                    writer.write(gxgdb.create_line_name(i + 1), xyz)
+            gdb.coordinate_system = cs
+            return gdb
+
+        pplist = [gxgeo.PPoint(xyz, coordinate_system=cs) for xyz in xyz_list]
+        if return_as == RETURN_PPOINT:
+            return gxgeo.PPoint.merge(pplist)
+        return pplist
+
     if isinstance(grid, gxgrd.Grid):
         extent = grid.extent
         with grid.copy(grid) as g:
@@ -651,7 +1070,323 @@ def calculate_slope_standard_deviation(grid):
             grid.close()
 
 
-def flood(grid, file_name=None, overwrite=False, tolerance=None, max_iterations=250, pass_tol=99.):
+class Statistics_accumulator:
+    """
+    Mergeable streaming statistics accumulator. Data is added in blocks of any shape, for example the
+    tiles from `geosoft.gxpy.grid.Grid.iter_tiles()`, and accumulators of different blocks or threads can be
+    merged. The moments are accumulated as central moments, which are numerically stable for data
+    with a large offset.
+
+    .. versionadded:: 9.8
+    """
+
+    def __init__(self):
+        self.num_data = 0
+        self.num_dummy = 0
+        self.min = None
+        self.max = None
+        self.sums = np.zeros(4)
+        self._mean = 0.
+        self._m2 = 0.
+        self._m3 = 0.
+        self._m4 = 0.
+        self._sum_log = 0.
+        self._num_non_positive = 0
+        self._hist = None
+        self._hist_edges = None
+
+    def add(self, data):
+        """
+        Add data to the accumulator.
+
+        :param data:    numpy array of any shape, dummies are `numpy.nan`.
+        """
+
+        data = np.asarray(data, dtype=np.float64).reshape(-1)
+        valid = data[~np.isnan(data)]
+        self.num_dummy += data.size - valid.size
+        n = valid.size
+        if n == 0:
+            return
+
+        mean = valid.mean()
+        c = valid - mean
+        c2 = c * c
+        block = Statistics_accumulator()
+        block.num_data = n
+        block.min = valid.min()
+        block.max = valid.max()
+        block.sums = np.array([valid.sum(), (valid * valid).sum(), (valid ** 3).sum(), (valid ** 4).sum()])
+        block._mean = mean
+        block._m2 = c2.sum()
+        block._m3 = (c2 * c).sum()
+        block._m4 = (c2 * c2).sum()
+        positive = valid[valid > 0.]
+        block._num_non_positive = n - positive.size
+        block._sum_log = np.log(positive).sum()
+        self._merge_moments(block)
+
+    def add_histogram(self, data, bins, value_range):
+        """
+        Add data to the histogram.
+
+        :param data:        numpy array of any shape, dummies are `numpy.nan`.
+        :param bins:        number of histogram bins
+        :param value_range: (min, max) histogram range, values outside the range are counted in the end bins.
+                            The bins and range must be the same for all data added to the histogram.
+        """
+
+        if self._hist is None:
+            self._hist = np.zeros(bins, dtype=np.int64)
+            self._hist_edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        elif len(self._hist) != bins or self._hist_edges[0] != value_range[0] or self._hist_edges[-1] != value_range[1]:
+            raise GridUtilityException(_t('Histogram bins and range cannot change.'))
+
+        data = np.asarray(data, dtype=np.float64).reshape(-1)
+        data = data[~np.isnan(data)]
+        if data.size:
+            width = value_range[1] - value_range[0]
+            if width > 0.:
+                ibin = ((data - value_range[0]) * (bins / width)).astype(np.int64)
+                np.clip(ibin, 0, bins - 1, out=ibin)
+                self._hist += np.bincount(ibin, minlength=bins)
+            else:
+                self._hist[0] += data.size
+
+    def _merge_moments(self, other):
+        if other.num_data == 0:
+            self.num_dummy += other.num_dummy
+            return
+        if self.num_data == 0:
+            self.num_data = other.num_data
+            self.min = other.min
+            self.max = other.max
+            self._mean = other._mean
+            self._m2 = other._m2
+            self._m3 = other._m3
+            self._m4 = other._m4
+        else:
+            na = self.num_data
+            nb = other.num_data
+            n = na + nb
+            d = other._mean - self._mean
+            dn = d / n
+            m2 = self._m2 + other._m2 + d * dn * na * nb
+            m3 = (self._m3 + other._m3 + d * dn * dn * na * nb * (na - nb) +
+                  3. * dn * (na * other._m2 - nb * self._m2))
+            m4 = (self._m4 + other._m4 + d * dn * dn * dn * na * nb * (na * na - na * nb + nb * nb) +
+                  6. * dn * dn * (na * na * other._m2 + nb * nb * self._m2) +
+                  4. * dn * (na * other._m3 - nb * self._m3))
+            self._mean += dn * nb
+            self._m2 = m2
+            self._m3 = m3
+            self._m4 = m4
+            self.num_data = n
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+        self.num_dummy += other.num_dummy
+        self.sums += other.sums
+        self._sum_log += other._sum_log
+        self._num_non_positive += other._num_non_positive
+
+    def merge(self, other):
+        """
+        Merge another accumulator into this accumulator.
+
+        :param other:   `Statistics_accumulator` instance
+        """
+
+        self._merge_moments(other)
+        if other._hist is not None:
+            if self._hist is None:
+                self._hist = other._hist.copy()
+                self._hist_edges = other._hist_edges.copy()
+            elif not np.array_equal(self._hist_edges, other._hist_edges):
+                raise GridUtilityException(_t('Cannot merge histograms with different bins.'))
+            else:
+                self._hist += other._hist
+
+    @property
+    def histogram(self):
+        """
+        Histogram as (counts, edges), where edges has one more element than counts, or `None` if there is
+        no histogram.
+        """
+        if self._hist is None:
+            return None
+        return self._hist, self._hist_edges
+
+    def percentile(self, p):
+        """
+        Percentile estimated from the histogram by linear interpolation within the bin. The error is
+        less than one histogram bin width.
+
+        :param p:   percentile, or array-like of percentiles, in the range 0 to 100
+        :returns:   percentile value(s), `None` if there is no data
+        """
+        if self._hist is None:
+            raise GridUtilityException(_t('Percentiles require a histogram.'))
+        total = self._hist.sum()
+        if total == 0:
+            return None
+        cumulative = np.concatenate(([0], np.cumsum(self._hist)))
+        return np.interp(np.asarray(p, dtype=np.float64) * (total / 100.), cumulative, self._hist_edges)
+
+    def statistics(self):
+        """
+        Statistics dictionary with the same keys as `geosoft.gxpy.grid.Grid.statistics()`. The variance
+        is the sample variance, skew and kurtosis are calculated from the central moments, and the
+        kurtosis is the excess kurtosis.
+        """
+
+        n = self.num_data
+        st = {'min': self.min,
+              'max': self.max,
+              'mean': None,
+              'geometric_mean': None,
+              'variance': None,
+              'sd': None,
+              'skew': None,
+              'kurtosis': None,
+              'sum': None,
+              'sum_power_2': None,
+              'sum_power_3': None,
+              'sum_power_4': None,
+              'num_data': n,
+              'num_dummy': self.num_dummy}
+        if n == 0:
+            return st
+
+        st['min'] = float(self.min)
+        st['max'] = float(self.max)
+        st['mean'] = float(self._mean)
+        st['sum'], st['sum_power_2'], st['sum_power_3'], st['sum_power_4'] = (float(v) for v in self.sums)
+        if self._num_non_positive == 0:
+            st['geometric_mean'] = math.exp(self._sum_log / n)
+        if n > 1:
+            st['variance'] = self._m2 / (n - 1)
+            st['sd'] = math.sqrt(st['variance'])
+            if self._m2 > 0.:
+                st['skew'] = math.sqrt(n) * self._m3 / self._m2 ** 1.5
+                st['kurtosis'] = n * self._m4 / (self._m2 * self._m2) - 3.
+        return st
+
+
+def _grid_statistics(grid, tile, histogram_bins, percentiles):
+    # statistics of an open grid
+
+    acc = Statistics_accumulator()
+    for _, _, data, _, _ in grid.iter_tiles(tile=tile, dtype=np.float64):
+        acc.add(data)
+
+    if histogram_bins and acc.num_data:
+        for _, _, data, _, _ in grid.iter_tiles(tile=tile, dtype=np.float64):
+            acc.add_histogram(data, histogram_bins, (acc.min, acc.max))
+
+    st = acc.statistics()
+    if histogram_bins:
+        if acc.histogram is None:
+            st['histogram'] = st['histogram_edges'] = None
+        else:
+            st['histogram'], st['histogram_edges'] = acc.histogram
+    if percentiles is not None:
+        values = acc.percentile(percentiles) if acc.num_data else [None] * len(percentiles)
+        for p, v in zip(percentiles, values):
+            st['percentile_{:g}'.format(p)] = None if v is None else float(v)
+    return grid.file_name_decorated, st
+
+
+def _grid_file_statistics(file_name, tile, histogram_bins, percentiles):
+    # statistics of a grid file, runs in a worker thread which requires its own GX context
+    with gxapi.GXContext.create(__name__, __version__):
+        with gxgrd.Grid.open(file_name) as grid:
+            return _grid_statistics(grid, tile, histogram_bins, percentiles)
+
+
+def statistics_many(grids, workers=None, histogram_bins=None, percentiles=None, tile=(1024, 1024)):
+    """
+    Calculate statistics for many grids, processing grids concurrently.
+
+    :param grids:           list of grid file names or `geosoft.gxpy.grid.Grid` instances. Grid files are
+                            opened and processed concurrently in worker threads, each with its own GX context.
+                            Grid instances are bound to the GX context of the calling thread, so they are
+                            processed in the calling thread. Pass names to benefit from concurrency.
+    :param workers:         number of worker threads, default is the number of cores.
+    :param histogram_bins:  number of histogram bins between the grid minimum and maximum, default no histogram.
+    :param percentiles:     list of percentiles (0 to 100) to estimate from the histogram, default none. If
+                            `histogram_bins` is not specified 1000 bins are used.
+    :param tile:            tile size used to stream grid data, which bounds memory use per worker.
+
+    :returns:   `pandas.DataFrame` indexed by decorated grid file name, with columns for each key returned
+                by `geosoft.gxpy.grid.Grid.statistics()`. If requested, columns 'histogram' (counts)
+                and 'histogram_edges' contain histograms as numpy arrays, and percentiles are in columns
+                named 'percentile_p', for example 'percentile_50'.
+
+    .. seealso:: `Statistics_accumulator`, `geosoft.gxpy.grid.Grid.statistics()`
+
+    .. versionadded:: 9.8
+    """
+
+    if percentiles is not None:
+        percentiles = list(percentiles)
+        if not histogram_bins:
+            histogram_bins = 1000
+
+    grids = list(grids)
+    names = [g for g in grids if not isinstance(g, gxgrd.Grid)]
+    by_name = dict(zip(names, gxsys.parallel_map(
+        lambda g: _grid_file_statistics(g, tile, histogram_bins, percentiles), names, threads=workers)))
+
+    results = []
+    for g in grids:
+        if isinstance(g, gxgrd.Grid):
+            results.append(_grid_statistics(g, tile, histogram_bins, percentiles))
+        else:
+            results.append(by_name[g])
+    return pd.DataFrame([st for _, st in results], index=[name for name, _ in results])
+
+
+def _harmonic_fill(data, tolerance, max_iterations):
+    # Fill nan cells with a harmonic (Laplace) surface. Each level starts from the solution on a grid
+    # coarsened by 2, so only a few red-black Gauss-Seidel passes are needed at each level.
+
+    known = ~np.isnan(data)
+    if known.all():
+        return data
+    ny, nx = data.shape
+    if min(nx, ny) > 8:
+        py = ny % 2
+        px = nx % 2
+        padded = np.pad(data, ((0, py), (0, px)), mode='edge')
+        blocks = padded.reshape((ny + py) // 2, 2, (nx + px) // 2, 2)
+        count = (~np.isnan(blocks)).sum(axis=(1, 3))
+        with np.errstate(invalid='ignore'):
+            coarse = np.nansum(blocks, axis=(1, 3)) / count
+        coarse = _harmonic_fill(coarse, tolerance, max_iterations)
+        surface = np.repeat(np.repeat(coarse, 2, axis=0), 2, axis=1)[:ny, :nx]
+    else:
+        surface = np.full(data.shape, np.nanmean(data))
+    surface[known] = data[known]
+
+    checker = (np.arange(ny)[:, None] + np.arange(nx)[None, :]) % 2
+    update = [~known & (checker == parity) for parity in (0, 1)]
+    for _ in range(max_iterations):
+        change = 0.
+        for u in update:
+            p = np.pad(surface, 1, mode='edge')
+            average = (p[:-2, 1:-1] + p[2:, 1:-1] + p[1:-1, :-2] + p[1:-1, 2:]) * 0.25
+            if u.any():
+                change = max(change, np.abs(average[u] - surface[u]).max())
+                surface[u] = average[u]
+        if change <= tolerance:
+            break
+
+    return surface
+
+
+def flood(grid, file_name=None, overwrite=False, tolerance=None, max_iterations=250, pass_tol=99.,
+          method=FLOOD_MINIMUM_CURVATURE):
     """
     Flood blank areas in a grid based on a minimum-curvature surface.
 
@@ -662,11 +1397,19 @@ def flood(grid, file_name=None, overwrite=False, tolerance=None, max_iterations=
     :param max_iterations:  maximum iterations for fiting the surface
     :param pass_tol:        percentage of data that needs to pass the tolerance test when definint
                             the minimum-curfacture surface. The default is 99%.
+    :param method:          `FLOOD_MINIMUM_CURVATURE` (default) fits a minimum-curvature surface to the grid,
+                            `FLOOD_HARMONIC` fills only the dummy cells with a multigrid solution of a
+                            harmonic surface, which is much faster and well suited to filling gaps and the
+                            expanded edges of grids prepared for an FFT. For `FLOOD_HARMONIC`,
+                            `max_iterations` is the maximum number of smoothing passes at each grid level and
+                            `pass_tol` is not used.
     :return:                `geosoft.gxpy.grid.Grid` instance of a flooded grid.
 
     .. seealso:: `geosoft.gxpy.grid.Grid.minimum_curvature`
 
     .. versionadded:: 9.4
+
+    .. versionchanged:: 9.8 added `method`
     """
 
     def pg_rows(n):
@@ -680,6 +1423,18 @@ def flood(grid, file_name=None, overwrite=False, tolerance=None, max_iterations=
     if not isinstance(grid, gxgrd.Grid):
         grid = gxgrd.Grid.open(grid)
 
+    if method == FLOOD_HARMONIC:
+        data = grid.np(dtype=np.float64)
+        if np.isnan(data).all():
+            raise GridUtilityException(_t('Grid has no data to flood'))
+        if tolerance is None:
+            tolerance = np.nanstd(data) * 0.001
+        data = _harmonic_fill(data, tolerance, max_iterations)
+        properties = grid.properties()
+        if np.dtype(grid.dtype).kind != 'f':
+            properties['dtype'] = np.float64
+        return gxgrd.Grid.from_data_array(data, file_name=file_name, overwrite=overwrite, properties=properties)
+
     pg = grid.gxpg(False)
     rvv = gxvv.GXvv(dtype=grid.dtype)
     rvv.length = grid.nx
@@ -703,7 +1458,7 @@ def flood(grid, file_name=None, overwrite=False, tolerance=None, max_iterations=
     return filled_grid
 
 
-def feather(grid, width, edge_value=None, file_name=None, overwrite=False):
+def feather(grid, width, edge_value=None, file_name=None, overwrite=False, tile=(1024, 1024)):
     """
     Feather the edge of a grid to a constant value at the edge.
 
@@ -712,14 +1467,17 @@ def feather(grid, width, edge_value=None, file_name=None, overwrite=False):
     :param overwrite:   `True` to overwrite existing file
     :param width:       feather width in cells around the grid, must be <= half the grid dimension
     :param edge_value:  edge value, default is the data mean
+    :param tile:        tile size for processing the grid
     :return:            feathered grid `geosoft.gxpy.grid.Grid`
 
     .. versionadded:: 9.4
+
+    .. versionchanged:: 9.8 added `tile`, the grid is feathered in tiles.
     """
 
     def _feather(dlen, w):
         ff = np.ones(dlen)
-        e = np.array([math.cos((i + 1) * math.pi/w) for i in range(w)]) * 0.5 + 0.5
+        e = np.cos(np.arange(1, w + 1) * math.pi / w) * 0.5 + 0.5
         ff[-len(e):] = e
         ff[:len(e)] = e[::-1]
         return ff
@@ -734,26 +1492,186 @@ def feather(grid, width, edge_value=None, file_name=None, overwrite=False):
     if edge_value is None:
         edge_value = grid.statistics()['mean']
 
-    pg = grid.gxpg()
-    pgf = gxapi.GXPG.create(pg.n_rows(), pg.n_cols(), pg.e_type())
-    vv = gxvv.GXvv(dtype=gxu.dtype_gx(pg.e_type()))
+    # the row and column tapers combine as an outer product, applied by tile
+    fx = _feather(grid.nx, width)
+    fy = _feather(grid.ny, width)
+    dtype = np.dtype(grid.dtype)
+
+    def tiles():
+        for ix0, iy0, data, _, _ in grid.iter_tiles(tile=tile, dtype=np.float64):
+            ny, nx = data.shape
+            data -= edge_value
+            data *= fy[iy0: iy0 + ny, None] * fx[None, ix0: ix0 + nx]
+            data += edge_value
+            if dtype.kind != 'f':
+                data = np.where(np.isnan(data), gxu.gx_dummy(dtype), np.round(data))
+            yield ix0, iy0, data
+
+    if (file_name is None) or (len(file_name.strip()) == 0):
+        file_name = gx.gx().temp_file('.grd(GRD)')
+    feathered = gxgrd.Grid.new(file_name, properties=grid.properties(), overwrite=overwrite)
+    feathered.write_tiles(tiles(), tile=tile)
+
+    return gxgrd.reopen(feathered)
+
+
+_expression_functions = {
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+    'exp': np.exp,
+    'log': np.log,
+    'log10': np.log10,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'asin': np.arcsin,
+    'acos': np.arccos,
+    'atan': np.arctan,
+    'atan2': np.arctan2,
+    'sinh': np.sinh,
+    'cosh': np.cosh,
+    'tanh': np.tanh,
+    'hypot': np.hypot,
+    'pow': np.power,
+    'floor': np.floor,
+    'ceil': np.ceil,
+    'round': np.round,
+    'min': np.minimum,
+    'max': np.maximum,
+    'where': np.where,
+    'isnan': np.isnan,
+    'pi': math.pi,
+    'e': math.e,
+    'nan': np.nan}
+
+_expression_nodes = tuple(getattr(ast, n) for n in (
+    'Module', 'Assign', 'Expr', 'Name', 'Load', 'Store', 'Call', 'Num', 'Constant',
+    'BinOp', 'UnaryOp', 'Compare', 'IfExp',
+    'Add', 'Sub', 'Mult', 'Div', 'FloorDiv', 'Mod', 'Pow',
+    'USub', 'UAdd', 'Invert', 'BitAnd', 'BitOr',
+    'Eq', 'NotEq', 'Lt', 'LtE', 'Gt', 'GtE') if hasattr(ast, n))
+
+
+def _compile_expression(expr, operands):
+    # compile a grid expression to Python code that assigns the result to '_'
+
+    statements = [st.strip() for st in expr.replace('\n', ';').split(';')]
+    statements = [st for st in statements if st]
+    if not statements:
+        raise GridUtilityException(_t('Empty expression'))
+    source = '\n'.join(statements)
+    try:
+        tree = ast.parse(source, mode='exec')
+    except SyntaxError as e:
+        raise GridUtilityException(_t('Expression syntax error "{}": {}').format(expr, e))
+
+    # the result is the value of the last statement
+    last = tree.body[-1]
+    if isinstance(last, ast.Expr):
+        value = last.value
+    elif isinstance(last, ast.Assign) and len(last.targets) == 1 and isinstance(last.targets[0], ast.Name):
+        value = ast.Name(id=last.targets[0].id, ctx=ast.Load())
+        tree.body.append(last)
+    else:
+        raise GridUtilityException(_t('Expression "{}" does not end with a value').format(expr))
+    tree.body[-1] = ast.copy_location(ast.Assign(targets=[ast.Name(id='_', ctx=ast.Store())], value=value), last)
+    ast.fix_missing_locations(tree)
 
-    f = _feather(pg.n_cols(), width)
-    for row in range(pg.n_rows()):
-        pg.read_row(row, 0, 0, vv.gxvv)
-        df = (vv.np - edge_value) * f + edge_value
-        pgf.write_row(row, 0, 0, gxvv.GXvv(df).gxvv)
+    for node in ast.walk(tree):
+        if not isinstance(node, _expression_nodes):
+            raise GridUtilityException(_t('Expression "{}" uses syntax not supported by the numpy evaluator: {}')
+                                       .format(expr, type(node).__name__))
+        if isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id in _expression_functions) or node.keywords:
+                raise GridUtilityException(_t('Unsupported function in expression "{}"').format(expr))
+        elif isinstance(node, ast.IfExp):
+            raise GridUtilityException(_t('Use where(condition, a, b) for conditional expressions'))
 
-    f = _feather(pg.n_rows(), width)
-    for col in range(pg.n_cols()):
-        pgf.read_col(col, 0, 0, vv.gxvv)
-        df = (vv.np - edge_value) * f + edge_value
-        pgf.write_col(col, 0, 0, gxvv.GXvv(df).gxvv)
+    names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+    assigned = {t.id for n in ast.walk(tree) if isinstance(n, ast.Assign) for t in n.targets}
+    unknown = names - set(operands) - set(_expression_functions) - assigned
+    if unknown:
+        raise GridUtilityException(_t('Unknown operands in expression: {}').format(sorted(unknown)))
 
-    return gxgrd.Grid.from_data_array(pgf, file_name=file_name, overwrite=overwrite, properties=grid.properties())
+    return compile(tree, '<expression>', 'exec')
 
 
-def expression(grids, expr, result_file_name=None, overwrite=False):
+def _expression_numpy(grids, expr, result_file_name, overwrite, dtype, tile, workers):
+    # tiled numpy evaluation of a grid expression
+
+    close_list = []
+    try:
+        operands = {}
+        for k, g in grids.items():
+            if not isinstance(g, gxgrd.Grid):
+                g = gxgrd.Grid.open(g, mode=gxgrd.FILE_READ)
+                close_list.append(g)
+            operands[k] = g
+        code = _compile_expression(expr, operands)
+
+        names = list(operands)
+        first = operands[names[0]]
+        for k in names[1:]:
+            g = operands[k]
+            if (g.nx, g.ny, g.x0, g.y0, g.dx, g.dy, g.rot) != \
+                    (first.nx, first.ny, first.x0, first.y0, first.dx, first.dy, first.rot):
+                raise GridUtilityException(_t('Grid "{}" does not have the same geometry as grid "{}"')
+                                           .format(k, names[0]))
+
+        if dtype is None:
+            dtype = first.dtype if np.dtype(first.dtype).kind == 'f' else np.float64
+        dtype = np.dtype(dtype)
+
+        def evaluate(data):
+            namespace = dict(_expression_functions)
+            namespace.update(data)
+            with np.errstate(all='ignore'):
+                exec(code, {'__builtins__': {}}, namespace)
+            result = np.broadcast_to(np.asarray(namespace['_'], dtype=np.float64),
+                                     data[names[0]].shape)
+            if dtype.kind != 'f':
+                result = np.where(np.isnan(result), gxu.gx_dummy(dtype), result)
+            return result.astype(dtype)
+
+        def tiles():
+            # read tiles in this thread, evaluate in the pool, yield results in order
+            if workers is None:
+                n_workers = os.cpu_count() or 1
+            else:
+                n_workers = max(1, workers)
+            pending = collections.deque()
+            with concurrent.futures.ThreadPoolExecutor(n_workers) as pool:
+                for ix0, iy0, data, _, _ in first.iter_tiles(tile=tile, dtype=np.float64):
+                    window = (ix0, iy0, data.shape[1], data.shape[0])
+                    tile_data = {names[0]: data}
+                    for k in names[1:]:
+                        tile_data[k] = operands[k].np(dtype=np.float64, window=window)
+                    pending.append((ix0, iy0, pool.submit(evaluate, tile_data)))
+
+                    # bound the number of tiles in memory
+                    while len(pending) > 2 * n_workers:
+                        ix, iy, f = pending.popleft()
+                        yield ix, iy, f.result()
+                while pending:
+                    ix, iy, f = pending.popleft()
+                    yield ix, iy, f.result()
+
+        properties = first.properties()
+        properties['dtype'] = dtype
+        if result_file_name is None:
+            result_file_name = gx.gx().temp_file('.grd(GRD)')
+        result = gxgrd.Grid.new(file_name=result_file_name, properties=properties, overwrite=overwrite)
+        result.write_tiles(tiles())
+
+        return gxgrd.reopen(result)
+
+    finally:
+        for g in close_list:
+            g.close()
+
+
+def expression(grids, expr, result_file_name=None, overwrite=False, engine=EXPRESSION_GXIEXP,
+               dtype=None, tile=(1024, 1024), workers=None):
     """
     Apply an expressing to grids.
 
@@ -763,8 +1681,26 @@ def expression(grids, expr, result_file_name=None, overwrite=False):
                         can have multiple lines, each line terminated by a ';' character.
     :param result_file_name:    optional result grid file name, if `None` a temporary grid is created.
     :param overwrite:   True to overwrite existing grid
+    :param engine:      `EXPRESSION_GXIEXP` (default) to evaluate with `geosoft.gxapi.GXIEXP`, or
+                        `EXPRESSION_NUMPY` to evaluate tiles of the grids with numpy, see note below.
+    :param dtype:       result dtype for `EXPRESSION_NUMPY`, default is the first grid dtype for float
+                        grids, otherwise np.float64.
+    :param tile:        tile size for `EXPRESSION_NUMPY`
+    :param workers:     number of threads to evaluate tiles for `EXPRESSION_NUMPY`, default is the number of
+                        cores.
     :return:            `Grid` instance that contains the resuilt of the expression.
 
+    .. note:: The `EXPRESSION_NUMPY` engine reads aligned tiles from the operand grids, evaluates tiles
+        in parallel threads and writes the result tile by tile, so grids of any size are processed
+        without float64 copies. The operand grids must have the same geometry. Dummies are `nan`
+        in the expression, and any operation on a dummy is a dummy.
+
+        The expression uses Python syntax with the same operand names, and may assign intermediate
+        variables in ';' terminated statements, for example: 'a=g1*2; a+g2'. Supported functions are
+        abs, sqrt, exp, log, log10, sin, cos, tan, asin, acos, atan, atan2, sinh, cosh, tanh, hypot,
+        pow, floor, ceil, round, min, max, isnan and where(condition, a, b), and the constants
+        pi, e and nan.
+
     *Example*
 
     .. code::
@@ -783,18 +1719,18 @@ def expression(grids, expr, result_file_name=None, overwrite=False):
         sum = gxgrd.expression({'a': grid_1, 'b': grid_2}, 'a+b')
 
     .. versionadded 9.4
-    """
 
-    exp = gxapi.GXIEXP.create()
+    .. versionchanged:: 9.8 added `engine`, `dtype`, `tile` and `workers`
+    """
 
     # build default operands dict from list of grids
     if not isinstance(grids, dict):
-        i = 1
-        gd = {}
-        for g in grids:
-            gd['g{}'.format(i)] = g
-            i += 1
-        grids = gd
+        grids = {'g{}'.format(i + 1): g for i, g in enumerate(grids)}
+
+    if engine == EXPRESSION_NUMPY:
+        return _expression_numpy(grids, expr, result_file_name, overwrite, dtype, tile, workers)
+
+    exp = gxapi.GXIEXP.create()
 
     # add grids to the expression
     properties = None
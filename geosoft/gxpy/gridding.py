@@ -0,0 +1,276 @@
+"""
+Gridding of located data in numpy.
+
+:Functions:
+    :`minimum_curvature`: continuous curvature splines in tension
+
+.. seealso:: `geosoft.gxpy.grid.Grid.minimum_curvature`, which uses the Geosoft gridding engine.
+
+.. note::
+
+    Regression tests provide usage examples:
+    `Tests <https://github.com/GeosoftInc/gxpy/blob/master/geosoft/gxpy/tests/test_gridding.py>`_
+
+.. versionadded:: 9.8
+"""
+import os
+import math
+import concurrent.futures
+import numpy as np
+
+import geosoft
+from . import gx as gx
+from . import grid as gxgrd
+from . import grid_utility as gxgrdu
+
+__version__ = geosoft.__version__
+
+
+def _t(s):
+    return geosoft.gxpy.system.translate(s)
+
+
+class GriddingException(geosoft.GXRuntimeError):
+    """
+    Exceptions from :mod:`geosoft.gxpy.gridding`.
+
+    .. versionadded:: 9.8
+    """
+    pass
+
+
+def _located_data(data):
+    # (N, 3) float64 array of valid (x, y, value) from an array, a list of rows or an iterable of arrays
+    if isinstance(data, np.ndarray):
+        xyv = np.asarray(data, dtype=np.float64).reshape((-1, 3))
+    elif isinstance(data, (list, tuple)) and \
+            not any(isinstance(d, np.ndarray) or np.ndim(d) > 1 for d in data):
+        xyv = np.asarray(data, dtype=np.float64).reshape((-1, 3))
+    else:
+        chunks = [np.asarray(d, dtype=np.float64).reshape((-1, 3)) for d in data]
+        xyv = np.concatenate(chunks) if chunks else np.empty((0, 3))
+    return xyv[~np.isnan(xyv).any(axis=1)]
+
+
+def _node_data(xyv, x0, y0, cs, nx, ny):
+    # data averaged at the nearest node of a grid, returns (values, has_data) shaped (ny, nx)
+    ix = np.rint((xyv[:, 0] - x0) / cs).astype(np.int64)
+    iy = np.rint((xyv[:, 1] - y0) / cs).astype(np.int64)
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    node = iy[inside] * nx + ix[inside]
+    count = np.bincount(node, minlength=nx * ny)
+    total = np.bincount(node, weights=xyv[inside, 2], minlength=nx * ny)
+    has_data = count > 0
+    values = np.full(nx * ny, np.nan)
+    values[has_data] = total[has_data] / count[has_data]
+    return values.reshape((ny, nx)), has_data.reshape((ny, nx))
+
+
+def _extrapolate_edges(p):
+    # linear extrapolation into the 2-cell border of a padded array, which is zero curvature normal to the edge
+    p[1, :] = 2. * p[2, :] - p[3, :]
+    p[0, :] = 2. * p[2, :] - p[4, :]
+    p[-2, :] = 2. * p[-3, :] - p[-4, :]
+    p[-1, :] = 2. * p[-3, :] - p[-5, :]
+    p[:, 1] = 2. * p[:, 2] - p[:, 3]
+    p[:, 0] = 2. * p[:, 2] - p[:, 4]
+    p[:, -2] = 2. * p[:, -3] - p[:, -4]
+    p[:, -1] = 2. * p[:, -3] - p[:, -5]
+
+
+def _relax(u, fixed, tension, tolerance, max_iterations, pool, workers):
+    # Gauss-Seidel relaxation of (1 - T) del4(u) - T del2(u) = 0 at free nodes. Nodes are updated in 9
+    # interleaved colours so that no node in the 13-point stencil of a node shares its colour, and each
+    # colour is updated in row bands in parallel. Returns the relaxed surface and the number of iterations.
+
+    ny, nx = u.shape
+    if min(nx, ny) < 3:
+        return u, 0
+    p = np.zeros((ny + 4, nx + 4))
+    p[2:-2, 2:-2] = u
+    u = p[2:-2, 2:-2]
+    _extrapolate_edges(p)
+    centre = (1. - tension) * 20. + tension * 4.
+    colours = [(a, b) for a in range(3) for b in range(3)]
+    free = {c: ~fixed[c[0]::3, c[1]::3] for c in colours}
+
+    def update(colour, row0, row1):
+        a, b = colour
+        rows = slice(row0, row1)
+        f = free[colour][rows]
+        if not f.any():
+            return 0.
+
+        def s(di, dj):
+            return p[a + 2 + di::3, b + 2 + dj::3][rows][:f.shape[0], :f.shape[1]]
+
+        n4 = s(-1, 0) + s(1, 0) + s(0, -1) + s(0, 1)
+        diagonal = s(-1, -1) + s(-1, 1) + s(1, -1) + s(1, 1)
+        far = s(-2, 0) + s(2, 0) + s(0, -2) + s(0, 2)
+        new = ((1. - tension) * (8. * n4 - 2. * diagonal - far) + tension * n4) / centre
+        old = u[a::3, b::3][rows]
+        change = np.abs(new[f] - old[f]).max()
+        old[f] = new[f]
+        return change
+
+    iterations = 0
+    for iterations in range(1, max(1, max_iterations) + 1):
+        change = 0.
+        for colour in colours:
+            rows = u[colour[0]::3, colour[1]::3].shape[0]
+            band = max(1, -(-rows // workers))
+            if workers > 1 and rows > band:
+                futures = [pool.submit(update, colour, r, min(rows, r + band)) for r in range(0, rows, band)]
+                change = max([change] + [f.result() for f in futures])
+            else:
+                change = max(change, update(colour, 0, rows))
+            _extrapolate_edges(p)
+        if change <= tolerance:
+            break
+
+    return u.copy(), iterations
+
+
+def _blank_distance(has_data, radius):
+    # mask of nodes within radius cells of a node with data, a separable Euclidean distance transform
+    # limited to the radius
+    ny, nx = has_data.shape
+    r = int(math.ceil(radius))
+    big = float((2 * r + 1) ** 2)
+    g = np.where(has_data, 0., big)
+    column = g.copy()
+    for d in range(1, r + 1):
+        column[d:, :] = np.minimum(column[d:, :], g[:-d, :] + d * d)
+        column[:-d, :] = np.minimum(column[:-d, :], g[d:, :] + d * d)
+    distance = column.copy()
+    for d in range(1, r + 1):
+        distance[:, d:] = np.minimum(distance[:, d:], column[:, :-d] + d * d)
+        distance[:, :-d] = np.minimum(distance[:, :-d], column[:, d:] + d * d)
+    return distance <= radius * radius
+
+
+def minimum_curvature(data,
+                      cs=None,
+                      area=None,
+                      bkd=None,
+                      tol=None,
+                      itrmax=200,
+                      ti=0.,
+                      icgr=8,
+                      file_name=None,
+                      overwrite=False,
+                      coordinate_system=None,
+                      unit_of_measure=None,
+                      dtype=np.float32,
+                      workers=None):
+    """
+    Create a minimum-curvature surface grid from (x, y, value) located data with numpy.
+
+    Reference: Smith and Wessel, 1990, Gridding with continuous curvature splines in tension.
+
+    :param data:        list of [(x, y, value), ...], a numpy array shaped (-1, 3), or an iterable, list or
+                        tuple of such arrays, which can have different lengths.
+                        Locations with a `numpy.nan` value are ignored.
+    :param cs:          The grid cell size in reference system units. The default is the nominal data spacing
+                        divided by 4.
+    :param area:        (xmin, ymin, xmax, ymax) - grid area, default is the data limits
+    :param bkd:         Blanking distance. All grid cells farther than the blanking distance from a valid
+                        point will be blanked in the output grid. The default is the nominal sample interval,
+                        i.e. sqrt(area/#data). Set to 0 for no blanking.
+    :param tol:         The tolerance required for each grid cell. The default is 0.1 percent of the range
+                        of the data. Decrease for a more accurate grid.
+    :param itrmax:      Maximum number of iterations at each grid level. The default is 200.
+    :param ti:          The degree of internal tension (between 0 and 1). The default is no tension (0.0)
+                        which produces a true minimum curvature surface.
+    :param icgr:        The coarse grid size relative to the final grid size. Allowable factors are
+                        16, 8, 4, 2 or 1. The default is 8.
+    :param file_name:   name of the grid file, None for a temporary grid.
+    :param overwrite:   True to overwrite existing file
+    :param coordinate_system:   coordinate system of the data
+    :param unit_of_measure:     data unit of measure
+    :param dtype:       grid data type, default is np.float32
+    :param workers:     number of threads used to relax the surface, default is the number of cores.
+    :returns:           `geosoft.gxpy.grid.Grid` instance
+
+    .. note:: The surface is solved on the coarse grid first, starting from a harmonic surface fitted to
+        the data, and then refined by halving the cell size until the final cell size is reached. Data
+        are assigned to the nearest node at each grid level, and the average is used where more than
+        one data point is nearest to a node. At each level the free nodes are relaxed until the
+        largest change is less than `tol`, or `itrmax` iterations.
+
+    .. versionadded:: 9.8
+    """
+
+    xyv = _located_data(data)
+    if len(xyv) == 0:
+        raise GriddingException(_t('No valid data to grid'))
+
+    if area is None:
+        xmin, ymin = xyv[:, :2].min(axis=0)
+        xmax, ymax = xyv[:, :2].max(axis=0)
+    else:
+        xmin, ymin, xmax, ymax = (float(a) for a in area)
+    nominal = math.sqrt(max((xmax - xmin) * (ymax - ymin), 1.0e-30) / len(xyv))
+    if cs is None:
+        cs = nominal / 4.
+    cs = float(cs)
+    if cs <= 0.:
+        raise GriddingException(_t('Cell size must be > 0'))
+    if bkd is None:
+        bkd = nominal
+    icgr = int(icgr)
+    if icgr not in (1, 2, 4, 8, 16):
+        raise GriddingException(_t('icgr must be 16, 8, 4, 2 or 1'))
+    ti = float(ti)
+    if not (0. <= ti <= 1.):
+        raise GriddingException(_t('Tension must be between 0 and 1'))
+    if tol is None:
+        tol = (xyv[:, 2].max() - xyv[:, 2].min()) * 0.001
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, int(workers))
+
+    nx = int(round((xmax - xmin) / cs)) + 1
+    ny = int(round((ymax - ymin) / cs)) + 1
+
+    gxc = gx.gx()
+    u = None
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        factor = icgr
+        while factor >= 1:
+            lcs = cs * factor
+            lnx = (nx - 1) // factor + 1
+            lny = (ny - 1) // factor + 1
+            values, fixed = _node_data(xyv, xmin, ymin, lcs, lnx, lny)
+
+            if u is None:
+                u = gxgrdu._harmonic_fill(values, tol, itrmax)
+            else:
+                # bilinear refinement of the coarser surface
+                cy = np.arange(lny) / 2.
+                cx = np.arange(lnx) / 2.
+                iy0 = np.minimum(np.floor(cy).astype(np.int64), u.shape[0] - 1)
+                ix0 = np.minimum(np.floor(cx).astype(np.int64), u.shape[1] - 1)
+                iy1 = np.minimum(iy0 + 1, u.shape[0] - 1)
+                ix1 = np.minimum(ix0 + 1, u.shape[1] - 1)
+                fy = (cy - iy0)[:, None]
+                fx = (cx - ix0)[None, :]
+                u = ((u[iy0][:, ix0] * (1. - fx) + u[iy0][:, ix1] * fx) * (1. - fy) +
+                     (u[iy1][:, ix0] * (1. - fx) + u[iy1][:, ix1] * fx) * fy)
+                u[fixed] = values[fixed]
+
+            u, iterations = _relax(u, fixed, ti, tol, itrmax, pool, workers)
+            gxc.log(_t('Minimum curvature: cell {}, ({}, {}), {} iterations').format(lcs, lnx, lny, iterations))
+            factor //= 2
+
+    if bkd > 0.:
+        u[~_blank_distance(_node_data(xyv, xmin, ymin, cs, nx, ny)[1], bkd / cs)] = np.nan
+
+    properties = {'x0': xmin, 'y0': ymin, 'dx': cs, 'dy': cs, 'rot': 0., 'dtype': dtype}
+    if coordinate_system is not None:
+        properties['coordinate_system'] = coordinate_system
+    grd = gxgrd.Grid.from_data_array(u.astype(dtype), file_name=file_name, overwrite=overwrite, properties=properties)
+    if unit_of_measure is not None:
+        grd.unit_of_measure = unit_of_measure
+
+    return grd
@@ -132,8 +132,8 @@ def _parallel_foreach(f, l, threads=3, return_=False):
         for t in threadlist:
             t.join()
         if exceptions:
-            a, b, c = exceptions[0]
-            raise (a, b, c)
+            _, e, tb = exceptions[0]
+            raise e.with_traceback(tb)
         if return_:
             r = sorted(d.items())
             return [v for (n, v) in r]
@@ -373,6 +373,134 @@ class Test(GXPYTest):
 
             gdb.discard()
 
+    def test_iter_blocks(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.open(self.gdb_name) as gdb:
+
+            blocks = list(gdb.iter_blocks('D578625', channels=['X', 'Y', 'Z']))
+            self.assertEqual(len(blocks), 1)
+            line, fid, npd = blocks[0]
+            self.assertEqual(line, 'D578625')
+            self.assertEqual(fid, (0.0, 1.0))
+            self.assertEqual(npd.shape, (832, 3))
+            self.assertEqual(npd[10, :3].tolist(), [578625.0, 7773625.0, -1195.7531280517615])
+
+            blocks = list(gdb.iter_blocks('D578625', channels=['X', 'Y'], block_rows=100))
+            self.assertEqual(len(blocks), 9)
+            self.assertEqual(blocks[1][1], (100.0, 1.0))
+            self.assertEqual(blocks[8][2].shape, (32, 2))
+
+            npd = gdb.read_line('D578625', channels=['X', 'Y'])[0]
+            self.assertTrue(np.array_equal(np.concatenate([b[2] for b in blocks]), npd))
+
+            nlines = len(set(b[0] for b in gdb.iter_blocks(channels='X')))
+            self.assertEqual(nlines, len(gdb.list_lines()))
+
+            gdb.discard()
+
+    def test_iter_lines(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.open(self.gdb_name) as gdb:
+
+            lines = list(gdb.list_lines())
+            for prefetch in (0, 1, 3):
+                read = list(gdb.iter_lines(channels=['X', 'Y', 'Z'], prefetch=prefetch))
+                self.assertEqual([r[0] for r in read], lines)
+                for line, npd, ch, fid in read:
+                    ref, ref_ch, ref_fid = gdb.read_line(line, channels=['X', 'Y', 'Z'])
+                    self.assertTrue(np.array_equal(npd, ref, equal_nan=True))
+                    self.assertEqual(ch, ref_ch)
+                    self.assertEqual(fid, ref_fid)
+
+            self.nl = 0
+
+            def enough():
+                self.nl += 1
+                return self.nl >= 2
+
+            self.assertEqual(len(list(gdb.iter_lines(channels='X', prefetch=1, stop=enough))), 2)
+
+            for line, npd, ch, fid in gdb.iter_lines(channels='X'):
+                break
+            self.assertEqual(line, lines[0])
+
+            gdb.discard()
+
+    def test_query(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.open(self.gdb_name) as gdb:
+
+            npd, ch = gdb.query(['X', 'Y', 'Z'], where={'Z': (-2000., 0.)}, lines='D578625')
+            self.assertEqual(ch, ['X', 'Y', 'Z'])
+            ref = gdb.read_line('D578625', channels=['X', 'Y', 'Z'])[0]
+            ref = ref[(ref[:, 2] >= -2000.) & (ref[:, 2] <= 0.)]
+            self.assertTrue(len(ref) > 0)
+            self.assertTrue(np.array_equal(npd, ref))
+
+            # condition on a channel that is not returned, from all lines
+            npd, ch = gdb.query('Z', where={'X': 578625.}, select=False)
+            xz = np.concatenate([b[2] for b in gdb.iter_blocks(gdb.list_lines(select=False), channels=['X', 'Z'])])
+            self.assertTrue(np.array_equal(npd[:, 0], xz[xz[:, 0] == 578625., 1], equal_nan=True))
+            npd, ch = gdb.query('Z', where={'X': [578625.]}, dummy=gxdb.READ_REMOVE_DUMMYROWS)
+            self.assertFalse(np.isnan(npd).any())
+
+            nrows = sum(len(b[2]) for b in gdb.iter_blocks(channels='X'))
+            self.assertEqual(gdb.query('X')[0].shape, (nrows, 1))
+            self.assertEqual(len(gdb.query('X', where={'X': (None, 0.)})[0]), 0)
+
+            # channels with different fiducials are resampled to a common fiducial
+            gdb.new_line('T1')
+            gdb.write_channel('T1', 'a', [1., 2., 3., 4.], fid=(0., 1.))
+            gdb.write_channel('T1', 'b', [10., 30.], fid=(0., 2.))
+            npd, ch = gdb.query(['a', 'b'], where={'a': (2., 3.)}, lines='T1')
+            self.assertEqual(ch, ['a', 'b'])
+            self.assertTrue(np.array_equal(npd, [[2., 20.], [3., 30.]]))
+
+            gdb.discard()
+
+    def test_map_lines(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.open(self.gdb_name) as gdb:
+
+            try:
+                lines = list(gdb.list_lines())
+                serial = gdb.map_lines(lambda line, npd: npd.sum(axis=0), channels=['X', 'Z'], workers=1)
+                self.assertEqual([r[0] for r in serial], lines)
+
+                parallel = gdb.map_lines(lambda line, npd: npd.sum(axis=0), channels=['X', 'Z'], workers=4)
+                self.assertEqual([r[0] for r in parallel], lines)
+                for s, p in zip(serial, parallel):
+                    self.assertTrue(np.array_equal(s[1], p[1], equal_nan=True))
+
+                unordered = gdb.map_lines(lambda line, npd: len(npd), channels='X', workers=4, ordered=False)
+                self.assertEqual(sorted(unordered), sorted(gdb.map_lines(lambda line, npd: len(npd),
+                                                                         channels='X', workers=1)))
+
+                self.assertEqual(gdb.map_lines(lambda line, npd: npd * 2., channels='Z', out_channels='Z2',
+                                               workers=4), None)
+                for line in lines:
+                    z = gdb.read_line(line, channels='Z')[0]
+                    z2 = gdb.read_line(line, channels='Z2')[0]
+                    self.assertTrue(np.array_equal(z * 2., z2, equal_nan=True))
+
+                # a channel that is read can also be written, results are written after the workers finish
+                gdb.map_lines(lambda line, npd: npd + 1., channels='Z2', out_channels='Z2', workers=4)
+                for line in lines:
+                    z = gdb.read_line(line, channels='Z')[0]
+                    z2 = gdb.read_line(line, channels='Z2')[0]
+                    self.assertTrue(np.array_equal(z * 2. + 1., z2, equal_nan=True))
+
+                def fail(line, npd):
+                    raise ValueError(line)
+                self.assertRaises(ValueError, gdb.map_lines, fail, channels='X', workers=2)
+
+            finally:
+                gdb.discard()
+
     def test_read_vv_GDB(self):
         self.start()
 
@@ -539,6 +667,63 @@ class Test(GXPYTest):
             finally:
                 gdb.discard()
 
+    def test_line_extent(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.open(self.gdb_name) as gdb:
+
+            try:
+                gdb.select_lines()
+                ext = gdb.extent
+                boxes = {ln: gdb.line_extent(ln) for ln in gdb.list_lines()}
+                self.assertEqual(min(b.p0.x for b in boxes.values()), ext.p0.x)
+                self.assertEqual(max(b.p1.y for b in boxes.values()), ext.p1.y)
+
+                d2 = boxes['D2']
+                self.assertTrue('D2' in gdb.lines_in_extent(d2.extent_xy))
+                self.assertTrue('D2' in gdb.lines_in_extent(d2))
+                self.assertEqual(len(gdb.lines_in_extent((0., 0., 1., 1.))), 0)
+
+                # writing x moves only the box of the line written
+                dx, _ = gdb.read_channel('D2', 'x')
+                gdb.write_channel('D2', 'x', dx + 1000000.)
+                moved = gdb.line_extent('D2')
+                self.assertEqual(moved.p0.x, d2.p0.x + 1000000.)
+                self.assertEqual(moved.p1.x, d2.p1.x + 1000000.)
+                self.assertEqual(moved.p0.y, d2.p0.y)
+                self.assertEqual(gdb.extent.p1.x, moved.p1.x)
+                self.assertEqual(list(gdb.lines_in_extent(moved.extent_xy)), ['D2'])
+
+                # boxes are only in memory by default
+                self.assertFalse(gdb.store_extent)
+                self.assertEqual(gdb._line_box_setting(gdb.line_name_symb('D2')[1]), '')
+
+                # stored boxes are used when the memory cache is empty
+                gdb.store_extent = True
+                gdb.clear_extent()
+                self.assertEqual(gdb.line_extent('D2').extent_xyz, moved.extent_xyz)
+                gdb._extent['lines'] = {}
+                self.assertEqual(gdb.line_extent('D2').extent_xyz, moved.extent_xyz)
+
+                # the line is not changed by a write when boxes are not stored, clear_extent removes stored boxes
+                gdb.store_extent = False
+                stored = gdb._line_box_setting(gdb.line_name_symb('D2')[1])
+                self.assertNotEqual(stored, '')
+                gdb.write_channel('D2', 'x', dx)
+                self.assertEqual(gdb._line_box_setting(gdb.line_name_symb('D2')[1]), stored)
+                self.assertEqual(gdb.line_extent('D2').p0.x, d2.p0.x)
+                gdb.clear_extent()
+                self.assertEqual(gdb._line_box_setting(gdb.line_name_symb('D2')[1]), '')
+
+                # extent is None if there is no located data
+                gdb.select_lines(select=False)
+                gdb.new_line('L99999')
+                gdb.select_lines('L99999')
+                self.assertEqual(gdb.extent, None)
+
+            finally:
+                gdb.discard()
+
     def test_write_vv_GDB(self):
         self.start()
 
@@ -688,6 +873,95 @@ class Test(GXPYTest):
 
             gdb.discard()
 
+    def test_bulk_writer(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.new() as gdb:
+
+            data = np.arange(3000, dtype=np.float64).reshape((-1, 3))
+            data[5, 1] = np.nan
+            with gdb.bulk_writer(['x', 'y', 'z']) as writer:
+                self.assertEqual(writer.width, 3)
+                writer.write('L1', data, fid=(10.0, 0.5))
+                writer.write('L2', data[:10, :])
+                self.assertRaises(gxdb.GdbException, writer.write, 'L3', data[:, :2])
+
+            npd, ch, fid = gdb.read_line('L1', channels=['x', 'y', 'z'])
+            self.assertEqual(ch, ['x', 'y', 'z'])
+            self.assertEqual(fid, (10.0, 0.5))
+            self.assertEqual(npd.shape, (1000, 3))
+            self.assertTrue(np.isnan(npd[5, 1]))
+            self.assertEqual(npd[999, :].tolist(), [2997.0, 2998.0, 2999.0])
+
+            npd, ch, fid = gdb.read_line('L2', channels=['x', 'y', 'z'])
+            self.assertEqual(npd.shape, (10, 3))
+
+            gdb.new_channel('va', array=2)
+            with gdb.bulk_writer(['x', 'va']) as writer:
+                writer.write('L3', data)
+            npd, ch, fid = gdb.read_line('L3', channels=['x', 'va'])
+            self.assertEqual(ch, ['x', 'va[0]', 'va[1]'])
+            self.assertEqual(npd[999, :].tolist(), [2997.0, 2998.0, 2999.0])
+
+            # blocks written to the same line are appended
+            with gdb.bulk_writer(['x', 'y', 'z']) as writer:
+                writer.write('L5', data[:400], fid=(5.0, 2.0))
+                writer.write('L5', data[400:])
+                self.assertRaises(gxdb.GdbException, writer.write, 'L5', data[:10], fid=(0.0, 1.0))
+                writer.write('L6', data[:7])
+                writer.write('L6', data[7:10], fid=(7.0, 1.0))
+            npd, ch, fid = gdb.read_line('L5', channels=['x', 'y', 'z'])
+            self.assertEqual(fid, (5.0, 2.0))
+            self.assertEqual(npd.shape, (1000, 3))
+            self.assertEqual(npd[400, :].tolist(), [1200.0, 1201.0, 1202.0])
+            self.assertEqual(npd[999, :].tolist(), [2997.0, 2998.0, 2999.0])
+            self.assertEqual(gdb.read_line('L6', channels='x')[0].shape[0], 10)
+
+            # nothing is committed if the with body raises
+            try:
+                with gdb.bulk_writer(['x', 'y', 'z']) as writer:
+                    writer.write('L4', data)
+                    raise ValueError('abandon')
+            except ValueError:
+                pass
+            self.assertEqual(gdb.read_line('L4', channels=['x', 'y', 'z'])[0].shape[0], 0)
+
+    def test_read_mixed_rate(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.new() as gdb:
+
+            # 10 Hz mag with 1 Hz GPS, and a 1 Hz integer code
+            gdb.write_channel('L1', 'mag', np.arange(51, dtype=np.float64), fid=(0., 0.1))
+            gdb.write_channel('L1', 'gps', np.array([100., 110., 120., np.nan, 140., 150.]), fid=(0., 1.))
+            gdb.write_channel('L1', 'code', np.array([1, 2, 3, 4, 5, 6], dtype=np.int32), fid=(0., 1.))
+
+            npd, ch, fid = gdb.read_line('L1', channels=['mag', 'gps'])
+            self.assertEqual(fid, (0., 0.1))
+            self.assertEqual(npd.shape, (51, 2))
+            self.assertEqual(npd[:, 0].tolist(), list(range(51)))
+            self.assertEqual(npd[10, 1], 110.)
+            self.assertAlmostEqual(npd[15, 1], 115.)
+            self.assertTrue(np.isnan(npd[25, 1]))
+            self.assertTrue(np.isnan(npd[30, 1]))
+            self.assertEqual(npd[50, 1], 150.)
+
+            npd, ch, fid = gdb.read_line('L1', channels=['mag', 'code'], dtype=np.int32)
+            self.assertEqual(npd[14, 1], 2)
+            self.assertEqual(npd[16, 1], 3)
+
+            npd, ch, fid = gdb.read_line('L1', channels=['gps'], fid=(0.5, 1.))
+            self.assertEqual(npd.shape, (6, 1))
+            self.assertEqual(npd[0, 0], 105.)
+            self.assertTrue(np.isnan(npd[2, 0]))
+            self.assertTrue(np.isnan(npd[5, 0]))
+
+            data = gdb.read_line_vv('L1', channels=['mag', 'gps'], common_fid=True)
+            npd = gdb.read_line('L1', channels=['mag', 'gps'])[0]
+            for i, (c, vv) in enumerate(data):
+                self.assertEqual(vv.fid, (0., 0.1))
+                self.assertTrue(np.array_equal(vv.np, npd[:, i], equal_nan=True))
+
     def test_write_VA_GDB(self):
         self.start()
 
@@ -859,12 +1133,29 @@ class Test(GXPYTest):
                 listVal = gdb.list_values('testlist', umax=100, stop=enough)
                 listVal.sort()
                 self.assertEqual(listVal, ['1','12','13','2','3','4','5','6','7'])
+                self.assertEqual(gdb.list_values('testlist', counts=True),
+                                 [('1', 1), ('12', 3), ('13', 3), ('2', 1), ('3', 1),
+                                  ('4', 4), ('5', 2), ('6', 2), ('7', 3)])
+                self.assertEqual(len(gdb.list_values('testlist', umax=3)), 3)
                 self.nl = 0
                 self.stp = 1
                 listVal = gdb.list_values('dx', umax=10000)
                 self.assertEqual(len(listVal),29)
                 listVal = gdb.list_values('dx')
                 self.assertEqual(len(listVal),29)
+                counted = gdb.list_values('dx', counts=True)
+                self.assertEqual([v for v, c in counted], listVal)
+
+                # dummies are not listed from channels read as formatted strings
+                gdb.delete_channel('testexp')
+                gdb.new_channel('testexp', dtype=np.float64)
+                gdb.write_channel('D578625', 'testexp', np.array([1., np.nan, 2., 1.]))
+                gdb.write_channel('D2', 'testexp', np.array([np.nan, np.nan]))
+                gxdb.Channel(gdb, 'testexp').format = gxdb.FORMAT_EXP
+                listVal = gdb.list_values('testexp')
+                self.assertEqual(len(listVal), 2)
+                self.assertFalse('*' in listVal)
+                self.assertEqual(sum(c for v, c in gdb.list_values('testexp', counts=True)), 3)
             finally:
                 gdb.discard()
 
@@ -966,6 +1257,54 @@ class Test(GXPYTest):
             finally:
                 gdb.discard()
 
+    def test_symbol_cache(self):
+        self.start()
+
+        with gxdb.Geosoft_gdb.open(self.gdb_name) as gdb:
+
+            try:
+                channels = gdb.list_channels()
+                lines = gdb.list_lines()
+                for c, s in channels.items():
+                    self.assertEqual(gdb.channel_name_symb(c), (c, s))
+                    self.assertEqual(gdb.channel_name_symb(s), (c, s))
+                for l, s in lines.items():
+                    self.assertEqual(gdb.line_name_symb(s), (l, s))
+
+                self.assertEqual(gdb.channel_width('X'), 1)
+                self.assertEqual(gdb.channel_dtype('X'), np.float64)
+
+                gdb.delete_channel('cachetest')
+                gdb.new_channel('cachetest', np.int32, array=4)
+                self.assertTrue(gdb.is_channel('cachetest'))
+                self.assertEqual(gdb.channel_width('cachetest'), 4)
+                self.assertEqual(gdb.channel_dtype('cachetest'), np.int32)
+
+                ch = gxdb.Channel(gdb, 'cachetest')
+                ch.name = 'cachetest_renamed'
+                self.assertFalse(gdb.is_channel('cachetest'))
+                self.assertTrue(gdb.is_channel('cachetest_renamed'))
+                self.assertEqual(gdb.channel_name_symb(ch.symbol)[0], 'cachetest_renamed')
+
+                gdb.delete_channel('cachetest_renamed')
+                self.assertFalse(gdb.is_channel('cachetest_renamed'))
+                self.assertRaises(gxdb.GdbException, gdb.channel_name_symb, 'cachetest_renamed')
+
+                line = gxdb.create_line_name(99, gxdb.LINE_TYPE_NORMAL)
+                gdb.delete_line(line)
+                ls = gdb.new_line(line)
+                self.assertEqual(gdb.line_name_symb(line)[1], ls)
+                ln = gxdb.Line(gdb, line)
+                ln.version = 3
+                line_v3 = gxdb.create_line_name(99, gxdb.LINE_TYPE_NORMAL, 3)
+                self.assertEqual(gdb.line_name_symb(ls)[0], line_v3)
+                self.assertFalse(gdb.is_line(line))
+                gdb.delete_line(line_v3)
+                self.assertFalse(gdb.is_line(line_v3))
+
+            finally:
+                gdb.discard()
+
     def test_channel(self):
         self.start()
 
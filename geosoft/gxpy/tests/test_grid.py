@@ -633,6 +633,81 @@ class Test(GXPYTest):
                 self.assertEqual(gm.xyz(0), (18.595203516590775, 39.8775426296126, 1007.0))
                 self.assertEqual(gm.xyz((g.nx - 1, g.ny - 1)), (19.00281516607315, 40.75166863280787, 1008.0342903237216))
 
+    def test_xy_from_index_np(self):
+        self.start()
+
+        with gxgrd.Grid.open(self.g1f) as g:
+            with gxgrd.Grid.copy(g) as gm:
+                gm.rot = 30.0
+                ix = np.array([0, 1, 17, gm.nx - 1])
+                iy = np.array([0, 5, 9, gm.ny - 1])
+                x, y = gm.xy_from_index_np(ix, iy)
+                for i in range(len(ix)):
+                    xx, yy = gm.xy_from_index(ix[i], iy[i])
+                    self.assertAlmostEqual(x[i], xx)
+                    self.assertAlmostEqual(y[i], yy)
+
+                fx, fy = gm.index_from_xy_np(x, y)
+                self.assertTrue(np.allclose(fx, ix))
+                self.assertTrue(np.allclose(fy, iy))
+
+                cs_name = gxcs.name_from_hcs_orient_vcs(gm.coordinate_system.hcs, '0, 0, 1000, 0, -90, 25', '')
+                gm.coordinate_system = cs_name
+                x, y, z = gm.xyz_from_index_np(ix, iy)
+                for i in range(len(ix)):
+                    xx, yy, zz = gm.xyz((int(ix[i]), int(iy[i])))
+                    self.assertAlmostEqual(x[i], xx)
+                    self.assertAlmostEqual(y[i], yy)
+                    self.assertAlmostEqual(z[i], zz)
+
+                fx, fy = gm.index_from_xy_np(x, y, z)
+                self.assertTrue(np.allclose(fx, ix))
+                self.assertTrue(np.allclose(fy, iy))
+
+                xyzv = gm.xyzv()
+                self.assertAlmostEqual(xyzv[iy[2], ix[2], 0], x[2])
+                self.assertAlmostEqual(xyzv[iy[2], ix[2], 2], z[2])
+
+    def test_sample(self):
+        self.start()
+
+        with gxgrd.Grid.open(self.g1f) as g:
+            with gxgrd.Grid.copy(g, dtype=np.float64) as gm:
+                gm.rot = 30.0
+                fix = np.array([0., 1.5, 17.25, 20.7, gm.nx - 1])
+                fiy = np.array([0., 5.5, 9.75, 30.1, gm.ny - 1])
+                x, y = gm.xy_from_index_np(fix, fiy)
+                xy = np.column_stack((x, y))
+
+                v = gm.sample(xy, tile=(16, 16), chunk=2, workers=2)
+                for i in range(len(x)):
+                    self.assertAlmostEqual(v[i], gm.get_value(x[i], y[i]), 6)
+
+                data = gm.np(dtype=np.float64)
+                v = gm.sample(xy, method='nearest')
+                for i in range(len(x)):
+                    self.assertEqual(v[i], data[int(round(fiy[i])), int(round(fix[i]))])
+
+                v = gm.sample(xy[:2], method='bicubic')
+                self.assertEqual(v[0], data[0, 0])
+                self.assertAlmostEqual(v[1], gm.get_value(x[1], y[1]), -1)
+
+                v = gm.sample(((x[0] - 1000. * gm.dx, y[0]),))
+                self.assertTrue(np.isnan(v[0]))
+                self.assertRaises(gxgrd.GridException, gm.sample, xy, method='spline')
+
+        # dummy neighbours with no weight do not affect points on the last row and column
+        data = np.arange(30, dtype=np.float64).reshape((5, 6))
+        data[3, :] = np.nan
+        data[:, 4] = np.nan
+        with gxgrd.Grid.from_data_array(data) as g:
+            xy = ((5., 1.), (2., 4.), (5., 4.))
+            for method in ('linear', 'bicubic'):
+                v = g.sample(xy, method=method)
+                self.assertEqual(list(v), [data[1, 5], data[4, 2], data[4, 5]])
+            v = g.sample(((4.5, 1.),))
+            self.assertTrue(np.isnan(v[0]))
+
     def test_figure_map(self):
         self.start()
         map_file = gxgrd.figure_map(self.g1f, map_file='figure_map.map', title='image_test', features='all').file_name
@@ -675,6 +750,61 @@ class Test(GXPYTest):
             self.assertEqual(col_2[2], 102)
             self.assertEqual(col_2[3], 255)
 
+    def test_np_window(self):
+        self.start()
+
+        with gxgrd.Grid.open(self.g1f) as g1:
+            full = g1.np(dtype=np.float64)
+            self.assertEqual(full.dtype, np.dtype(np.float64))
+            self.assertEqual(10081870.0, np.nansum(full))
+
+            data = g1.np(window=(10, 20, 30, 40))
+            self.assertEqual(data.shape, (40, 30))
+            self.assertTrue(np.array_equal(data, full[20:60, 10:40].astype(np.float32), equal_nan=True))
+
+            out = np.zeros((101, 101), dtype=np.float64)
+            data = g1.np(out=out)
+            self.assertTrue(data is out)
+            self.assertTrue(np.array_equal(out, full, equal_nan=True))
+
+            self.assertRaises(gxgrd.GridException, g1.np, window=(90, 0, 20, 10))
+            self.assertRaises(gxgrd.GridException, g1.np, out=np.zeros((10, 10)))
+
+            xyzv = g1.xyzv()
+            self.assertTrue(np.array_equal(xyzv[:, :, 3], full, equal_nan=True))
+
+        with gxgrd.Grid.open(self.gcf) as gc:
+            data = gc.np(window=(100, 100, 1, 1))
+            self.assertEqual(data.shape, (1, 1, 4))
+            self.assertEqual(tuple(data[0, 0]), (208, 144, 102, 255))
+
+    def test_iter_tiles(self):
+        self.start()
+
+        with gxgrd.Grid.open(self.g1f) as g:
+            full = g.np()
+            ntiles = 0
+            data = np.zeros(full.shape, dtype=full.dtype)
+            for ix0, iy0, tile, x, y in g.iter_tiles(tile=(30, 40), overlap=2):
+                ntiles += 1
+                ny, nx = tile.shape
+                self.assertTrue(nx <= 34 and ny <= 44)
+                self.assertEqual(len(x), nx)
+                self.assertEqual(len(y), ny)
+                self.assertAlmostEqual(x[0], g.x0 + ix0 * g.dx)
+                self.assertAlmostEqual(y[0], g.y0 + iy0 * g.dy)
+                self.assertTrue(np.array_equal(tile, full[iy0: iy0 + ny, ix0: ix0 + nx], equal_nan=True))
+                data[iy0: iy0 + ny, ix0: ix0 + nx] = tile
+            self.assertEqual(ntiles, 12)
+            self.assertTrue(np.array_equal(data, full, equal_nan=True))
+
+            self.assertRaises(gxgrd.GridException, list, g.iter_tiles(tile=(10, 10), overlap=10))
+
+            with gxgrd.Grid.new(properties=g.properties()) as gw:
+                gw.write_tiles(((ix0, iy0, t * 2.0) for ix0, iy0, t, _, _ in g.iter_tiles(tile=(30, 40), overlap=2)),
+                               tile=(30, 40), overlap=2)
+                self.assertTrue(np.array_equal(gw.np(), full * 2.0, equal_nan=True))
+
     def test_image_file(self):
         self.start()
 
@@ -856,6 +986,28 @@ class Test(GXPYTest):
             self.assertEqual((grd.nx, grd.ny), (199, 127))
             self.assertAlmostEqual(grd.statistics()['sd'], 23.4893997876449, 5)
 
+    def test_minimum_curvature_numpy(self):
+        self.start()
+
+        nxyv = np.array([[(45., 10., 100), (60., 25., 77.), (50., 8., 81.), (55., 11., 66.)],
+                         [(20., 15., 108), (25.,  5., 77.), (33., 9., np.nan), (28., 2., 22.)],
+                         [(35., 18., 110), (40., 31., 77.), (13.1, 3.88, 83.), (44., 4., 7.)]])
+
+        timing = {}
+        with gxgrd.Grid.minimum_curvature(iter(nxyv), cs=1., timing=timing) as grd:
+            self.assertEqual((grd.nx, grd.ny), (48, 30))
+            self.assertAlmostEqual(grd.statistics()['sd'], 30.104400923062535, 5)
+        self.assertEqual(timing['points'], 12)
+        self.assertTrue(timing['staging'] >= 0.)
+        self.assertTrue(timing['solve'] >= 0.)
+
+        npy = os.path.join(self.folder, 'xyv.npy')
+        np.save(npy, nxyv.reshape((-1, 3)))
+        with gxgrd.Grid.minimum_curvature(np.load(npy, mmap_mode='r'), cs=1., chunk=5) as grd:
+            self.assertEqual((grd.nx, grd.ny), (48, 30))
+            self.assertAlmostEqual(grd.statistics()['sd'], 30.104400923062535, 5)
+        os.remove(npy)
+
     def test_mask(self):
         self.start()
 
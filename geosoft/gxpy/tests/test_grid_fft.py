@@ -84,6 +84,65 @@ class Test(GXPYTest):
         up.close(discard=True)
         vd.close(discard=True)
 
+    def test_numpy_backend(self):
+        self.start()
+
+        with gxfft.GridFFT(self.mag) as fft, gxfft.GridFFT(self.mag, backend=gxfft.BACKEND_NUMPY) as npfft:
+            self.assertEqual(fft.nu, npfft.nu)
+            self.assertEqual(fft.nv, npfft.nv)
+            self.assertAlmostEqual(fft.du, npfft.du)
+
+            for filters in (['CNUP 500'], [('DRVZ', 1)], ['DRVX'], ['CNUP 200', 'DRVY 1']):
+                fft.filter(filters)
+                npfft.filter(filters)
+                with fft.result_grid() as gx_result, npfft.result_grid() as np_result:
+                    self.assertAlmostEqual(np_result.statistics()['variance'] / gx_result.statistics()['variance'],
+                                           1.0, 2)
+
+            npfft.filter(['CNUP 500'])
+            npfft.filter(['DRVZ 1'], trn=gxfft.TRN_FILTERED)
+            with npfft.result_grid() as vd:
+                self.assertAlmostEqual(vd.statistics()['variance'], 0.02167, 3)
+
+            npfft.filter([('RTP', 75, 10), 'BPAS 0.0 0.001'])
+            with npfft.result_grid() as rtp:
+                self.assertEqual(rtp.nx, npfft.source_grid.nx)
+
+            pspec = npfft.radially_averaged_spectrum()
+            self.assertAlmostEqual(pspec[0, gxfft.I_WAVENUMBER], 0.)
+            self.assertAlmostEqual(pspec[1, gxfft.I_WAVENUMBER], min(npfft.du, npfft.dv) * 1000.)
+            self.assertTrue(np.sum(pspec[:, gxfft.I_SAMPLE_COUNT]) <= npfft.nu * npfft.nv)
+
+            self.assertRaises(gxfft.GridFFTException, npfft.filter, ['NOTAFILTER 1'])
+            self.assertRaises(gxfft.GridFFTException, npfft.filter, ['CNUP'])
+
+    def test_filter_cache(self):
+        self.start()
+
+        for backend in (gxfft.BACKEND_GX, gxfft.BACKEND_NUMPY):
+            with gxfft.GridFFT(self.mag, backend=backend, filter_cache_size=2) as fft:
+                fft.filter(['CNUP 500'])
+                cnup500 = fft.filtered_transform
+                _, _, r500, _ = fft.read_uv_row(1, trn=gxfft.TRN_FILTERED)
+                fft.filter([('CNUP', 1000)])
+                fft.filter([('CNUP', 500.0)])
+                _, _, r, _ = fft.read_uv_row(1, trn=gxfft.TRN_FILTERED)
+                self.assertTrue(np.array_equal(r, r500))
+                if backend == gxfft.BACKEND_GX:
+                    self.assertTrue(fft.filtered_transform is cnup500)
+
+                fft.filter(['DRVZ 1'], trn=gxfft.TRN_FILTERED)
+                with fft.result_grid() as vd:
+                    chained = vd.statistics()['variance']
+                fft.filter(['CNUP 500', 'DRVZ 1'])
+                with fft.result_grid() as vd:
+                    self.assertAlmostEqual(vd.statistics()['variance'] / chained, 1.0, 4)
+
+                fft.clear_filter_cache()
+                fft.filter(['CNUP 500'])
+                with fft.result_grid() as up:
+                    self.assertAlmostEqual(up.statistics()['variance'] / 15442.23622462059, 1.0, 2)
+
     def test_spectrum_grids(self):
         self.start()
 
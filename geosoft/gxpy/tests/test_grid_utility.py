@@ -1,6 +1,7 @@
 import unittest
 import os
 import numpy as np
+import math
 
 import geosoft
 import geosoft.gxpy.system as gsys
@@ -68,6 +69,31 @@ class Test(GXPYTest):
             self.assertEqual(properties.get('ny'),101)
             self.assertEqual(str(properties.get('coordinate_system')),'WGS 84')
 
+    def test_mosaic_feather(self):
+        self.start()
+
+        glist = [self.g1f, self.g2f]
+        m = os.path.join(self.folder, 'test_mosaic_feather.grd(GRD)')
+        with gxgrdu.grid_mosaic(m, glist, feather=5, tile=(64, 32), memory=1, workers=2) as grd:
+            grd.delete_files()
+            self.assertEqual(grd.nx, 201)
+            self.assertEqual(grd.ny, 101)
+            self.assertAlmostEqual(grd.x0, 7.0)
+            self.assertAlmostEqual(grd.y0, 44.0)
+            stats = grd.statistics()
+            with gxgrdu.grid_mosaic(os.path.join(self.folder, 'test_mosaic_plain.grd(GRD)'), glist) as plain:
+                plain.delete_files()
+                self.assertEqual(plain.statistics()['num_data'], stats['num_data'])
+
+        # a single grid is not changed by feathering
+        m = os.path.join(self.folder, 'test_mosaic_single.grd(GRD)')
+        with gxgrdu.grid_mosaic(m, [self.g1f], feather=5, tile=(50, 50)) as grd:
+            grd.delete_files()
+            with gxgrd.Grid.open(self.g1f) as g1:
+                self.assertEqual(grd.nx, g1.nx)
+                self.assertEqual(grd.ny, g1.ny)
+                self.assertTrue(np.allclose(grd.np(dtype=np.float64), g1.np(dtype=np.float64), equal_nan=True))
+
     def test_bool(self):
         self.start()
 
@@ -164,6 +190,38 @@ class Test(GXPYTest):
         self.assertAlmostEqual(dxg.statistics()['sd'], 0.7668436702132574, 2)
         self.assertEqual(dxg.unit_of_measure, 'nT/m')
 
+    def test_derivatives_fused(self):
+        self.start()
+
+        types = (gxgrdu.DERIVATIVE_X, gxgrdu.DERIVATIVE_Y, gxgrdu.DERIVATIVE_Z,
+                 gxgrdu.DERIVATIVE_XY, gxgrdu.DERIVATIVE_XYZ, gxgrdu.TILT_ANGLE)
+        with gxgrd.Grid.open(self.mag) as grd:
+            results = gxgrdu.derivatives(grd, types, fft=False)
+            self.assertEqual(set(results), set(types))
+            for t in types:
+                self.assertEqual(results[t].nx, grd.nx)
+                self.assertEqual(results[t].ny, grd.ny)
+                self.assertEqual(results[t].dtype, grd.dtype)
+
+            dx = results[gxgrdu.DERIVATIVE_X].np(dtype=np.float64)
+            dy = results[gxgrdu.DERIVATIVE_Y].np(dtype=np.float64)
+            dz = results[gxgrdu.DERIVATIVE_Z].np(dtype=np.float64)
+            self.assertTrue(np.allclose(results[gxgrdu.DERIVATIVE_XY].np(dtype=np.float64),
+                                        np.hypot(dx, dy), rtol=1.0e-5, equal_nan=True))
+            self.assertTrue(np.allclose(results[gxgrdu.DERIVATIVE_XYZ].np(dtype=np.float64),
+                                        np.sqrt(dx**2 + dy**2 + dz**2), rtol=1.0e-5, equal_nan=True))
+            tilt = results[gxgrdu.TILT_ANGLE]
+            self.assertEqual(tilt.unit_of_measure, 'radians')
+            self.assertTrue(np.nanmax(np.abs(tilt.np())) <= math.pi / 2. + 1.0e-6)
+            self.assertAlmostEqual(tilt.statistics()['sd'], 0.8209237171466927)
+            self.assertAlmostEqual(results[gxgrdu.DERIVATIVE_XYZ].statistics()['sd'], 1.0226482933289056)
+            self.assertAlmostEqual(results[gxgrdu.DERIVATIVE_Z].statistics()['sd'], 0.9377582582050702, 2)
+
+            dz_fft = gxgrdu.derivatives(grd, (gxgrdu.DERIVATIVE_Z,))[gxgrdu.DERIVATIVE_Z]
+            self.assertAlmostEqual(dz_fft.statistics()['sd'], 0.9175367050980974, 2)
+
+        self.assertRaises(gxgrdu.GridUtilityException, gxgrdu.derivatives, self.mag, (99,))
+
     def test_contour_xy(self):
         self.start()
 
@@ -194,6 +252,41 @@ class Test(GXPYTest):
                 self.assertTrue(isinstance(xyp, gxgdb.Geosoft_gdb))
                 self.assertEqual(len(xyp.list_lines()), 9)
 
+    def test_contour_points_numpy(self):
+        self.start()
+
+        with gxgrd.Grid.open(self.mag) as grd:
+            xyp = gxgrdu.contour_points(grd, grd.statistics()['mean'], engine=gxgrdu.CONTOUR_NUMPY, tile=(64, 64))
+            self.assertTrue(isinstance(xyp, list))
+            self.assertTrue(isinstance(xyp[0], gxgeo.PPoint))
+            self.assertEqual(xyp[0][0].z, 0.0)
+
+            levels = (grd.statistics()['mean'], grd.statistics()['mean'] + grd.statistics()['sd'])
+            xyp = gxgrdu.contour_points(grd, levels, engine=gxgrdu.CONTOUR_NUMPY, resolution=0,
+                                        return_as=gxgrdu.RETURN_PPOINT, workers=2)
+            self.assertTrue(isinstance(xyp, gxgeo.PPoint))
+            self.assertEqual(xyp.coordinate_system, grd.coordinate_system)
+
+            self.assertRaises(gxgrdu.GridUtilityException, gxgrdu.contour_points, grd, 1.0e10,
+                              engine=gxgrdu.CONTOUR_NUMPY)
+
+        # a circle through tiles is a single closed contour
+        x, y = np.meshgrid(np.arange(41, dtype=np.float64), np.arange(41, dtype=np.float64))
+        data = np.hypot(x - 20., y - 20.)
+        with gxgrd.Grid.from_data_array(data) as g:
+            xyp = gxgrdu.contour_points(g, 10.5, resolution=0, engine=gxgrdu.CONTOUR_NUMPY, tile=(16, 16))
+            self.assertEqual(len(xyp), 1)
+            xyz = xyp[0].xyz
+            self.assertTrue(np.allclose(xyz[0], xyz[-1]))
+            r = np.hypot(xyz[:, 0] - 20., xyz[:, 1] - 20.)
+            self.assertTrue(np.all(np.abs(r - 10.5) < 0.1))
+
+            gdb = gxgrdu.contour_points(g, (5.5, 10.5), resolution=1, engine=gxgrdu.CONTOUR_NUMPY,
+                                        return_as=gxgrdu.RETURN_GDB)
+            self.assertTrue(isinstance(gdb, gxgdb.Geosoft_gdb))
+            self.assertEqual(len(gdb.list_lines()), 2)
+            gdb.close(discard=True)
+
     def test_tilt_depth(self):
         self.start()
 
@@ -216,7 +309,8 @@ class Test(GXPYTest):
         self.assertEqual(n, 399)
         td.close(discard=True)
 
-        td = gxgrdu.tilt_depth(self.mag, resolution=1000, return_as=gxgrdu.RETURN_LIST_OF_PPOINT, fft=False)
+        td = gxgrdu.tilt_depth(self.mag, resolution=1000, return_as=gxgrdu.RETURN_LIST_OF_PPOINT, fft=False,
+                               engine=gxgrdu.CONTOUR_GX)
         self.assertTrue(isinstance(td, list))
         self.assertTrue(td[0].coordinate_system == 'AGD66 / AMG zone 53')
         self.assertTrue(isinstance(td[0], gxgeo.PPoint))
@@ -225,12 +319,76 @@ class Test(GXPYTest):
             n += len(p)
         self.assertEqual(n, 399)
 
+    def test_tilt_depth_numpy(self):
+        self.start()
+
+        td = gxgrdu.tilt_depth(self.mag, resolution=1000, return_as=gxgrdu.RETURN_LIST_OF_PPOINT, fft=False,
+                               engine=gxgrdu.CONTOUR_NUMPY)
+        self.assertTrue(isinstance(td, list))
+        self.assertTrue(td[0].coordinate_system == 'AGD66 / AMG zone 53')
+        n = sum(len(p) for p in td)
+        self.assertTrue(n > 300)
+        depths = np.concatenate([p.z for p in td])
+        self.assertTrue(np.nanmedian(np.abs(depths)) > 0.)
+
+        # the numpy engine is the default if a database is not returned
+        tdd = gxgrdu.tilt_depth(self.mag, resolution=1000, return_as=gxgrdu.RETURN_LIST_OF_PPOINT, fft=False)
+        self.assertEqual(sum(len(p) for p in tdd), n)
+
+        gdb = gxgrdu.tilt_depth(self.mag, resolution=1000, return_as=gxgrdu.RETURN_GDB, fft=False,
+                                engine=gxgrdu.CONTOUR_NUMPY)
+        self.assertTrue(isinstance(gdb, gxgdb.Geosoft_gdb))
+        self.assertTrue(gdb.coordinate_system == 'AGD66 / AMG zone 53')
+        self.assertEqual(len(gdb.list_lines()), len(td))
+        gdb.close(discard=True)
+
     def test_calculate_slope_standard_deviation(self):
         self.start()
 
         slope_stddev = gxgrdu.calculate_slope_standard_deviation(self.mag)
         self.assertAlmostEqual(0.64497375, slope_stddev)
 
+    def test_statistics_many(self):
+        self.start()
+
+        grids = [self.g1f, self.g2f, self.mag]
+        table = gxgrdu.statistics_many(grids, workers=2, histogram_bins=64, percentiles=(0, 50, 100))
+        self.assertEqual(len(table), 3)
+        for name in grids:
+            with gxgrd.Grid.open(name) as g:
+                st = g.statistics()
+                row = table.loc[g.file_name_decorated]
+            self.assertEqual(row['num_data'], st['num_data'])
+            self.assertEqual(row['num_dummy'], st['num_dummy'])
+            self.assertAlmostEqual(row['min'], st['min'])
+            self.assertAlmostEqual(row['max'], st['max'])
+            self.assertAlmostEqual(row['mean'], st['mean'])
+            self.assertAlmostEqual(row['sum'], st['sum'], places=1)
+            self.assertAlmostEqual(row['variance'] / st['variance'], 1.0)
+            self.assertEqual(row['histogram'].sum(), st['num_data'])
+            self.assertEqual(len(row['histogram_edges']), 65)
+            self.assertAlmostEqual(row['percentile_0'], st['min'])
+            self.assertAlmostEqual(row['percentile_100'], st['max'])
+            self.assertTrue(st['min'] <= row['percentile_50'] <= st['max'])
+
+        # open grids are processed in the calling thread
+        with gxgrd.Grid.open(self.mag) as m:
+            mag_name = m.file_name_decorated
+        with gxgrd.Grid.open(self.g1f) as g:
+            table = gxgrdu.statistics_many([self.mag, g], workers=2)
+            self.assertEqual(list(table.index), [mag_name, g.file_name_decorated])
+            self.assertAlmostEqual(table.loc[g.file_name_decorated]['mean'], g.statistics()['mean'])
+
+        acc = gxgrdu.Statistics_accumulator()
+        with gxgrd.Grid.open(self.g1f) as g:
+            for _, _, tile, _, _ in g.iter_tiles(tile=(17, 23), dtype=np.float64):
+                part = gxgrdu.Statistics_accumulator()
+                part.add(tile)
+                acc.merge(part)
+            st = g.statistics()
+        self.assertAlmostEqual(acc.statistics()['mean'], st['mean'])
+        self.assertEqual(acc.statistics()['num_dummy'], st['num_dummy'])
+
     def test_feather_edge(self):
         self.start()
 
@@ -255,6 +413,34 @@ class Test(GXPYTest):
         filled_gd.close(discard=True)
         feath_gd.close(discard=True)
 
+    def test_flood_harmonic(self):
+        self.start()
+
+        with gxgrd.Grid.open(self.mag) as g:
+            pg = g.gxpg(True)
+            pg.re_allocate(g.ny + 20, g.nx + 20)
+            with gxgrd.Grid.from_data_array(pg) as gp:
+                data = gp.np(dtype=np.float64)
+                filled_gd = gxgrdu.flood(gp, method=gxgrdu.FLOOD_HARMONIC)
+                self.assertEqual(filled_gd.statistics()['num_dummy'], 0)
+                filled = filled_gd.np(dtype=np.float64)
+                known = ~np.isnan(data)
+                self.assertTrue(np.allclose(filled[known], data[known]))
+                self.assertTrue(np.nanmin(data) <= filled.min())
+                self.assertTrue(np.nanmax(data) >= filled.max())
+
+                filled_gd.close(discard=True)
+
+        # feather is the outer product of the row and column tapers
+        with gxgrd.Grid.from_data_array(np.full((60, 80), 2.0)) as g:
+            with gxgrdu.feather(g, 20, edge_value=1.0, tile=(32, 25)) as feath_gd:
+                taper = feath_gd.np(dtype=np.float64) - 1.0
+                feath_gd.delete_files()
+        self.assertAlmostEqual(taper[0, 0], 0.)
+        self.assertAlmostEqual(taper[30, 40], 1.)
+        self.assertAlmostEqual(taper[5, 8], taper[5, 40] * taper[30, 8])
+        self.assertTrue(np.allclose(taper, taper[::-1, ::-1]))
+
     def test_expression(self):
         self.start()
 
@@ -266,6 +452,37 @@ class Test(GXPYTest):
             x = gxgrdu.expression((grd, grd), 'g1-g2')
             self.assertEqual(x.statistics()['mean'], 0.)
 
+    def test_expression_numpy(self):
+        self.start()
+
+        with gxgrd.Grid.open(self.mag) as grd:
+            x = gxgrdu.expression((grd, grd), 'g1-g2', engine=gxgrdu.EXPRESSION_NUMPY, tile=(100, 100))
+            self.assertEqual(x.statistics()['mean'], 0.)
+            self.assertEqual(x.statistics()['num_data'], grd.statistics()['num_data'])
+
+            x = gxgrdu.expression({'a': grd, 'b': grd}, 'c=a*2; c-b', engine=gxgrdu.EXPRESSION_NUMPY,
+                                  tile=(100, 100), workers=2)
+            self.assertAlmostEqual(x.statistics()['mean'], grd.statistics()['mean'])
+
+            # result is the value of the last statement
+            x = gxgrdu.expression({'a': grd, 'b': grd}, 'c=a*3;\nd=c-b;\nd+10.', engine=gxgrdu.EXPRESSION_NUMPY,
+                                  dtype=np.float64)
+            data = grd.np(dtype=np.float64)
+            self.assertTrue(np.allclose(x.np(dtype=np.float64), data * 2. + 10., equal_nan=True))
+
+            x = gxgrdu.expression((grd, grd), 'd=max(g1, g2*0.5);', engine=gxgrdu.EXPRESSION_NUMPY,
+                                  dtype=np.float64)
+            self.assertTrue(np.allclose(x.np(dtype=np.float64), np.maximum(data, data * 0.5), equal_nan=True))
+
+            gx_result = gxgrdu.expression((grd, grd), 'sqrt(abs(g1*g2))')
+            np_result = gxgrdu.expression((grd, grd), 'sqrt(abs(g1*g2))', engine=gxgrdu.EXPRESSION_NUMPY)
+            self.assertAlmostEqual(gx_result.statistics()['sd'], np_result.statistics()['sd'])
+
+            self.assertRaises(gxgrdu.GridUtilityException,
+                              gxgrdu.expression, (grd, grd), 'g1-g3', engine=gxgrdu.EXPRESSION_NUMPY)
+            self.assertRaises(gxgrdu.GridUtilityException,
+                              gxgrdu.expression, (grd, grd), 'open(g1)', engine=gxgrdu.EXPRESSION_NUMPY)
+
 
 ###############################################################################################
 
@@ -0,0 +1,57 @@
+import unittest
+import os
+import numpy as np
+
+import geosoft.gxpy.grid as gxgrd
+import geosoft.gxpy.gridding as gxgridding
+
+from base import GXPYTest
+
+
+class Test(GXPYTest):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.setUpGXPYTest()
+
+    def test_minimum_curvature(self):
+        self.start()
+
+        # a plane is reproduced exactly
+        x, y = np.meshgrid(np.linspace(0., 100., 21), np.linspace(0., 50., 11))
+        v = 2. * x - y + 10.
+        xyv = np.column_stack((x.ravel(), y.ravel(), v.ravel()))
+        with gxgridding.minimum_curvature(xyv, cs=1., bkd=0, tol=1.0e-6, itrmax=500, icgr=4) as grd:
+            self.assertEqual((grd.nx, grd.ny), (101, 51))
+            self.assertEqual(grd.x0, 0.)
+            self.assertEqual(grd.dx, 1.)
+            self.assertEqual(grd.statistics()['num_dummy'], 0)
+            ix, iy = np.meshgrid(np.arange(101.), np.arange(51.))
+            self.assertTrue(np.allclose(grd.np(dtype=np.float64), 2. * ix - iy + 10., atol=0.01))
+
+        # data in chunks, tension, workers and blanking
+        rng = np.random.RandomState(42)
+        xyv = np.column_stack((rng.uniform(0., 100., 400), rng.uniform(0., 100., 400), np.zeros(400)))
+        xyv[:, 2] = np.sin(xyv[:, 0] * 0.05) * np.cos(xyv[:, 1] * 0.05) * 100.
+        xyv[xyv[:, 0] > 80., 2] = np.nan
+        with gxgridding.minimum_curvature((xyv[:150], xyv[150:]), cs=2., ti=0.25, workers=3,
+                                          unit_of_measure='nT') as grd:
+            self.assertEqual(grd.unit_of_measure, 'nT')
+            self.assertTrue(grd.statistics()['num_dummy'] > 0)
+            self.assertTrue(abs(grd.sample(((20., 20.),))[0] - np.sin(1.) * np.cos(1.) * 100.) < 10.)
+
+        # a list of unequal chunks, and a list of rows, are the same data
+        with gxgridding.minimum_curvature([xyv[:150], xyv[150:]], cs=2., bkd=0) as chunked:
+            with gxgridding.minimum_curvature([tuple(r) for r in xyv], cs=2., bkd=0) as rows:
+                self.assertTrue(np.allclose(chunked.np(dtype=np.float64), rows.np(dtype=np.float64),
+                                            equal_nan=True))
+
+        self.assertRaises(gxgridding.GriddingException, gxgridding.minimum_curvature, xyv, cs=1., icgr=3)
+        self.assertRaises(gxgridding.GriddingException, gxgridding.minimum_curvature, [(1., 1., np.nan)])
+
+
+###############################################################################################
+
+if __name__ == '__main__':
+
+    unittest.main()
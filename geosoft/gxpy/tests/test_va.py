@@ -152,6 +152,11 @@ class Test(GXPYTest):
             self.assertEqual(tuple(list2d[1]), (5, 6, 7, 8, 9))
             self.assertEqual(va.np.shape, (9, 5))
 
+            # returned rows are copies that can be changed
+            row = va[2][0]
+            row[0] = -1
+            self.assertEqual(va[2][0][0], 10)
+
     def test_strings(self):
         self.start()
 
@@ -178,6 +183,23 @@ class Test(GXPYTest):
             self.assertEqual(tuple(va[0][0])[4], 4.)
             self.assertTrue(np.isnan(va[0][0][1]))
 
+    def test_np_view(self):
+        self.start()
+
+        npdata = np.array(range(45), dtype=np.float64).reshape((9, 5))
+        with gxva.GXva(npdata) as va:
+            npv = va.np_view
+            self.assertIs(npv, va.np_view)
+            self.assertFalse(npv.flags.writeable)
+            self.assertEqual(npv.shape, (9, 5))
+
+            va.set_data(npdata[:4, :])
+            self.assertEqual(va.np_view.shape, (4, 5))
+            self.assertEqual(tuple(va[3][0]), (15., 16., 17., 18., 19.))
+
+            va.refid((0., 0.5), 7)
+            self.assertEqual(va.np_view.shape, (7, 5))
+
     def test_empty(self):
         self.start()
 
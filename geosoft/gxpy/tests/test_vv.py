@@ -298,6 +298,32 @@ class Test(GXPYTest):
             self.assertEqual(vvlist[0], 0.0)
             self.assertEqual(vvlist[999], 999.)
 
+    def test_np_view(self):
+        self.start()
+
+        with gxvv.GXvv(np.arange(10, dtype=np.float64)) as vv:
+            npv = vv.np_view
+            self.assertIs(npv, vv.np_view)
+            self.assertFalse(npv.flags.writeable)
+            self.assertEqual(npv.tolist(), list(range(10)))
+
+            npd = vv.np
+            self.assertTrue(npd.flags.writeable)
+            npd[0] = 99.
+            self.assertEqual(vv[0][0], 0.)
+
+            vv.set_data([5., 6., np.nan])
+            self.assertEqual(vv.np_view.shape, (3,))
+            self.assertEqual(vv.np_view[1], 6.)
+            self.assertTrue(np.isnan(vv.np_view[2]))
+
+            vv.refid((0., 0.5))
+            self.assertEqual(vv.np_view.shape, (5,))
+
+            npv = vv.np_view
+            vv.gxvv.fill_double(1.)
+            self.assertEqual(vv.np_view.tolist(), [1.] * 5)
+
     def test_uom(self):
         self.start()
 
@@ -102,6 +102,7 @@ class GXva(Sequence):
         self._start, self._incr = self.fid
         self._next = 0
         self._unit_of_measure = unit_of_measure
+        self._np_view = None
 
         if array is not None and array.size > 0:
             self.set_data(array, fid)
@@ -117,11 +118,12 @@ class GXva(Sequence):
         else:
             i = self._next
             self._next += 1
-            return self.np[i], self._start + self._incr * i
+            return self.np_view[i].copy(), self._start + self._incr * i
 
     def __getitem__(self, item):
+        # rows are copied from the cached view so that they can be changed, as before 9.8
         self._start, self._incr = self.fid
-        return self.np[item], self._start + self._incr * item
+        return self.np_view[item].copy(), self._start + self._incr * item
 
     @property
     def unit_of_measure(self):
@@ -157,6 +159,7 @@ class GXva(Sequence):
         .. versionadded:: 9.1
         """
         self._gxva.re_fid(fid[0], fid[1], length)
+        self._np_view = None
         self.fid = fid
 
     @property
@@ -220,13 +223,31 @@ class GXva(Sequence):
         """
         return self.get_data()[0]
 
+    @property
+    def np_view(self):
+        """
+        Read-only numpy array of VA data, in the data type of the VA.  Unlike `np`, the array is cached
+        and is only read again from the VA after the data has been changed by `set_data`, `refid`, or access
+        through the `gxva` property.
+
+        .. versionadded:: 9.8
+        """
+        if self._np_view is None:
+            npd = self.get_data()[0]
+            npd.flags.writeable = False
+            self._np_view = npd
+        return self._np_view
+
     @property
     def gxva(self):
         """
         The :class:`geosoft.gxapi.GXVA` instance handle.
 
         ..versionadded:: 9.3
+
+        .. versionchanged:: 9.8 clears the cached `np_view` as the data may be changed through the instance.
         """
+        self._np_view = None
         return self._gxva
 
     def get_data(self, dtype=None, start=0, n=None, start_col=0, n_col=None):
@@ -306,11 +327,13 @@ class GXva(Sequence):
         if npdata.shape[0] > max_length:
             raise VAException(_t('Array length {} too long. Maximum is {} for width {}').format(npdata.shape[0], max_length, self._width))
 
-        if npdata.dtype == np.float32 or npdata.dtype == np.float64:
-            if np.isnan(npdata).any():
-                npdata = npdata.copy()
-                npdata[np.isnan(npdata)] = gxu.gx_dummy(npdata.dtype)
+        if npd.dtype == np.float32 or npd.dtype == np.float64:
+            if np.isnan(npd).any():
+                npd = npd.copy()
+                npd[np.isnan(npd)] = gxu.gx_dummy(npd.dtype)
 
+        # the native set methods take a bytes buffer, so set_array_np makes one contiguous copy of the data
         self._gxva.set_ln(npd.shape[0])
         self._gxva.set_array_np(0, 0, npd)
+        self._np_view = None
         self.fid = fid
@@ -218,6 +218,7 @@ class GXvv(Sequence):
         self.fid = fid
         self._next = 0
         self._unit_of_measure = unit_of_measure
+        self._np_view = None
 
         if array is not None:
             self.set_data(array, fid)
@@ -235,23 +236,31 @@ class GXvv(Sequence):
         else:
             i = self._next
             self._next += 1
-            return self.np[i], self.fid[0] + self.fid[1] * i
+            return self.np_view[i], self.fid[0] + self.fid[1] * i
 
     def __getitem__(self, item):
         start, incr = self.fid
         if self._is_float:
-            v = float(self.np[item])
+            v = float(self.np_view[item])
         elif self._is_int:
-            v = int(self.np[item])
+            v = int(self.np_view[item])
         else:
-            v = str(self.np[item])
+            v = str(self.np_view[item])
         return v, start + incr * item
 
     def _set_data_np(self, npd, start=0):
         """set to data in a numpy array"""
+
+        # the native set methods take a bytes buffer, so writes make one contiguous copy of the data
         if not npd.flags['C_CONTIGUOUS']:
             npd = np.ascontiguousarray(npd)
-        self.gxvv.set_data(start, npd.shape[0], npd.data.tobytes(), gxu.gx_dtype_dimension(npd.dtype, self._dim))
+
+        if self._dim == 1:
+            self._gxvv.set_data_np(start, npd)
+        else:
+            self._gxvv.set_data(start, npd.shape[0], npd.data.tobytes(),
+                                gxu.gx_dtype_dimension(npd.dtype, self._dim))
+        self._np_view = None
 
     def _get_data_np(self, start=0, n=None, dtype=None):
         """return data in a numpy array"""
@@ -261,10 +270,12 @@ class GXvv(Sequence):
             sh = (n,)
         else:
             sh = (n, self._dim)
-        bytearr = np.empty(sh, dtype=dtype).tobytes()
-        self.gxvv.get_data(start, n, bytearr, gxu.gx_dtype_dimension(dtype, self._dim))
-        npd = np.frombuffer(bytearr, dtype=dtype).reshape(sh)
-        return np.array(npd)
+
+        # the VV copies directly into the buffer of the returned array
+        dtype = np.dtype(dtype)
+        bytearr = bytearray(n * self._dim * dtype.itemsize)
+        self._gxvv.get_data(start, n, bytearr, gxu.gx_dtype_dimension(dtype, self._dim))
+        return np.frombuffer(bytearr, dtype=dtype).reshape(sh)
 
     @property
     def unit_of_measure(self):
@@ -277,7 +288,12 @@ class GXvv(Sequence):
 
     @property
     def gxvv(self):
-        """:class:`geosoft.gxapi.GXVV` instance"""
+        """
+        :class:`geosoft.gxapi.GXVV` instance
+
+        .. versionchanged:: 9.8 clears the cached `np_view` as the data may be changed through the instance.
+        """
+        self._np_view = None
         return self._gxvv
 
     @property
@@ -371,6 +387,21 @@ class GXvv(Sequence):
         """
         return self.get_data()[0]
 
+    @property
+    def np_view(self):
+        """
+        Read-only numpy array of VV data, in the data type of the VV.  Unlike `np`, the array is cached
+        and is only read again from the VV after the data has been changed by `set_data`, `refid`, or access
+        through the `gxvv` property.
+
+        .. versionadded:: 9.8
+        """
+        if self._np_view is None:
+            npd = self.get_data()[0]
+            npd.flags.writeable = False
+            self._np_view = npd
+        return self._np_view
+
     def get_data(self, dtype=None, start=0, n=None, float_dummies_to_nan=True):
         """
         Return vv data in a numpy array
@@ -495,6 +526,7 @@ class GXvv(Sequence):
                 i += 1
 
         self._gxvv.set_len(data.shape[0])
+        self._np_view = None
         if fid:
             self.fid = fid
 
@@ -517,6 +549,7 @@ class GXvv(Sequence):
             if length < 0:
                 length = 0
         self._gxvv.re_fid(fid[0], fid[1], int(length))
+        self._np_view = None
         self.fid = fid
 
     def list(self):
@@ -541,6 +574,7 @@ class GXvv(Sequence):
             self.gxvv.fill_int(int(value))
         else:
             self.gxvv.fill_string(str(value))
+        self._np_view = None
 
     def min_max(self):
         """